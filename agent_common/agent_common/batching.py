@@ -0,0 +1,74 @@
+"""DataLoader-style request coalescing for async lookups.
+
+Callers await loader.load(key) one key at a time, as a tool would. Keys
+requested within `window` seconds of each other (or until max_batch keys are
+waiting) are deduplicated and fetched with a single call to the batch
+function, and every caller gets its own value back:
+
+    async def fetch(keys):  # one bulk query, returns {key: value}
+        return await asyncio.to_thread(store.lookup_many, keys)
+
+    loader = BatchLoader(fetch)
+    status = await loader.load("12345")  # None when the batch has no value for the key
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchStats:
+    loads: int = 0  # load() calls
+    keys: int = 0  # distinct keys fetched
+    batches: int = 0  # calls to the batch function
+
+    def __str__(self):
+        per_batch = self.keys / self.batches if self.batches else 0.0
+        return f"{self.loads} loads → {self.keys} keys in {self.batches} batches ({per_batch:.1f} keys/batch)"
+
+
+class BatchLoader:
+    def __init__(self, batch_fn, window=0.002, max_batch=500):
+        """batch_fn is an async callable taking a list of keys and returning {key: value}."""
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = BatchStats()
+        self._pending = {}  # key -> future shared by every caller waiting on it
+        self._timer = None
+
+    async def load(self, key):
+        self.stats.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys):
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        self.stats.batches += 1
+        self.stats.keys += len(batch)
+        try:
+            values = await self.batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
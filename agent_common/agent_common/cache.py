@@ -0,0 +1,235 @@
+"""On-disk response cache for agents whose answers rarely change.
+
+Entries live in a small SQLite file keyed by agent name, a hash of the agent's
+instructions, the model name and the normalized input. Entries expire after a
+TTL and the least recently used ones are evicted once the cache grows past its
+entry or byte limit.
+
+The file is AGENT_CACHE_PATH, else responses.sqlite3 in the user cache
+directory ($XDG_CACHE_HOME or ~/.cache, under agent_common/), so every script
+shares one cache whatever directory it is started from.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+
+def default_path():
+    """AGENT_CACHE_PATH, else responses.sqlite3 in the user cache directory."""
+    if path := os.getenv("AGENT_CACHE_PATH"):
+        return path
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "agent_common", "responses.sqlite3")
+
+
+_MISS = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachedResult:
+    """Stand-in for a RunResult served from the cache (no model calls were made)."""
+
+    cached = True
+
+    def __init__(self, final_output):
+        self.final_output = final_output
+        self.raw_responses = []
+
+
+def normalize(text: str) -> str:
+    """Casefold and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(text.casefold().split())
+
+
+def _model_name(agent, run_config=None) -> str:
+    model = run_config.model if run_config is not None and run_config.model is not None else agent.model
+    if model is None or isinstance(model, str):
+        return model or ""
+    return getattr(model, "model", type(model).__name__)
+
+
+def _instructions_hash(agent) -> str:
+    instructions = agent.instructions
+    if callable(instructions):
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+    return hashlib.sha256((instructions or "").encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache with TTL expiry and LRU eviction.
+
+    Safe to share between threads. Access times are recorded in memory on a hit
+    and written back in batches, so a hit is a single indexed read.
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=10_000, max_bytes=64 * 1024 * 1024):
+        """path defaults to default_path(); its directory is created if needed."""
+        path = path or default_path()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def key(self, agent, input: str, run_config=None) -> str:
+        parts = [agent.name, _instructions_hash(agent), _model_name(agent, run_config), normalize(input)]
+        output_type = getattr(agent, "output_type", None)
+        if output_type is not None:
+            parts.append(getattr(output_type, "__qualname__", repr(output_type)))
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= 256:
+                self._flush_touched()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        encoded = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._flush_touched()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded), now, now),
+            )
+            self._evict()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._conn.close()
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT ?", (max(1, count - self.max_entries),)
+            ).fetchall()
+            for key, size in oldest:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                count, total = count - 1, total - size
+                self.stats.evictions += 1
+
+
+def _encode(final_output):
+    if hasattr(final_output, "model_dump"):
+        return {"json": final_output.model_dump(mode="json")}
+    return {"value": final_output}
+
+
+def _decode(agent, entry):
+    if "json" in entry and getattr(agent, "output_type", None) is not None:
+        return agent.output_type.model_validate(entry["json"])
+    return entry.get("value", entry.get("json"))
+
+
+async def cached_run(cache, agent, input, **kwargs):
+    """Runner.run with a cache in front of it.
+
+    Only plain string inputs are cached. A hit returns a CachedResult without
+    touching the network; a miss runs the agent and stores its final output.
+    """
+    from agents import Runner
+
+    if cache is None or not isinstance(input, str):
+        return await Runner.run(agent, input, **kwargs)
+
+    key = cache.key(agent, input, kwargs.get("run_config"))
+    entry = cache.get(key, _MISS)
+    if entry is not _MISS:
+        return CachedResult(_decode(agent, entry))
+
+    result = await Runner.run(agent, input, **kwargs)
+    cache.put(key, _encode(result.final_output))
+    return result
+
+
+def cached_run_sync(cache, agent, input, **kwargs):
+    """Runner.run_sync with a cache in front of it (see cached_run)."""
+    from agents import Runner
+
+    if cache is None or not isinstance(input, str):
+        return Runner.run_sync(agent, input, **kwargs)
+
+    key = cache.key(agent, input, kwargs.get("run_config"))
+    entry = cache.get(key, _MISS)
+    if entry is not _MISS:
+        return CachedResult(_decode(agent, entry))
+
+    result = Runner.run_sync(agent, input, **kwargs)
+    cache.put(key, _encode(result.final_output))
+    return result
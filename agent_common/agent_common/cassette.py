@@ -0,0 +1,210 @@
+"""Record model exchanges once and replay them without the network.
+
+CassetteModel wraps a Model (normally the runtime's OpenAIChatCompletionsModel)
+and keys every call by a fingerprint of what the model is asked: model name,
+instructions, input items, model settings, tool/handoff schemas, output
+schema and whether it is streamed. Responses, including tool calls and
+streamed events with their timing, go into a Cassette, a small SQLite file
+with one zlib-compressed JSON row per fingerprint.
+
+    record  call the wrapped model and store every response
+    replay  serve stored responses; a call that was not recorded raises CassetteMiss
+    auto    replay what was recorded, record the rest
+
+Replayed calls wait latency_scale times the recorded time (0.0 serves them
+immediately, 1.0 as recorded). With the network gone, a replayed run
+measures what the Agents SDK, tools, guardrails and the project's own code
+cost per turn. Tool call ids come back as recorded, so multi-step turns
+fingerprint the same on every replay as long as the tools return the same.
+
+runtime.get_model() wraps its models when AGENT_CASSETTE (or
+configure(cassette=...)) names a cassette file, with AGENT_CASSETTE_MODE
+choosing the mode:
+
+    AGENT_CASSETTE=graphs.sqlite3 AGENT_CASSETTE_MODE=record python main.py
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+
+from agents import ModelResponse, Usage
+from agents.items import TResponseOutputItem, TResponseStreamEvent
+from agents.models.interface import Model
+from pydantic import TypeAdapter
+
+MODES = ("record", "replay", "auto")
+
+_output_item = TypeAdapter(TResponseOutputItem)
+_stream_event = TypeAdapter(TResponseStreamEvent)
+
+
+class CassetteMiss(LookupError):
+    """A replay-mode call whose fingerprint is not in the cassette."""
+
+
+@dataclass
+class CassetteStats:
+    recorded: int = 0
+    replayed: int = 0
+    misses: int = 0
+    replayed_seconds: float = 0.0  # model time the replayed calls took when they were recorded
+
+    def __str__(self):
+        return (
+            f"📼 {self.replayed} replayed ({self.replayed_seconds:.2f}s of recorded model time), "
+            f"{self.recorded} recorded, {self.misses} misses"
+        )
+
+
+def fingerprint(model, system_instructions, input, model_settings, tools, output_schema, handoffs, stream):
+    """Hex digest identifying a model call by everything that shapes its response."""
+    parts = {
+        "model": model,
+        "stream": stream,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict(),
+        "tools": [[tool.name, getattr(tool, "params_json_schema", None)] for tool in tools],
+        "handoffs": [[handoff.tool_name, handoff.input_json_schema] for handoff in handoffs],
+        "output": None if output_schema is None or output_schema.is_plain_text() else output_schema.json_schema(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Cassette:
+    """SQLite file of recorded exchanges, fingerprint -> compressed JSON. Safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stats = CassetteStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exchanges (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                streamed INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                payload BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+
+    def get(self, key):
+        """(payload, seconds) recorded for key, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload, seconds FROM exchanges WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def put(self, key, model, streamed, seconds, payload):
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exchanges (key, model, streamed, seconds, payload, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, int(streamed), seconds, data, time.time()),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _usage(usage):
+    return {
+        "requests": usage.requests,
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+
+class CassetteModel(Model):
+    def __init__(self, model, cassette, mode="auto", latency_scale=0.0):
+        """Wrap model, recording to / replaying from cassette (a Cassette or a path).
+
+        mode is "record", "replay" or "auto"; replayed calls wait latency_scale
+        times their recorded duration.
+        """
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {', '.join(MODES)}, not {mode!r}")
+        self.wrapped = model
+        self.model = getattr(model, "model", type(model).__name__)  # the name, as on OpenAIChatCompletionsModel
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+    def _lookup(self, key):
+        if self.mode == "record":
+            return None
+        entry = self.cassette.get(key)
+        if entry is None:
+            self.cassette.stats.misses += 1
+            if self.mode == "replay":
+                raise CassetteMiss(f"no recorded {self.model} response for this request (fingerprint {key[:12]})")
+            return None
+        self.cassette.stats.replayed += 1
+        self.cassette.stats.replayed_seconds += entry[1]
+        return entry
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        key = fingerprint(self.model, system_instructions, input, model_settings, tools, output_schema, handoffs, False)
+        if entry := self._lookup(key):
+            payload, seconds = entry
+            if self.latency_scale and seconds:
+                await asyncio.sleep(seconds * self.latency_scale)
+            return ModelResponse(
+                output=[_output_item.validate_python(item) for item in payload["output"]],
+                usage=Usage(**payload["usage"]),
+                response_id=payload["response_id"],
+            )
+
+        start = time.perf_counter()
+        response = await self.wrapped.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        payload = {
+            # exclude_unset keeps replayed items identical to the input items the SDK builds from them
+            "output": [item.model_dump(mode="json", exclude_unset=True) for item in response.output],
+            "usage": _usage(response.usage),
+            "response_id": response.response_id,
+        }
+        self.cassette.put(key, self.model, False, time.perf_counter() - start, payload)
+        self.cassette.stats.recorded += 1
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        key = fingerprint(self.model, system_instructions, input, model_settings, tools, output_schema, handoffs, True)
+        if entry := self._lookup(key):
+            payload, _ = entry
+            start = time.perf_counter()
+            for offset, event in payload["events"]:
+                if self.latency_scale and (wait := start + offset * self.latency_scale - time.perf_counter()) > 0:
+                    await asyncio.sleep(wait)
+                yield _stream_event.validate_python(event)
+            return
+
+        start = time.perf_counter()
+        events = []
+        async for event in self.wrapped.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        ):
+            events.append([round(time.perf_counter() - start, 4), event.model_dump(mode="json", exclude_unset=True)])
+            yield event
+        self.cassette.put(key, self.model, True, time.perf_counter() - start, {"events": events})
+        self.cassette.stats.recorded += 1
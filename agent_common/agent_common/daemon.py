@@ -0,0 +1,239 @@
+"""Keep an interpreter warm and run the project CLIs in it over a Unix socket.
+
+A cold `python mood_handoff.py` spends most of its startup importing the
+Agents SDK and building clients and agents. The daemon pays that once and
+stays resident; `run` forwards argv, stdin and stdout to it, so an
+invocation starts in the time it takes to import this module:
+
+    python -m agent_common.daemon serve multi-agent-assignments/mood_handoff.py &
+    python -m agent_common.daemon run multi-agent-assignments/mood_handoff.py --speculate
+
+serve imports the scripts it is given and builds their lazy `graph` (see
+lazy.py) up front; other scripts are imported on their first run. A script
+with a plain main() has it called on the resident module, so its agents and
+the runtime's client are reused; any other script is re-executed as
+__main__, which still finds the SDK and the shared client in memory. Runs
+are served one at a time, since argv, cwd and the standard streams are
+process-wide. When no daemon is listening, `run` just executes the script.
+
+The socket is AGENT_DAEMON_SOCKET, else agent-daemon-<uid>.sock in the temp
+directory. This module only imports the standard library at the top, so the
+client stays fast.
+"""
+
+import argparse
+import importlib.util
+import inspect
+import io
+import json
+import os
+import re
+import runpy
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+
+def default_socket():
+    return os.getenv("AGENT_DAEMON_SOCKET") or os.path.join(tempfile.gettempdir(), f"agent-daemon-{os.getuid()}.sock")
+
+
+def load_script(path):
+    """Import the script at path under a name of its own, with its directory on sys.path for sibling imports.
+
+    Several projects have a main.py, so the module name is derived from the full path.
+    """
+    path = os.path.abspath(path)
+    name = "script_" + re.sub(r"\W", "_", os.path.splitext(path)[0].lstrip(os.sep))
+    if name in sys.modules:
+        return sys.modules[name]
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+class _Output(io.TextIOBase):
+    """A text stream sending each write to the client as a {kind: text} message."""
+
+    def __init__(self, send, kind):
+        self._send = send
+        self._kind = kind
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self._send({self._kind: text})
+        return len(text)
+
+
+class _Input(io.TextIOBase):
+    """A text stream reading the client's {"in": line} messages; an empty line is end of input."""
+
+    def __init__(self, reader):
+        self._reader = reader
+
+    def readable(self):
+        return True
+
+    def readline(self, size=-1):
+        line = self._reader.readline()
+        return json.loads(line).get("in", "") if line else ""
+
+    def read(self, size=-1):
+        return "".join(iter(self.readline, ""))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        send_lock = threading.Lock()
+
+        def send(message):
+            with send_lock:
+                self.wfile.write((json.dumps(message) + "\n").encode())
+                self.wfile.flush()
+
+        request = json.loads(self.rfile.readline() or b"{}")
+        with self.server.run_lock:
+            code = self.server.run(request, _Input(self.rfile), _Output(send, "out"), _Output(send, "err"))
+        try:
+            send({"exit": code})
+        except OSError:
+            pass  # the client went away
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, scripts=()):
+        for script in scripts:
+            module = load_script(script)
+            if callable(build := getattr(module, "graph", None)):
+                build()
+        # Bind only once warm: until then `run` finds no socket and executes the script itself
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        self.run_lock = threading.Lock()
+        self.runs = 0
+
+    def run(self, request, stdin, stdout, stderr):
+        """Run one CLI invocation with the client's argv, cwd and streams; returns its exit code."""
+        script = request["script"]
+        saved = sys.argv, sys.stdin, sys.stdout, sys.stderr, os.getcwd()
+        sys.argv = [script, *request.get("argv", [])]
+        sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+        self.runs += 1
+        try:
+            os.chdir(request.get("cwd") or os.path.dirname(script))
+            module = load_script(script)
+            entry = getattr(module, "main", None)
+            if callable(entry) and not inspect.iscoroutinefunction(entry) and not _required_parameters(entry):
+                entry()
+            else:
+                runpy.run_path(script, run_name="__main__")
+            return 0
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                print(e.code, file=sys.stderr)
+                return 1
+            return e.code or 0
+        except BaseException:
+            try:
+                traceback.print_exc()
+            except OSError:
+                pass
+            return 1
+        finally:
+            sys.argv, sys.stdin, sys.stdout, sys.stderr, cwd = saved
+            os.chdir(cwd)
+
+
+def _required_parameters(function):
+    return [
+        p
+        for p in inspect.signature(function).parameters.values()
+        if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+    ]
+
+
+def serve(scripts, path=None):
+    path = path or default_socket()
+    start = time.perf_counter()
+    server = DaemonServer(path, scripts)
+    print(f"🔥 Warm daemon on {path} ({len(scripts)} scripts preloaded in {time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))  # remove the socket on kill too
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def run(script, argv, path=None):
+    """Run script with argv in the daemon and return its exit code, or exec it here if none is listening."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path or default_socket())
+    except OSError:
+        client.close()
+        os.execv(sys.executable, [sys.executable, script, *argv])
+    reader = client.makefile("rb")
+    writer = client.makefile("wb")
+
+    def send(message):
+        writer.write((json.dumps(message) + "\n").encode())
+        writer.flush()
+
+    def pump_stdin():
+        try:
+            for line in sys.stdin:
+                send({"in": line})
+            send({"in": ""})
+        except (OSError, ValueError):
+            pass
+
+    send({"script": os.path.abspath(script), "argv": argv, "cwd": os.getcwd()})
+    threading.Thread(target=pump_stdin, daemon=True).start()
+    for line in reader:
+        message = json.loads(line)
+        if "out" in message:
+            sys.stdout.write(message["out"])
+            sys.stdout.flush()
+        elif "err" in message:
+            sys.stderr.write(message["err"])
+            sys.stderr.flush()
+        elif "exit" in message:
+            return message["exit"]
+    return 1  # the daemon went away mid-run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm interpreter for the agent CLIs")
+    parser.add_argument("--socket", help="Unix socket path (default: AGENT_DAEMON_SOCKET or the temp directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="start the daemon, preloading these scripts")
+    serve_parser.add_argument("scripts", nargs="*")
+    run_parser = commands.add_parser("run", help="run a script in the daemon")
+    run_parser.add_argument("script")
+    run_parser.add_argument("argv", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args.scripts, args.socket)
+    else:
+        sys.exit(run(args.script, args.argv, args.socket))
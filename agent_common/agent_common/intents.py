@@ -0,0 +1,105 @@
+"""Single-pass keyword/phrase intent matching.
+
+IntentMatcher compiles every phrase of every intent into one regex shaped
+like a trie (shared prefixes are matched once), so a message is scanned a
+single time no matter how many phrases are configured. The trie sits inside a
+lookahead, so matches are reported at every position, and phrases that are
+prefixes of a longer match are recovered from a precomputed table. Together
+that gives the same "every phrase that occurs" answer as an Aho-Corasick scan.
+
+Rules map each intent label to its phrases, either as a list or as a
+{phrase: weight} dict; a phrase may belong to several intents.
+
+    matcher = IntentMatcher({"billing": {"refund": 2, "payment": 1}, "technical": ["restart", "service"]})
+    matcher.match("I want a refund for the service")  # {"billing": 2.0, "technical": 1.0}
+"""
+
+import json
+import re
+from collections import defaultdict
+
+
+def _normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def _trie_pattern(phrases):
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        ends_here = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if ends_here else group
+
+    return build(trie)
+
+
+class IntentMatcher:
+    def __init__(self, rules, whole_words=True):
+        """whole_words=False matches phrases anywhere, like `phrase in text`."""
+        self.labels = tuple(rules)
+        self.whole_words = whole_words
+        self._targets = defaultdict(list)
+        for label, phrases in rules.items():
+            items = phrases.items() if isinstance(phrases, dict) else ((phrase, 1.0) for phrase in phrases)
+            for phrase, weight in items:
+                phrase = _normalize(phrase)
+                if phrase:
+                    self._targets[phrase].append((label, float(weight)))
+
+        # Phrases hidden inside a longer match that starts at the same place
+        self._prefixes = {}
+        for phrase in self._targets:
+            inner = [
+                phrase[:k]
+                for k in range(1, len(phrase))
+                if phrase[:k] in self._targets and (not whole_words or self._boundary(phrase, k))
+            ]
+            if inner:
+                self._prefixes[phrase] = inner
+
+        trie = _trie_pattern(self._targets) if self._targets else "(?!)"
+        if whole_words:
+            self._pattern = re.compile(r"\b(?=(" + trie + r")\b)")
+        else:
+            self._pattern = re.compile(r"(?=(" + trie + r"))")
+
+    @staticmethod
+    def _boundary(phrase, k):
+        return not (phrase[k - 1].isalnum() or phrase[k - 1] == "_") or not (phrase[k].isalnum() or phrase[k] == "_")
+
+    @classmethod
+    def from_file(cls, path):
+        """Load {"whole_words": bool, "intents": {label: phrases}} from a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config["intents"], whole_words=config.get("whole_words", True))
+
+    def phrases(self, text):
+        """Every configured phrase occurring in text, once per occurrence, in order."""
+        for m in self._pattern.finditer(_normalize(text)):
+            phrase = m.group(1)
+            yield from self._prefixes.get(phrase, ())
+            yield phrase
+
+    def match(self, text):
+        """{label: summed weight} for every intent with at least one phrase in text."""
+        scores = {}
+        for phrase in self.phrases(text):
+            for label, weight in self._targets[phrase]:
+                scores[label] = scores.get(label, 0.0) + weight
+        return scores
+
+    def best(self, text, default=None):
+        scores = self.match(text)
+        return max(scores, key=scores.get) if scores else default
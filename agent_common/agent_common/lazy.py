@@ -0,0 +1,60 @@
+"""Build expensive module state on first use, optionally in the background.
+
+Importing the Agents SDK (agents, openai, mcp, pydantic) takes about a
+second, and the CLIs used to pay it, plus client and agent construction, at
+import time before printing anything. Wrapping that setup in a Lazy defers it:
+
+    @lazy
+    def graph():
+        from agents import Agent
+        ...
+        return SimpleNamespace(config=run_config(), mood_agent=Agent(...))
+
+    graph.start()  # build on a daemon thread while the user reads the prompt
+    graph().mood_agent  # waits for that build, or builds now if it never started
+
+The value is built once even when several threads ask for it at the same
+time. A failed background build is not kept; the next call builds again and
+raises in the caller.
+"""
+
+import threading
+
+_UNSET = object()
+
+
+class Lazy:
+    def __init__(self, build):
+        self._build = build
+        self._value = _UNSET
+        self._lock = threading.Lock()
+        self.__doc__ = build.__doc__
+        self.__name__ = getattr(build, "__name__", "lazy")
+
+    def __call__(self):
+        if self._value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._value = self._build()
+        return self._value
+
+    @property
+    def built(self):
+        return self._value is not _UNSET
+
+    def start(self):
+        """Build on a daemon thread unless already built; returns self."""
+        if not self.built:
+            threading.Thread(target=self._background, name=f"lazy-{self.__name__}", daemon=True).start()
+        return self
+
+    def _background(self):
+        try:
+            self()
+        except Exception:
+            pass  # raised again by the next foreground call
+
+
+def lazy(build):
+    """Decorator form of Lazy."""
+    return Lazy(build)
@@ -0,0 +1,163 @@
+"""Conversation memory with a token budget, for multi-turn console agents.
+
+SessionMemory keeps the most recent turns verbatim and folds older ones into
+a running summary, so the prompt sent each turn stays roughly the same size
+however long the conversation runs:
+
+    memory = SessionMemory(run_config=config, budget_tokens=1500)
+    result = await Runner.run(agent, memory.input(user_input), run_config=config)
+    memory.record(result)
+    print(memory.last)  # prompt size and what was compacted
+
+When the recent turns go over budget, the oldest ones are handed to a
+summarizer agent in a background task. They stay in the prompt until the new
+summary is ready, so nothing is lost while it runs, and the next turn is not
+kept waiting for it.
+
+Token counts are estimated (about 4 characters per token), which is all the
+budget needs; the usage reported by the model is shown next to the estimate.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a support conversation. Merge the previous summary "
+    "with the new messages into a short factual summary: who the user is, their issues, "
+    "what was done and what is still open. Reply with the summary only."
+)
+
+CHARS_PER_TOKEN = 4
+
+
+def _text(item):
+    if isinstance(item, str):
+        return item
+    if isinstance(item.get("content"), str):
+        return item["content"]
+    return json.dumps(item, default=str)
+
+
+def estimate_tokens(item):
+    """Rough token count of an input item (a message dict or plain text)."""
+    return len(_text(item)) // CHARS_PER_TOKEN + 4
+
+
+@dataclass
+class TurnStats:
+    turn: int
+    prompt_tokens: int  # estimated: summary + recent turns + the new message
+    model_input_tokens: int  # as reported by the model, summed over the turn's calls
+    window_turns: int
+    summary_tokens: int
+    compacted_turns: int  # turns folded into the summary so far
+
+    def __str__(self):
+        return (
+            f"🧠 turn {self.turn}: prompt ~{self.prompt_tokens} tokens (model saw {self.model_input_tokens}), "
+            f"{self.window_turns} recent turns + {self.summary_tokens}-token summary of {self.compacted_turns}"
+        )
+
+
+class SessionMemory:
+    def __init__(self, run_config=None, budget_tokens=1500, min_turns=2, summarizer=None):
+        """budget_tokens caps the verbatim recent turns; the last min_turns are never compacted."""
+        self.run_config = run_config
+        self.budget_tokens = budget_tokens
+        self.min_turns = min_turns
+        self.summarizer = summarizer
+        self.summary = ""
+        self.turns = []  # each turn is the list of input items it added
+        self.compacting = []  # turns being summarized right now
+        self.compacted_turns = 0
+        self.history = []  # TurnStats per recorded turn
+        self._task = None
+        self._pending_input = None
+
+    @property
+    def last(self):
+        return self.history[-1] if self.history else None
+
+    def _summary_items(self):
+        if not self.summary:
+            return []
+        return [{"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"}]
+
+    def _items(self):
+        items = self._summary_items()
+        for turn in self.compacting + self.turns:
+            items.extend(turn)
+        return items
+
+    def input(self, message):
+        """Input list for the next run: summary, recent turns, then the new user message."""
+        self._pending_input = self._items() + [{"role": "user", "content": message}]
+        return list(self._pending_input)
+
+    def remember(self, message, reply=None):
+        """Add a turn that was handled without running an agent (reply is optional)."""
+        turn = [{"role": "user", "content": message}]
+        if reply is not None:
+            turn.append({"role": "assistant", "content": reply})
+        self.turns.append(turn)
+        self._compact_if_needed()
+
+    def record(self, result):
+        """Store the turn that produced result (from a run given self.input(...))."""
+        if self._pending_input is None:
+            raise RuntimeError("record() must follow input()")
+        sent = self._pending_input
+        self._pending_input = None
+        self.turns.append(sent[-1:] + result.to_input_list()[len(sent):])
+
+        usage = getattr(getattr(result, "context_wrapper", None), "usage", None)
+        self.history.append(
+            TurnStats(
+                turn=len(self.history) + 1,
+                prompt_tokens=sum(map(estimate_tokens, sent)),
+                model_input_tokens=usage.input_tokens if usage else 0,
+                window_turns=len(self.compacting) + len(self.turns) - 1,
+                summary_tokens=sum(map(estimate_tokens, self._summary_items())),
+                compacted_turns=self.compacted_turns,
+            )
+        )
+        self._compact_if_needed()
+
+    def window_tokens(self):
+        return sum(estimate_tokens(item) for turn in self.turns for item in turn)
+
+    def _compact_if_needed(self):
+        if self._task is not None and not self._task.done():
+            return  # one compaction at a time; the next turn checks again
+        evicted = []
+        while len(self.turns) > self.min_turns and self.window_tokens() > self.budget_tokens:
+            evicted.append(self.turns.pop(0))
+        if evicted:
+            self.compacting = evicted
+            self._task = asyncio.get_running_loop().create_task(self._compact(evicted))
+
+    async def _compact(self, evicted):
+        from agents import Agent, Runner
+
+        if self.summarizer is None:
+            self.summarizer = Agent(name="Conversation Summarizer", instructions=SUMMARY_INSTRUCTIONS)
+        transcript = "\n".join(
+            f"{item.get('role', item.get('type', 'item'))}: {_text(item)}" for turn in evicted for item in turn
+        )
+        prompt = f"Previous summary:\n{self.summary or '(none)'}\n\nNew messages:\n{transcript}"
+        try:
+            result = await Runner.run(self.summarizer, prompt, run_config=self.run_config)
+        except Exception:
+            # Keep the turns verbatim rather than lose them; try again after the next turn
+            self.turns[:0] = evicted
+        else:
+            self.summary = str(result.final_output).strip()
+            self.compacted_turns += len(evicted)
+        finally:
+            self.compacting = []
+
+    async def wait(self):
+        """Wait for an in-flight compaction (e.g. before exiting or in benchmarks)."""
+        if self._task is not None:
+            await self._task
@@ -0,0 +1,396 @@
+"""Local stand-in for Gemini's OpenAI-compatible endpoint, for benchmarks and load tests.
+
+A minimal asyncio HTTP/1.1 server with keep-alive that answers
+POST .../chat/completions and GET .../models in the OpenAI shape after a
+configurable delay, so nothing here needs a Gemini key:
+
+- latency is a mean varied by +/- jitter, or a distribution spec such as
+  "lognormal:0.3,0.5" (see parse_latency) for realistic tails;
+- "stream": true requests get server-sent chat.completion.chunk events, one
+  per word, chunk_delay apart after the first;
+- when the request offers tools, the first turn calls the one whose name and
+  description best match the user's message, with arguments made up from its
+  JSON schema (or taken from tool_arguments); once it has been called, the
+  model replies in text. json_schema response formats get a matching object;
+- `handshake` delays the first response on every new connection, standing in
+  for the DNS + TCP + TLS round trips a real client pays before it can send
+  anything.
+
+request_limit / token_limit enforce a quota the way Gemini does: over a
+sliding `window` of seconds, a completion that would exceed either gets a 429
+with a Retry-After header instead. error_rate answers that share of
+completions with a 429 regardless. Requests and connections are counted so a
+benchmark can see how many reached it.
+
+    python -m agent_common.mock_server --port 8098 --latency lognormal:0.3,0.5 --handshake 0.15 --rpm 15
+    GEMINI_BASE_URL=http://127.0.0.1:8098/v1beta/openai/ GEMINI_API_KEY=test python main.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from itertools import count
+
+# name -> (sample(rng, *params), parameter names) for parse_latency
+DISTRIBUTIONS = {
+    "fixed": (lambda rng, seconds: seconds, "seconds"),
+    "uniform": (lambda rng, low, high: rng.uniform(low, high), "low,high"),
+    "normal": (lambda rng, mean, sd: max(0.0, rng.gauss(mean, sd)), "mean,sd"),
+    "lognormal": (lambda rng, median, sigma: median * math.exp(rng.gauss(0.0, sigma)), "median,sigma"),
+    "exponential": (lambda rng, mean: rng.expovariate(1 / mean) if mean else 0.0, "mean"),
+}
+
+
+def parse_latency(spec):
+    """A completion latency from spec: a number of seconds or "<distribution>:<params>".
+
+    A plain number is returned as a float (the mean, varied by the server's
+    jitter). Otherwise spec names one of DISTRIBUTIONS, e.g. "uniform:0.2,0.6"
+    or "lognormal:0.3,0.5", and the result is a function of a random.Random
+    returning seconds.
+    """
+    name, _, params = str(spec).partition(":")
+    if not params:
+        return float(name)
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"unknown latency distribution {name!r} (one of {', '.join(DISTRIBUTIONS)})")
+    sample, names = DISTRIBUTIONS[name]
+    values = [float(value) for value in params.split(",")]
+    if len(values) != len(names.split(",")):
+        raise ValueError(f"{name} latency takes {names}, got {params!r}")
+    return lambda rng: sample(rng, *values)
+
+
+def _text(content):
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def example(schema, defs=None):
+    """A value matching a JSON schema: the first enum value or default, "mock" for strings, 1 for numbers."""
+    if defs is None:
+        defs = schema.get("$defs", {})
+    if "$ref" in schema:
+        return example(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if schema.get(key):
+            return example(schema[key][0], defs)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        return {name: example(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example(schema.get("items", {}), defs)] if schema.get("minItems") else []
+    return {"integer": 1, "number": 1.0, "boolean": True, "null": None}.get(kind, "mock")
+
+
+def _pick_tool(tools, text):
+    """The offered function whose name and description share most words with text (the first on ties)."""
+    words = set(re.findall(r"[a-z]{4,}", text.lower()))
+
+    def score(tool):
+        function = tool.get("function", {})
+        about = f"{function.get('name', '')} {function.get('description', '')}".lower()
+        return sum(word in about for word in words)
+
+    return max(tools, key=score)
+
+
+def completion(request, number, tool_arguments=None):
+    """A chat.completion answering request.
+
+    Replies "Mock reply to: <last user message>", unless the request offers
+    tools none of which has been called since the last user message: then it
+    calls one (see _pick_tool), with tool_arguments[name] or arguments made up
+    from the tool's schema.
+    """
+    messages = request.get("messages") or []
+    prompt = " ".join(_text(message.get("content")) for message in messages)
+    last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+    last = _text(messages[last_user].get("content")) if last_user >= 0 else ""
+    tools = [tool for tool in request.get("tools") or [] if tool.get("type") == "function"]
+    called = {
+        call.get("function", {}).get("name")
+        for message in messages[last_user + 1 :]
+        for call in message.get("tool_calls") or []
+    }
+    offered = {tool["function"]["name"] for tool in tools}
+
+    if tools and request.get("tool_choice") != "none" and not called & offered:
+        function = _pick_tool(tools, last)["function"]
+        name = function["name"]
+        arguments = (tool_arguments or {}).get(name)
+        if arguments is None:
+            arguments = example(function.get("parameters") or {})
+        arguments = json.dumps(arguments)
+        call = {"id": f"call_mock_{number}", "type": "function", "function": {"name": name, "arguments": arguments}}
+        message, finish_reason, size = {"role": "assistant", "content": None, "tool_calls": [call]}, "tool_calls", len(arguments)
+    else:
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            reply = json.dumps(example(response_format.get("json_schema", {}).get("schema") or {}))
+        elif response_format.get("type") == "json_object":
+            reply = "{}"
+        else:
+            reply = f"Mock reply to: {last[:200]}"
+        message, finish_reason, size = {"role": "assistant", "content": reply}, "stop", len(reply)
+
+    prompt_tokens, completion_tokens = len(prompt) // 4 + 1, size // 4 + 1
+    return {
+        "id": f"chatcmpl-mock-{number}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "mock"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def chunks(payload):
+    """The chat.completion.chunk events that stream payload: role, one per word (or tool call), then finish and usage."""
+    base = {"id": payload["id"], "object": "chat.completion.chunk", "created": payload["created"], "model": payload["model"]}
+    choice = payload["choices"][0]
+    message = choice["message"]
+
+    def chunk(delta, finish_reason=None, **extra):
+        return {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra}
+
+    yield chunk({"role": "assistant", "content": ""})
+    for index, call in enumerate(message.get("tool_calls") or []):
+        yield chunk({"tool_calls": [{"index": index, **call}]})
+    for word in re.findall(r"\s*\S+\s*", message.get("content") or ""):
+        yield chunk({"content": word})
+    yield chunk({}, choice["finish_reason"], usage=payload["usage"])
+
+
+class MockServer:
+    def __init__(
+        self,
+        latency=0.3,
+        jitter=0.3,
+        handshake=0.0,
+        request_limit=None,
+        token_limit=None,
+        window=60.0,
+        chunk_delay=0.01,
+        error_rate=0.0,
+        retry_after=1,
+        tool_arguments=None,
+        seed=None,
+    ):
+        """latency is the mean completion delay in seconds, varied by +/- jitter of itself,
+        or a distribution (a parse_latency spec or a function of a random.Random).
+
+        For streamed completions latency is the time to the first chunk and
+        chunk_delay the gap between the following ones. handshake is the extra
+        delay before the first response on a new connection. request_limit and
+        token_limit are per `window` seconds; None means unlimited. error_rate
+        is the share of completions answered 429 (Retry-After: retry_after)
+        whatever the quota. tool_arguments maps tool names to the arguments to
+        call them with.
+        """
+        self.latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.jitter = jitter
+        self.handshake = handshake
+        self.request_limit = request_limit
+        self.token_limit = token_limit
+        self.window = window
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.tool_arguments = tool_arguments
+        self.requests = 0
+        self.connections = 0
+        self.completions = 0
+        self.streamed = 0
+        self.tool_calls = 0
+        self.throttled = 0
+        self.server = None
+        self._random = random.Random(seed)
+        self._ids = count(1)
+        self._served = deque()  # (time, tokens) of completions inside the window
+
+    def _latency(self):
+        if callable(self.latency):
+            return self.latency(self._random)
+        return self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _retry_after(self, tokens):
+        """None if a completion of tokens fits the quota now, else seconds until it would.
+
+        An injected 429 (error_rate) asks for retry_after seconds.
+        """
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.retry_after
+        now = time.monotonic()
+        while self._served and self._served[0][0] <= now - self.window:
+            self._served.popleft()
+        used = sum(spent for _, spent in self._served)
+        over_requests = self.request_limit is not None and len(self._served) >= self.request_limit
+        over_tokens = self.token_limit is not None and self._served and used + tokens > self.token_limit
+        if not (over_requests or over_tokens):
+            self._served.append((now, tokens))
+            return None
+        return max(0.0, self._served[0][0] + self.window - now)
+
+    async def _stream(self, writer, payload):
+        """Send payload as server-sent events in a chunked response."""
+
+        async def send(data):
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        for n, event in enumerate(chunks(payload)):
+            if n > 1 and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            await send(f"data: {json.dumps(event)}\n\n".encode())
+        await send(b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        first = True
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = b""
+                if length := int(headers.get("content-length", 0)):
+                    body = await reader.readexactly(length)
+
+                self.requests += 1
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                path = target.split("?", 1)[0].rstrip("/")
+                delay = self.handshake if first else 0.0
+                first = False
+                extra = ""
+                stream = False
+                if method == "POST" and path.endswith("/chat/completions"):
+                    self.completions += 1
+                    request = json.loads(body or b"{}")
+                    status, payload = "200 OK", completion(request, next(self._ids), self.tool_arguments)
+                    wait = self._retry_after(payload["usage"]["total_tokens"])
+                    if wait is None:
+                        delay += self._latency()
+                        stream = bool(request.get("stream"))
+                        self.streamed += stream
+                        self.tool_calls += payload["choices"][0]["finish_reason"] == "tool_calls"
+                    else:
+                        self.throttled += 1
+                        status = "429 Too Many Requests"
+                        payload = {"error": {"code": 429, "message": "Resource exhausted.", "status": "RESOURCE_EXHAUSTED"}}
+                        extra = f"Retry-After: {math.ceil(wait)}\r\n"
+                elif method == "GET" and path.endswith("/models"):
+                    status, payload = "200 OK", {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+                else:
+                    status, payload = "404 Not Found", {"error": {"message": f"No route for {method} {path}"}}
+                if delay:
+                    await asyncio.sleep(delay)
+
+                if stream:
+                    await self._stream(writer, payload)
+                else:
+                    data = json.dumps(payload).encode()
+                    writer.write(
+                        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                        f"{extra}Connection: keep-alive\r\n\r\n".encode() + data
+                    )
+                    await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening; returns the base URL to use as GEMINI_BASE_URL."""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1beta/openai/"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        """Serve from a daemon thread with its own event loop; returns the base URL."""
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.start(host, port), loop).result()
+
+
+async def serve(args):
+    server = MockServer(
+        latency=args.latency,
+        handshake=args.handshake,
+        request_limit=args.rpm,
+        token_limit=args.tpm,
+        chunk_delay=args.chunk_delay,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    url = await server.start(port=args.port)
+    print(f"🧪 Mock Gemini endpoint on {url} (latency {args.latency}, {args.handshake * 1e3:.0f} ms handshake)")
+    if args.rpm or args.tpm:
+        print(f"   quota: {args.rpm or 'unlimited'} requests, {args.tpm or 'unlimited'} tokens per minute")
+    if args.error_rate:
+        print(f"   answering {args.error_rate:.0%} of completions with 429")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def add_server_arguments(parser):
+    """The latency, streaming and 429 options shared by this CLI and the load-test harness."""
+    parser.add_argument(
+        "--latency",
+        default="0.3",
+        help="completion delay: mean seconds (+/-30%%) or fixed:S, uniform:LOW,HIGH, normal:MEAN,SD, "
+        "lognormal:MEDIAN,SIGMA, exponential:MEAN",
+    )
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="seconds between streamed chunks")
+    parser.add_argument("--rpm", type=int, help="requests per minute before answering 429")
+    parser.add_argument("--tpm", type=int, help="tokens per minute before answering 429")
+    parser.add_argument("--429-rate", dest="error_rate", type=float, default=0.0, help="share of completions answered 429")
+    parser.add_argument("--seed", type=int, help="seed for latencies and 429 injection")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for Gemini's OpenAI-compatible endpoint")
+    parser.add_argument("--port", type=int, default=8098)
+    parser.add_argument("--handshake", type=float, default=0.15, help="extra delay on each new connection")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    try:
+        parse_latency(args.latency)
+    except ValueError as e:
+        parser.error(str(e))
+    asyncio.run(serve(args))
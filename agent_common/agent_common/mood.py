@@ -0,0 +1,167 @@
+"""Local lexicon-based mood classifier.
+
+Scores a message against weighted n-gram lexicons for the same label
+set the mood agents use, so the LLM is only needed when the lexicon is unsure.
+Negated words ("not happy") move their weight to the opposite side and
+intensifiers ("so stressed") boost the word that follows them. A negated
+neutral word ("not okay", "not fine") is split between sad and stressed, so
+it reads as negative but stays below the confidence that skips the LLM.
+"""
+
+import re
+
+import numpy as np
+
+LABELS = ("happy", "sad", "angry", "excited", "stressed", "neutral")
+
+LEXICON = {
+    "happy": {
+        "happy": 1.0, "glad": 1.0, "good": 0.6, "great": 0.8, "wonderful": 1.0, "joy": 1.0, "joyful": 1.0,
+        "cheerful": 1.0, "content": 0.8, "grateful": 0.9, "thankful": 0.9, "pleased": 0.9, "smiling": 0.9,
+        "blessed": 0.8, "relaxed": 0.7, "peaceful": 0.8, "awesome": 0.8, "amazing": 0.6, "love": 0.6,
+        "fantastic": 0.8, "delighted": 1.0, "lovely": 0.7, "feeling good": 1.2, "good day": 1.0,
+        "good mood": 1.2,
+    },
+    "sad": {
+        "sad": 1.0, "unhappy": 1.0, "down": 0.7, "depressed": 1.2, "lonely": 1.1, "alone": 0.7, "cry": 1.0,
+        "crying": 1.1, "cried": 1.0, "tears": 0.9, "heartbroken": 1.3, "miserable": 1.2, "hopeless": 1.2,
+        "empty": 0.8, "gloomy": 1.0, "upset": 0.8, "hurt": 0.8, "lost": 0.6, "miss": 0.6, "grief": 1.2,
+        "sorrow": 1.1, "blue": 0.5, "low": 0.6, "feeling down": 1.3, "broke up": 1.0, "passed away": 1.1,
+        "let down": 0.9,
+    },
+    "angry": {
+        "angry": 1.0, "mad": 1.0, "furious": 1.3, "annoyed": 0.9, "irritated": 0.9, "frustrated": 0.8,
+        "hate": 1.0, "rage": 1.2, "pissed": 1.1, "outraged": 1.2, "livid": 1.3, "fed up": 1.1,
+        "sick of": 1.0, "so unfair": 1.0, "unfair": 0.7, "yelled": 0.8, "yelling": 0.8, "disgusted": 0.9,
+        "resent": 0.9, "infuriating": 1.2, "ticked off": 1.0,
+    },
+    "excited": {
+        "excited": 1.2, "thrilled": 1.2, "pumped": 1.1, "stoked": 1.1, "ecstatic": 1.2, "eager": 0.9,
+        "hyped": 1.1, "can't wait": 1.3, "cant wait": 1.3, "looking forward": 1.1, "yay": 1.0,
+        "woohoo": 1.1, "finally": 0.5, "adventure": 0.6, "celebrate": 0.8, "celebrating": 0.8,
+        "promotion": 0.6, "got the job": 1.1, "got accepted": 1.1, "so excited": 1.4,
+    },
+    "stressed": {
+        "stressed": 1.2, "stress": 1.0, "anxious": 1.1, "anxiety": 1.1, "worried": 1.0, "worry": 0.9,
+        "nervous": 1.0, "overwhelmed": 1.2, "pressure": 0.9, "deadline": 0.8, "deadlines": 0.8,
+        "exhausted": 0.8, "tired": 0.6, "burnt out": 1.2, "burned out": 1.2, "burnout": 1.2, "panic": 1.1,
+        "tense": 0.9, "exam": 0.6, "exams": 0.6, "too much": 0.8, "can't sleep": 1.0, "cant sleep": 1.0,
+        "freaking out": 1.1, "on edge": 1.0,
+    },
+    "neutral": {
+        "okay": 0.8, "ok": 0.8, "fine": 0.8, "alright": 0.8, "normal": 0.9, "usual": 0.7, "meh": 0.8,
+        "nothing special": 1.1, "so so": 1.0, "not bad": 1.0, "same as always": 1.1, "just another": 0.8,
+        "regular": 0.6, "average": 0.8, "calm": 0.5,
+    },
+}
+
+NEGATORS = {"not", "no", "never", "don't", "dont", "isn't", "isnt", "wasn't", "wasnt", "hardly", "without"}
+INTENSIFIERS = {"so": 1.5, "very": 1.5, "really": 1.4, "extremely": 1.8, "super": 1.5, "totally": 1.4, "too": 1.3}
+
+# Where a negated word's weight goes: "not happy" reads as sad, "not stressed" as neutral, and
+# "not okay" as something bad without saying which (a {label: share} split)
+NEGATION = {
+    "happy": "sad",
+    "excited": "neutral",
+    "sad": "neutral",
+    "angry": "neutral",
+    "stressed": "neutral",
+    "neutral": {"sad": 0.5, "stressed": 0.5},
+}
+
+# Confidence reported when no lexicon entry matched at all
+NO_SIGNAL_CONFIDENCE = 0.2
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+class MoodClassifier:
+    """Vectorized lexicon scorer returning (label, confidence) pairs."""
+
+    def __init__(self, lexicon=LEXICON, labels=LABELS, sharpness=3.0):
+        self.labels = tuple(labels)
+        self.sharpness = sharpness
+        label_index = {label: i for i, label in enumerate(self.labels)}
+
+        self.vocab = {}
+        rows = []
+        for label, terms in lexicon.items():
+            for term, weight in terms.items():
+                idx = self.vocab.setdefault(term, len(self.vocab))
+                if idx == len(rows):
+                    rows.append(np.zeros(len(self.labels)))
+                rows[idx][label_index[label]] += weight
+        self.weights = np.vstack(rows) if rows else np.zeros((0, len(self.labels)))
+
+        negation = np.zeros((len(self.labels), len(self.labels)))
+        for label, i in label_index.items():
+            target = NEGATION.get(label, "neutral")
+            for negated_label, share in (target.items() if isinstance(target, dict) else ((target, 1.0),)):
+                negation[i, label_index[negated_label]] += share
+        self.negated_weights = self.weights @ negation
+        self._neutral = label_index.get("neutral", len(self.labels) - 1)
+
+    def _matches(self, text):
+        """Yield (vocab index, multiplier, negated) for every n-gram hit in text."""
+        tokens = _TOKEN.findall(text.lower())
+        for i, token in enumerate(tokens):
+            negated = any(t in NEGATORS for t in tokens[max(0, i - 2):i])
+            boost = INTENSIFIERS.get(tokens[i - 1], 1.0) if i else 1.0
+            if i + 1 < len(tokens):
+                bigram = self.vocab.get(f"{token} {tokens[i + 1]}")
+                if bigram is not None:
+                    yield bigram, boost, negated and token not in NEGATORS
+            if i + 2 < len(tokens):
+                trigram = self.vocab.get(f"{token} {tokens[i + 1]} {tokens[i + 2]}")
+                if trigram is not None:
+                    yield trigram, boost, False
+            unigram = self.vocab.get(token)
+            if unigram is not None:
+                yield unigram, boost, negated
+
+    def scores(self, texts):
+        """Raw (len(texts), len(labels)) score matrix."""
+        rows, idx, boost, negated = [], [], [], []
+        for row, text in enumerate(texts):
+            for i, b, n in self._matches(text):
+                rows.append(row)
+                idx.append(i)
+                boost.append(b)
+                negated.append(n)
+
+        scores = np.zeros((len(texts), len(self.labels)))
+        if idx:
+            idx, negated = np.asarray(idx), np.asarray(negated)
+            contributions = np.where(negated[:, None], self.negated_weights[idx], self.weights[idx])
+            np.add.at(scores, np.asarray(rows), contributions * np.asarray(boost)[:, None])
+        return scores
+
+    def predict(self, texts):
+        """Classify a batch; returns (labels, confidences) as lists."""
+        scores = self.scores(texts)
+        z = scores * self.sharpness
+        z -= z.max(axis=1, keepdims=True)
+        probs = np.exp(z)
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        best = probs.argmax(axis=1)
+        confidence = probs[np.arange(len(texts)), best]
+        silent = ~scores.any(axis=1)
+        best[silent] = self._neutral
+        confidence[silent] = NO_SIGNAL_CONFIDENCE
+        return [self.labels[i] for i in best], confidence.tolist()
+
+    def classify(self, text):
+        labels, confidences = self.predict([text])
+        return labels[0], confidences[0]
+
+
+_default = None
+
+
+def classify(text):
+    """Classify one message with the default lexicon; returns (label, confidence)."""
+    global _default
+    if _default is None:
+        _default = MoodClassifier()
+    return _default.classify(text)
@@ -0,0 +1,179 @@
+"""Answer cache that also hits on near-duplicate questions.
+
+"What time do you open?" and "what time do u open" should not cost two
+model calls when the answer is the same. NearDuplicateCache
+normalizes each question, takes its character n-grams and indexes a MinHash
+signature of them in LSH buckets, so a lookup only compares against the few
+stored questions that share a bucket. Similarity is the mean of two Jaccard
+scores: character n-grams (tolerant of typos and "u" for "you") and content
+words (so "when do you open" and "when do you close" stay apart). A candidate
+is a hit when it reaches `threshold`.
+
+    cache = NearDuplicateCache(threshold=0.8)
+    hit = cache.get("what time do u open")  # None, or (answer, similarity)
+    cache.put("What time do you open?", answer, tags=("hours",))
+    cache.invalidate("hours")  # the opening hours changed
+
+Everything is local and in memory; with the defaults a lookup takes about a
+tenth of a millisecond.
+"""
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+_PRIME = (1 << 31) - 1
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+STOPWORDS = frozenset(
+    "a an the is are am was were be do does did you u your ur we our i me my it its this that there "
+    "what when where which who how can could would will to of in on at for from with and or any some "
+    "please pls hi hello hey thanks thank guys r s whats have has".split()
+)
+
+
+def normalize(text):
+    return " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+
+
+@dataclass
+class NearDupStats:
+    lookups: int = 0
+    hits: int = 0
+    exact_hits: int = 0
+    lookup_seconds: float = 0.0
+    invalidated: int = 0
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def __str__(self):
+        mean_us = self.lookup_seconds / self.lookups * 1e6 if self.lookups else 0.0
+        return (
+            f"{self.hits}/{self.lookups} hits ({self.hit_rate:.0%}, {self.exact_hits} exact), "
+            f"{mean_us:.0f}µs per lookup, {self.invalidated} invalidated"
+        )
+
+
+@dataclass
+class _Entry:
+    question: str
+    answer: object
+    shingles: frozenset
+    words: frozenset
+    keys: tuple  # LSH bucket keys
+    tags: tuple
+
+
+class NearDuplicateCache:
+    def __init__(self, threshold=0.8, ngram=4, num_perm=96, bands=32, max_entries=10_000, seed=1):
+        """threshold is the similarity (0-1) needed for a hit.
+
+        bands x (num_perm / bands) rows sets the LSH recall curve; the defaults
+        find nearly all pairs whose character n-grams overlap by 0.5 or more.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)[:, None]
+        self._entries = OrderedDict()  # normalized question -> _Entry, oldest first
+        self._buckets = {}  # LSH key -> set of normalized questions
+        self.stats = NearDupStats()
+
+    def _shingles(self, text):
+        # Content words only, so shared filler ("do you", "what is") does not make questions look alike
+        text = " ".join(word for word in text.split() if word not in STOPWORDS) or text
+        padded = f" {text} "
+        if len(padded) <= self.ngram:
+            return frozenset((padded,))
+        return frozenset(padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1))
+
+    @staticmethod
+    def _words(text):
+        return frozenset(word for word in text.split() if word not in STOPWORDS)
+
+    @staticmethod
+    def _jaccard(a, b):
+        return len(a & b) / len(a | b) if a or b else 1.0
+
+    def _keys(self, shingles):
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles), dtype=np.uint64)
+        signature = ((self._a * x + self._b) % _PRIME).min(axis=1)
+        bands = signature.reshape(self.bands, self.rows)
+        return tuple((band, row.tobytes()) for band, row in enumerate(bands))
+
+    def get(self, question):
+        """(answer, similarity) for the most similar cached question above threshold, else None."""
+        start = time.perf_counter()
+        try:
+            return self._lookup(normalize(question))
+        finally:
+            self.stats.lookups += 1
+            self.stats.lookup_seconds += time.perf_counter() - start
+
+    def _lookup(self, text):
+        entry = self._entries.get(text)
+        if entry is not None:
+            self.stats.hits += 1
+            self.stats.exact_hits += 1
+            self._entries.move_to_end(text)
+            return entry.answer, 1.0
+
+        shingles, words = self._shingles(text), self._words(text)
+        candidates = set()
+        for key in self._keys(shingles):
+            candidates |= self._buckets.get(key, set())
+        best, best_similarity = None, 0.0
+        for candidate in candidates:
+            other = self._entries[candidate]
+            similarity = (self._jaccard(shingles, other.shingles) + self._jaccard(words, other.words)) / 2
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        if best is None or best_similarity < self.threshold:
+            return None
+        self.stats.hits += 1
+        self._entries.move_to_end(best)
+        return self._entries[best].answer, best_similarity
+
+    def put(self, question, answer, tags=()):
+        text = normalize(question)
+        if text in self._entries:
+            self._remove(text)
+        shingles = self._shingles(text)
+        entry = _Entry(question, answer, shingles, self._words(text), self._keys(shingles), tuple(tags))
+        self._entries[text] = entry
+        for key in entry.keys:
+            self._buckets.setdefault(key, set()).add(text)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, text):
+        entry = self._entries.pop(text)
+        for key in entry.keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(text)
+                if not bucket:
+                    del self._buckets[key]
+
+    def invalidate(self, tag=None):
+        """Drop every entry carrying tag, or everything when tag is None; returns the count."""
+        doomed = [text for text, entry in self._entries.items() if tag is None or tag in entry.tags]
+        for text in doomed:
+            self._remove(text)
+        self.stats.invalidated += len(doomed)
+        return len(doomed)
+
+    def __len__(self):
+        return len(self._entries)
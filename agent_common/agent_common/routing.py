@@ -0,0 +1,294 @@
+"""Per-agent model selection from one policy file, with latency- and error-based failover.
+
+Every agent used to be pinned to gemini-2.0-flash, one-word classifiers
+included. models.toml (next to this module, or the file AGENT_MODELS names)
+gives each agent a task class; the class picks a tier, an ordered list of
+models, and the ModelSettings limits (max_tokens, temperature) its calls
+get. route() applies it to agents by name:
+
+    from agent_common.routing import route
+
+    route(triage_agent)  # and the agents it hands off to
+    route(mood_detector, activity_suggester, scope="assign2")  # "assign2/<name>" entries first
+
+Each routed agent gets a RoutedModel. It sends a call to the first model of
+the tier that is healthy, i.e. whose recent calls for that task class (the
+last window_seconds) have a p95 below the class's p95_seconds and an error
+rate below max_error_rate. A connection error, timeout, 404, 429 or 5xx
+moves the call on to the next model; a model that was skipped gets tried
+again once its bad calls have aged out of the window. health_report() lists
+what each model has been doing.
+
+run_config() leaves the model to each agent unless it is given one, which
+would override every route.
+"""
+
+import os
+import threading
+import time
+import tomllib
+from collections import deque
+from dataclasses import dataclass, field
+
+import openai
+from agents import ModelSettings
+from agents.models.interface import Model
+
+from agent_common import runtime
+from agent_common.stats import percentile
+
+DEFAULT_POLICY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models.toml")
+
+
+@dataclass(frozen=True)
+class Route:
+    agent: str
+    task_class: str
+    tier: str
+    models: tuple  # model names, preferred first
+    settings: dict = field(hash=False)  # ModelSettings fields
+    p95_seconds: float = 8.0
+    max_error_rate: float = 0.2
+
+    def model_settings(self):
+        return ModelSettings(**self.settings)
+
+
+class Policy:
+    """The parsed policy file: defaults, tiers, task classes and agent entries."""
+
+    def __init__(self, data):
+        self.defaults = data.get("defaults", {})
+        self.tiers = data.get("tiers", {})
+        self.classes = data.get("classes", {})
+        self.agents = data.get("agents", {})
+        self.window = self.defaults.get("window_seconds", 120.0)
+        self.min_samples = self.defaults.get("min_samples", 5)
+        for name, task_class in self.classes.items():
+            if task_class.get("tier") not in self.tiers:
+                raise ValueError(f"task class {name!r} names unknown tier {task_class.get('tier')!r}")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as f:
+            return cls(tomllib.load(f))
+
+    def route(self, name, scope=None):
+        """The Route for the agent called name; scope/name entries take precedence over name."""
+        entry = self.agents.get(f"{scope}/{name}") if scope else None
+        if entry is None:
+            entry = self.agents.get(name, {})
+        if isinstance(entry, str):
+            entry = {"class": entry}
+        class_name = entry.get("class", self.defaults.get("class", "chat"))
+        if class_name not in self.classes:
+            raise ValueError(f"agent {name!r}: unknown task class {class_name!r} (known: {', '.join(self.classes)})")
+        task_class = self.classes[class_name]
+        tier = entry.get("tier", task_class["tier"])
+        if tier not in self.tiers:
+            raise ValueError(f"agent {name!r}: unknown tier {tier!r} (known: {', '.join(self.tiers)})")
+
+        def setting(key, default):
+            return entry.get(key, task_class.get(key, self.defaults.get(key, default)))
+
+        return Route(
+            agent=name,
+            task_class=class_name,
+            tier=tier,
+            models=tuple(entry.get("models") or self.tiers[tier]),
+            settings={**task_class.get("settings", {}), **entry.get("settings", {})},
+            p95_seconds=setting("p95_seconds", 8.0),
+            max_error_rate=setting("max_error_rate", 0.2),
+        )
+
+
+class ModelHealth:
+    """Duration and outcome of one model's recent calls for one task class."""
+
+    def __init__(self, window=120.0, min_samples=5):
+        self.window = window
+        self.min_samples = min_samples
+        self.calls = 0
+        self.failures = 0
+        self._samples = deque()  # (finished at, seconds, ok)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.calls += 1
+            self.failures += not ok
+            self._samples.append((time.monotonic(), seconds, ok))
+
+    def recent(self):
+        """(seconds, ok) of the calls within the window."""
+        with self._lock:
+            cutoff = time.monotonic() - self.window
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            return [(seconds, ok) for _, seconds, ok in self._samples]
+
+    def p95(self):
+        durations = [seconds for seconds, ok in self.recent() if ok]
+        return percentile(durations, 95) if durations else None
+
+    def error_rate(self):
+        recent = self.recent()
+        return sum(not ok for _, ok in recent) / len(recent) if recent else 0.0
+
+    def healthy(self, p95_seconds, max_error_rate):
+        recent = self.recent()
+        if len(recent) < self.min_samples:
+            return True
+        if sum(not ok for _, ok in recent) / len(recent) > max_error_rate:
+            return False
+        durations = sorted(seconds for seconds, ok in recent if ok)
+        return not durations or percentile(durations, 95) <= p95_seconds
+
+
+def _should_fail_over(error):
+    if isinstance(error, openai.APIConnectionError):  # timeouts included
+        return True
+    return isinstance(error, openai.APIStatusError) and (error.status_code in (404, 429) or error.status_code >= 500)
+
+
+class RoutedModel(Model):
+    def __init__(self, route, health):
+        """Serve route's calls from the first of its models that health(task class, model) calls healthy."""
+        self.route = route
+        self.model = route.models[0]  # the name, as on OpenAIChatCompletionsModel
+        self._health = health
+        self.failovers = 0
+
+    def candidates(self):
+        """Model names in the order to try them: healthy ones in policy order, then the rest."""
+        route = self.route
+        healthy = [
+            name for name in route.models
+            if self._health(route.task_class, name).healthy(route.p95_seconds, route.max_error_rate)
+        ]
+        return healthy + [name for name in route.models if name not in healthy]
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        names = self.candidates()
+        for i, name in enumerate(names):
+            health = self._health(self.route.task_class, name)
+            start = time.perf_counter()
+            try:
+                response = await runtime.get_model(name).get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                )
+            except openai.APIError as e:
+                health.record(time.perf_counter() - start, ok=False)
+                if i == len(names) - 1 or not _should_fail_over(e):
+                    raise
+                self.failovers += 1
+                continue
+            health.record(time.perf_counter() - start, ok=True)
+            return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        names = self.candidates()
+        for i, name in enumerate(names):
+            health = self._health(self.route.task_class, name)
+            start = time.perf_counter()
+            streamed = False
+            try:
+                async for event in runtime.get_model(name).stream_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                ):
+                    streamed = True
+                    yield event
+            except openai.APIError as e:
+                health.record(time.perf_counter() - start, ok=False)
+                # Once events have reached the caller, another model cannot take over the reply
+                if streamed or i == len(names) - 1 or not _should_fail_over(e):
+                    raise
+                self.failovers += 1
+                continue
+            health.record(time.perf_counter() - start, ok=True)
+            return
+
+
+class Router:
+    """A Policy plus the health of every (task class, model) and one RoutedModel per route."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._health = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def health(self, task_class, model):
+        with self._lock:
+            health = self._health.get((task_class, model))
+            if health is None:
+                health = self._health[(task_class, model)] = ModelHealth(self.policy.window, self.policy.min_samples)
+            return health
+
+    def model(self, route):
+        with self._lock:
+            model = self._models.get(route)
+            if model is None:
+                model = self._models[route] = RoutedModel(route, self.health)
+            return model
+
+    def route(self, *agents, scope=None):
+        seen = set()
+        pending = list(agents)
+        while pending:
+            agent = pending.pop()
+            if id(agent) in seen:
+                continue
+            seen.add(id(agent))
+            route = self.policy.route(agent.name, scope)
+            agent.model = self.model(route)
+            # The agent's own settings (e.g. tool_choice) win over the policy's
+            agent.model_settings = route.model_settings().resolve(agent.model_settings)
+            # A Handoff object only carries the target's name; agents listed directly are routed too
+            pending.extend(h for h in agent.handoffs if hasattr(h, "handoffs"))
+
+    def health_report(self):
+        """One dict per (task class, model) that has been called."""
+        with self._lock:
+            items = sorted(self._health.items())
+        report = []
+        for (task_class, model), health in items:
+            p95 = health.p95()
+            report.append({
+                "class": task_class,
+                "model": model,
+                "calls": health.calls,
+                "failures": health.failures,
+                "recent_p95_ms": None if p95 is None else round(p95 * 1e3, 1),
+                "recent_error_rate": round(health.error_rate(), 3),
+            })
+        return report
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """The process-wide Router, loading AGENT_MODELS or the packaged models.toml on first call."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = Router(Policy.from_file(os.getenv("AGENT_MODELS") or DEFAULT_POLICY))
+        return _router
+
+
+def reset():
+    """Forget the router; the next call reloads the policy and starts with no health data."""
+    global _router
+    with _router_lock:
+        _router = None
+
+
+def route(*agents, scope=None):
+    """Give each agent, and the agents it hands off to, its routed model and ModelSettings from the policy."""
+    get_router().route(*agents, scope=scope)
+
+
+def health_report():
+    return get_router().health_report()
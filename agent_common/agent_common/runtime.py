@@ -0,0 +1,275 @@
+"""One pooled Gemini client per process, shared by every project.
+
+Each script used to build its own AsyncOpenAI and OpenAIChatCompletionsModel
+at import time with the openai defaults, where idle connections are dropped
+after 5 seconds. That is shorter than a user takes to type the next message,
+so most turns paid for a fresh TCP+TLS handshake. Here the client is created
+on first use, with keep-alive and pool limits sized for chat sessions (HTTP/2
+when the h2 package is installed), and everything hands out the same one:
+
+    from agent_common.runtime import get_model, run_config, warm_up
+
+    config = run_config()  # a new RunConfig on the shared client per call
+    agent = Agent(name="Assistant", instructions="...", model=get_model())
+    asyncio.create_task(warm_up())  # handshake while the user is still typing
+
+httpx connection pools belong to the event loop that opened them, and these
+scripts mix Runner.run_sync, asyncio.run per request (streamlit) and
+long-lived loops (chainlit). The client's transport therefore keeps one pool
+per event loop; within a loop every agent and session shares it.
+
+Chat completion requests also go through a process-wide RequestScheduler
+(scheduler.py): token buckets for the Gemini quota, interactive turns ahead
+of batch jobs, and a shared backoff after 429s.
+
+Which model each agent gets, and with what limits, is routing.py's job
+(models.toml); run_config() leaves it to the agents unless given a model.
+
+With AGENT_CASSETTE set, get_model() wraps its models in a CassetteModel
+(cassette.py) that records responses to that file or replays them
+(AGENT_CASSETTE_MODE=record, replay or auto); replaying needs no API key.
+
+GEMINI_API_KEY, GEMINI_BASE_URL, the quota (GEMINI_RPM, GEMINI_TPM) and the
+cassette are read from the environment or .env; configure() overrides them
+and the pool settings before first use.
+"""
+
+import asyncio
+import importlib.util
+import os
+import time
+import weakref
+from dataclasses import dataclass, replace
+
+import httpx
+from dotenv import load_dotenv
+
+from agent_common.scheduler import RequestScheduler, ScheduledTransport
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    api_key: str | None = None  # None: GEMINI_API_KEY
+    base_url: str | None = None  # None: GEMINI_BASE_URL, else the Gemini endpoint
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 300.0  # seconds an idle connection is kept open
+    connect_timeout: float = 5.0
+    timeout: float = 60.0
+    max_retries: int = 2
+    http2: bool | None = None  # None: use HTTP/2 when h2 is installed
+    request_limit: int | None = None  # None: GEMINI_RPM, else no client-side request limit
+    token_limit: int | None = None  # None: GEMINI_TPM, else no client-side token limit
+    limit_window: float = 60.0  # seconds the request and token limits are counted over
+    cassette: str | None = None  # None: AGENT_CASSETTE, else models are not wrapped
+    cassette_mode: str | None = None  # None: AGENT_CASSETTE_MODE, else "auto"
+    cassette_latency: float = 0.0  # replayed calls wait this times their recorded duration
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """httpx transport with one connection pool per event loop."""
+
+    def __init__(self, **transport_kwargs):
+        # Loading the CA bundle takes tens of milliseconds; do it once, not per loop
+        transport_kwargs.setdefault("verify", httpx.create_ssl_context())
+        self.transport_kwargs = transport_kwargs
+        self._transports = weakref.WeakKeyDictionary()  # loop -> AsyncHTTPTransport
+
+    def _transport(self):
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self.transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request):
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        """Close the running loop's pool; pools of other loops go when their loop does."""
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+_settings = ClientSettings()
+_client = None
+_scheduler = None
+_cassette = None
+_provider = None
+_models = {}
+
+
+def configure(**changes):
+    """Change ClientSettings fields; takes effect for clients created afterwards.
+
+    Call it before the first get_client()/get_model()/run_config(), or call
+    reset() to drop the current client.
+    """
+    global _settings
+    _settings = replace(_settings, **changes)
+    return _settings
+
+
+def reset():
+    """Forget the current client, scheduler, cassette, provider and models; the next call builds new ones."""
+    global _client, _scheduler, _cassette, _provider
+    _client = _scheduler = _cassette = _provider = None
+    _models.clear()
+
+
+def settings():
+    return _settings
+
+
+def _http2(setting):
+    if setting is None:
+        return importlib.util.find_spec("h2") is not None
+    return setting
+
+
+def _env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def get_scheduler():
+    """The process-wide RequestScheduler every chat completion request waits in."""
+    global _scheduler
+    if _scheduler is None:
+        load_dotenv()
+        _scheduler = RequestScheduler(
+            request_limit=_settings.request_limit or _env_int("GEMINI_RPM"),
+            token_limit=_settings.token_limit or _env_int("GEMINI_TPM"),
+            window=_settings.limit_window,
+        )
+    return _scheduler
+
+
+def _cassette_mode():
+    return _settings.cassette_mode or os.getenv("AGENT_CASSETTE_MODE") or "auto"
+
+
+def get_cassette():
+    """The process-wide Cassette models record to and replay from, or None when none is configured."""
+    global _cassette
+    if _cassette is None:
+        load_dotenv()
+        path = _settings.cassette or os.getenv("AGENT_CASSETTE")
+        if path:
+            from agent_common.cassette import Cassette
+
+            _cassette = Cassette(path)
+    return _cassette
+
+
+def get_client():
+    """The process-wide AsyncOpenAI client, created on first call."""
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        load_dotenv()
+        api_key = _settings.api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key and get_cassette() is not None and _cassette_mode() == "replay":
+            api_key = "unused"  # every response comes from the cassette
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is not set (environment or .env)")
+        base_url = _settings.base_url or os.getenv("GEMINI_BASE_URL") or GEMINI_BASE_URL
+        timeout = httpx.Timeout(_settings.timeout, connect=_settings.connect_timeout)
+        transport = LoopLocalTransport(
+            http2=_http2(_settings.http2),
+            limits=httpx.Limits(
+                max_connections=_settings.max_connections,
+                max_keepalive_connections=_settings.max_keepalive_connections,
+                keepalive_expiry=_settings.keepalive_expiry,
+            ),
+            retries=1,  # connect retries only; openai retries failed requests (and 429s) itself
+        )
+        transport = ScheduledTransport(transport, get_scheduler())
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=_settings.max_retries,
+            http_client=httpx.AsyncClient(transport=transport, timeout=timeout, follow_redirects=True),
+        )
+    return _client
+
+
+def get_provider():
+    """A ModelProvider handing out get_model(), so agents may also name their model as a string.
+
+    Agents with no model get DEFAULT_MODEL.
+    """
+    global _provider
+    if _provider is None:
+        from agents import ModelProvider
+
+        class SharedProvider(ModelProvider):  # defined here to keep the agents import lazy
+            def get_model(self, model_name):
+                return get_model(model_name or DEFAULT_MODEL)
+
+        _provider = SharedProvider()
+    return _provider
+
+
+def get_model(name=DEFAULT_MODEL):
+    """The OpenAIChatCompletionsModel for name on the shared client, one per name.
+
+    With a cassette configured it comes wrapped in a CassetteModel.
+    """
+    model = _models.get(name)
+    if model is None:
+        from agents import OpenAIChatCompletionsModel
+
+        model = OpenAIChatCompletionsModel(model=name, openai_client=get_client())
+        if (cassette := get_cassette()) is not None:
+            from agent_common.cassette import CassetteModel
+
+            model = CassetteModel(model, cassette, _cassette_mode(), _settings.cassette_latency)
+        _models[name] = model
+    return model
+
+
+def run_config(model=None, **kwargs):
+    """A new RunConfig using the shared client.
+
+    By default each agent runs on its own model (see routing.py), and agents
+    without one on DEFAULT_MODEL. A model name or Model pins every agent to it.
+    Tracing is on only once agent_common.telemetry is installed, and then
+    without prompts and replies in the span data. Extra keyword arguments are
+    passed to RunConfig (e.g. workflow_name).
+    """
+    from agents import RunConfig
+
+    from agent_common import telemetry
+
+    kwargs.setdefault("tracing_disabled", not telemetry.installed())
+    kwargs.setdefault("trace_include_sensitive_data", False)
+    if isinstance(model, str):
+        model = get_model(model)
+    return RunConfig(model=model, model_provider=get_provider(), **kwargs)
+
+
+async def warm_up(connections=1):
+    """Open `connections` pooled connections (DNS, TCP, TLS) before the first model call.
+
+    Sends that many concurrent GET /models requests on the running loop's pool.
+    Returns the seconds taken. Failures are ignored; the first real request
+    then opens its own connection.
+    """
+    client = get_client()
+    start = time.perf_counter()
+
+    async def ping():
+        try:
+            await client.with_options(max_retries=0).get("/models", cast_to=httpx.Response)
+        except Exception:
+            pass
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+    return time.perf_counter() - start
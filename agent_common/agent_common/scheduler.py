@@ -0,0 +1,285 @@
+"""Client-side scheduling of model requests under Gemini's rate limits.
+
+Every agent in the process shares one Gemini quota (requests and tokens per
+minute), so without coordination a burst of batch work runs into 429s and
+interactive turns wait behind its retries. RequestScheduler sits in the
+shared client's HTTP transport (see runtime.py) and makes each chat
+completion request:
+
+- take one request and its estimated tokens from token buckets sized so no
+  sliding window of `window` seconds goes over the limits (the token estimate
+  is corrected with the response's usage);
+- queue by priority, so interactive turns go ahead of batch jobs. The
+  priority comes from a context variable, which tasks inherit:
+
+      with request_priority(BATCH):
+          asyncio.run(run_batch(...))
+
+- pause everyone after a 429, for the response's retry-after or an
+  exponential backoff, and slow the buckets down until requests succeed again.
+
+scheduler.stats reports queueing delay per priority.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from itertools import count
+
+import httpx
+
+from agent_common.stats import percentile
+
+INTERACTIVE = 0
+BATCH = 10
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+current_priority = contextvars.ContextVar("model_request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    """Model requests made inside the block (and tasks started there) queue at priority; lower goes first."""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, limit, window=60.0, burst_fraction=0.1):
+        """At most limit units in any `window` seconds, handed out in bursts of up to burst_fraction of it.
+
+        A bucket that could burst the whole limit and keep refilling would go
+        over a sliding-window quota, so burst + refill per window stays at limit.
+        """
+        self.limit = limit
+        self.burst = max(1.0, limit * burst_fraction)
+        self.rate = max(limit - self.burst, 1.0) / window
+        self.scale = 1.0  # slowed down after 429s
+        self.level = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.burst, self.level + (now - self.updated) * self.rate * self.scale)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until amount can be taken; requests larger than the burst wait for a full bucket."""
+        self._refill(now)
+        amount = min(amount, self.burst)
+        return 0.0 if self.level >= amount else (amount - self.level) / (self.rate * self.scale)
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= amount  # may go negative (debt) for oversized requests or corrections
+
+    def correct(self, amount):
+        """Take (or give back, if negative) amount after the fact."""
+        self.level = min(self.burst, self.level - amount)
+
+
+@dataclass
+class SchedulerStats:
+    waits: dict = field(default_factory=dict)  # priority -> queueing delays in seconds
+    throttled: int = 0  # 429 responses
+    paused: float = 0.0  # seconds of backoff pauses started
+    estimated_tokens: int = 0
+    actual_tokens: int = 0
+
+    def record_wait(self, priority, seconds):
+        self.waits.setdefault(priority, []).append(seconds)
+
+    def __str__(self):
+        lines = []
+        for priority in sorted(self.waits):
+            waits = self.waits[priority]
+            name = PRIORITY_NAMES.get(priority, f"priority {priority}")
+            lines.append(
+                f"{name}: {len(waits)} requests, queued p50 {percentile(waits, 50) * 1e3:.0f} ms · "
+                f"p95 {percentile(waits, 95) * 1e3:.0f} ms · max {max(waits) * 1e3:.0f} ms"
+            )
+        lines.append(f"{self.throttled} throttled (429), {self.paused:.1f}s of backoff")
+        return "\n".join(lines)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    event: asyncio.Event = field(compare=False, default_factory=asyncio.Event)
+
+
+def retry_after(headers):
+    """Seconds from a retry-after-ms or retry-after header (seconds or HTTP date), else None."""
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        request_limit=None,
+        token_limit=None,
+        window=60.0,
+        burst_fraction=0.1,
+        completion_tokens=256,
+        backoff=1.0,
+        max_backoff=60.0,
+    ):
+        """request_limit / token_limit are per `window` seconds; None leaves that limit out.
+
+        completion_tokens is the reply size assumed before a request's usage
+        is known, unless it sets max_tokens.
+        """
+        self.requests = TokenBucket(request_limit, window, burst_fraction) if request_limit else None
+        self.tokens = TokenBucket(token_limit, window, burst_fraction) if token_limit else None
+        self.completion_tokens = completion_tokens
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.paused_until = 0.0
+        self.stats = SchedulerStats()
+        self._throttled_in_a_row = 0
+        self._queue = []  # heap of _Waiter
+        self._seq = count()
+        self._lock = threading.Lock()  # streamlit may call in from several threads, each with its own loop
+
+    def _buckets(self):
+        return [bucket for bucket in (self.requests, self.tokens) if bucket is not None]
+
+    def _ready_in(self, tokens, now):
+        delay = self.paused_until - now
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(tokens, now))
+        return delay
+
+    def _wake_head(self):
+        if self._queue:
+            head = self._queue[0]
+            head.loop.call_soon_threadsafe(head.event.set)
+
+    async def acquire(self, tokens=0, priority=None):
+        """Wait for this request's turn; returns the seconds spent queueing."""
+        priority = current_priority.get() if priority is None else priority
+        waiter = _Waiter(priority, next(self._seq), tokens, asyncio.get_running_loop())
+        start = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, waiter)
+            self._wake_head()
+        try:
+            while True:
+                with self._lock:
+                    delay = None
+                    if self._queue[0] is waiter:
+                        now = time.monotonic()
+                        delay = self._ready_in(tokens, now)
+                        if delay <= 0:
+                            heapq.heappop(self._queue)
+                            if self.requests is not None:
+                                self.requests.take(1, now)
+                            if self.tokens is not None:
+                                self.tokens.take(tokens, now)
+                            self._wake_head()
+                            break
+                if delay is None:
+                    await waiter.event.wait()  # set when this waiter reaches the head of the queue
+                    waiter.event.clear()
+                else:
+                    await asyncio.sleep(delay)  # a higher-priority arrival may take the head meanwhile
+        except BaseException:
+            with self._lock:
+                if waiter in self._queue:
+                    self._queue.remove(waiter)
+                    heapq.heapify(self._queue)
+                    self._wake_head()
+            raise
+        waited = time.monotonic() - start
+        self.stats.record_wait(priority, waited)
+        return waited
+
+    def estimate_tokens(self, body, size):
+        """Prompt tokens (about 4 bytes each of the request body) plus the expected reply."""
+        completion = body.get("max_tokens") or body.get("max_completion_tokens") or self.completion_tokens
+        return size // 4 + completion
+
+    def record(self, status, headers, estimated, actual=None):
+        """Account for a response: correct the token estimate, or back off after a 429."""
+        with self._lock:
+            if status == 429:
+                self._throttled_in_a_row += 1
+                delay = retry_after(headers)
+                if delay is None or delay <= 0:
+                    delay = self.backoff * 2 ** (self._throttled_in_a_row - 1) * random.uniform(1.0, 1.5)
+                delay = min(delay, self.max_backoff)
+                now = time.monotonic()
+                self.stats.throttled += 1
+                self.stats.paused += max(0.0, now + delay - max(self.paused_until, now))
+                self.paused_until = max(self.paused_until, now + delay)
+                for bucket in self._buckets():
+                    bucket.scale = max(0.1, bucket.scale * 0.5)
+                return
+            if status < 400:
+                self._throttled_in_a_row = 0
+                for bucket in self._buckets():
+                    bucket.scale = min(1.0, bucket.scale + 0.05)
+            if actual is not None:
+                self.stats.estimated_tokens += estimated
+                self.stats.actual_tokens += actual
+                if self.tokens is not None:
+                    self.tokens.correct(actual - estimated)
+
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """Sends chat completion requests through a RequestScheduler; everything else goes straight through."""
+
+    def __init__(self, transport, scheduler, paths=("/chat/completions",)):
+        self.transport = transport
+        self.scheduler = scheduler
+        self.paths = paths
+
+    async def handle_async_request(self, request):
+        if request.method != "POST" or not request.url.path.rstrip("/").endswith(self.paths):
+            return await self.transport.handle_async_request(request)
+        try:
+            content = request.content
+            body = json.loads(content)
+        except (httpx.RequestNotRead, ValueError):
+            content, body = b"", {}
+        estimated = self.scheduler.estimate_tokens(body, len(content))
+        await self.scheduler.acquire(estimated)
+
+        response = await self.transport.handle_async_request(request)
+        actual = None
+        if response.status_code == 200 and not body.get("stream"):
+            await response.aread()  # small JSON body; streamed replies keep the estimate
+            try:
+                actual = json.loads(response.content)["usage"]["total_tokens"]
+            except (ValueError, KeyError, TypeError):
+                pass
+        self.scheduler.record(response.status_code, response.headers, estimated, actual)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,11 @@
+"""Small latency statistics helpers shared by the benchmarks."""
+
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (pct in 0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile() of an empty sequence")
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
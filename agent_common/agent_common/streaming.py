@@ -0,0 +1,121 @@
+"""Stream agent replies as they are generated.
+
+Text deltas from Runner.run_streamed are buffered and handed out in batches
+(every flush_chars characters or flush_interval seconds), so long replies do
+not cost one write+flush (or one websocket message) per token. The first token
+is passed on straight away so time-to-first-token is what the user actually
+sees.
+
+TextStream is the async iterator for UIs that push text themselves (e.g.
+chainlit's Message.stream_token); stream_reply() prints to the console.
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class StreamStats:
+    first_token: float | None  # seconds until the first text delta, None if no text was streamed
+    total: float
+    deltas: int
+    flushes: int
+
+    def __str__(self):
+        first = f"{self.first_token:.2f}s" if self.first_token is not None else "n/a"
+        return f"⏱️ first token {first} · total {self.total:.2f}s"
+
+
+class TextStream:
+    """Batched text chunks of an agent's reply:
+
+        stream = TextStream(agent, input, run_config=config)
+        async for chunk in stream:
+            ...
+        stream.result.final_output, stream.stats
+
+    result and stats are set once iteration finishes.
+    """
+
+    def __init__(self, agent, input, *, run_config=None, context=None, flush_interval=0.05, flush_chars=64, **kwargs):
+        self.agent = agent
+        self.input = input
+        self.run_config = run_config
+        self.context = context
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+        self.kwargs = kwargs
+        self.result = None
+        self.stats = None
+
+    async def __aiter__(self):
+        from agents import Runner
+        from openai.types.responses import ResponseTextDeltaEvent
+
+        start = time.perf_counter()
+        self.result = Runner.run_streamed(
+            self.agent, self.input, context=self.context, run_config=self.run_config, **self.kwargs
+        )
+
+        buffer, buffered = [], 0
+        first_token = None
+        deltas = flushes = 0
+        last_flush = start
+
+        async for event in self.result.stream_events():
+            if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            buffer.append(event.data.delta)
+            buffered += len(event.data.delta)
+            deltas += 1
+            now = time.perf_counter()
+            if first_token is None:
+                first_token = now - start
+            if deltas == 1 or buffered >= self.flush_chars or now - last_flush >= self.flush_interval:
+                chunk = "".join(buffer)
+                buffer.clear()
+                buffered = 0
+                flushes += 1
+                last_flush = now
+                yield chunk
+
+        if buffer:
+            flushes += 1
+            yield "".join(buffer)
+        self.stats = StreamStats(first_token, time.perf_counter() - start, deltas, flushes)
+
+
+async def stream_reply(
+    agent,
+    input,
+    *,
+    run_config=None,
+    context=None,
+    out=None,
+    flush_interval=0.05,
+    flush_chars=64,
+    **kwargs,
+):
+    """Run agent with Runner.run_streamed and print its text as it arrives.
+
+    Returns (result, stats); result.final_output is set once streaming finishes.
+    out defaults to sys.stdout as it is at call time, so a swapped stdout (the
+    warm daemon's per-client stream) gets the reply.
+    """
+    out = out or sys.stdout
+    stream = TextStream(
+        agent,
+        input,
+        run_config=run_config,
+        context=context,
+        flush_interval=flush_interval,
+        flush_chars=flush_chars,
+        **kwargs,
+    )
+    async for chunk in stream:
+        out.write(chunk)
+        out.flush()
+    out.write("\n")
+    out.flush()
+    return stream.result, stream.stats
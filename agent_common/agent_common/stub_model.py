@@ -0,0 +1,133 @@
+"""In-process stand-in for a chat model, for load tests that must not hit Gemini.
+
+StubModel sleeps for a configurable latency and then either calls the first
+tool it was offered (once per turn) or replies with canned text, which is
+enough to drive tool-using agents such as the bank's auth and service agents.
+"""
+
+import asyncio
+import itertools
+import json
+
+from agents import ModelResponse, Usage
+from agents.models.interface import Model
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+_ids = itertools.count()
+
+
+class StubModel(Model):
+    def __init__(
+        self,
+        latency=0.2,
+        reply="This is a stubbed reply.",
+        call_tools=True,
+        chunk_words=3,
+        tool_arguments=None,
+        chunk_delay=0.0,
+    ):
+        """latency is seconds per call, or a zero-argument callable returning them.
+
+        tool_arguments is the dict passed to the tool, or a zero-argument callable returning it.
+        chunk_delay is the pause between streamed chunks, after latency has passed for the first.
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.tool_arguments = tool_arguments
+        self.reply = reply
+        self.call_tools = call_tools
+        self.chunk_words = chunk_words
+        self.calls = 0
+
+    async def _wait(self):
+        self.calls += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _output(self, input, tools):
+        items = input if isinstance(input, list) else []
+        answered = any(isinstance(item, dict) and item.get("type") == "function_call_output" for item in items)
+        if self.call_tools and tools and not answered:
+            n = next(_ids)
+            arguments = self.tool_arguments() if callable(self.tool_arguments) else self.tool_arguments
+            return [
+                ResponseFunctionToolCall(
+                    id=f"fc_{n}",
+                    call_id=f"call_{n}",
+                    name=tools[0].name,
+                    arguments=json.dumps(arguments or {}),
+                    type="function_call",
+                )
+            ]
+        return [
+            ResponseOutputMessage(
+                id=f"msg_{next(_ids)}",
+                content=[ResponseOutputText(text=self.reply, type="output_text", annotations=[])],
+                role="assistant",
+                status="completed",
+                type="message",
+            )
+        ]
+
+    def _usage(self, input, output):
+        input_tokens = len(json.dumps(input, default=str)) // 4
+        output_tokens = sum(len(item.model_dump_json()) for item in output) // 4
+        return Usage(
+            requests=1, input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens
+        )
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        await self._wait()
+        output = self._output(input, tools)
+        if self.chunk_delay and isinstance(output[0], ResponseOutputMessage):
+            # Same generation time as the streamed reply, delivered all at once
+            chunks = -(-len(self.reply.split(" ")) // self.chunk_words)
+            await asyncio.sleep(self.chunk_delay * (chunks - 1))
+        return ModelResponse(output=output, usage=self._usage(input, output), response_id=None)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        await self._wait()
+        output = self._output(input, tools)
+        sequence = itertools.count()
+        if isinstance(output[0], ResponseOutputMessage):
+            words = self.reply.split(" ")
+            for i in range(0, len(words), self.chunk_words):
+                if i and self.chunk_delay:
+                    await asyncio.sleep(self.chunk_delay)
+                delta = " ".join(words[i:i + self.chunk_words]) + (" " if i + self.chunk_words < len(words) else "")
+                yield ResponseTextDeltaEvent(
+                    content_index=0,
+                    delta=delta,
+                    item_id=output[0].id,
+                    logprobs=[],
+                    output_index=0,
+                    sequence_number=next(sequence),
+                    type="response.output_text.delta",
+                )
+        usage = self._usage(input, output)
+        response = Response(
+            id=f"resp_{next(_ids)}",
+            created_at=0,
+            model="stub",
+            object="response",
+            output=output,
+            parallel_tool_calls=False,
+            tool_choice="auto",
+            tools=[],
+            usage={
+                "input_tokens": usage.input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": usage.output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": usage.total_tokens,
+            },
+        )
+        yield ResponseCompletedEvent(response=response, type="response.completed", sequence_number=next(sequence))
@@ -0,0 +1,295 @@
+"""Local per-agent timing and token telemetry from the Agents SDK's trace spans.
+
+install() replaces the SDK's trace processors (which would upload to the
+OpenAI platform) with a TelemetryProcessor that keeps everything local:
+
+- every finished span (agent, model generation, tool call, handoff,
+  guardrail) and every run becomes one JSONL record with its duration, its
+  agent, and for model calls the input/output tokens. A background thread
+  writes them to a size-rotated file;
+- the same spans feed Prometheus counters and latency histograms, which
+  serve_metrics() exposes in the text format on /metrics.
+
+    telemetry.install("telemetry/spans.jsonl")  # before runtime.run_config()
+    telemetry.serve_metrics(9464)  # optional: curl localhost:9464/metrics
+
+Once installed, runtime.run_config() turns tracing on (without the prompts
+and replies in span data). The work per span is a few dict updates and a
+queue put; serializing and writing happen on the writer thread.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents.tracing import TracingProcessor
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class RotatingJsonlWriter:
+    """Appends records as JSON lines from a daemon thread, rotating the file at max_bytes.
+
+    path.1 is the newest rotated file, up to path.<backups>.
+    """
+
+    def __init__(self, path, max_bytes=10_000_000, backups=5, flush_interval=1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        self._queue.put(record)
+
+    def _rotate(self, f):
+        f.close()
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _run(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "a", encoding="utf-8")
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                f.flush()
+                continue
+            if record is None:
+                break
+            try:
+                f.write(json.dumps(record, default=str) + "\n")
+                self.written += 1
+            except (TypeError, ValueError):
+                self.dropped += 1
+            if f.tell() >= self.max_bytes:
+                f = self._rotate(f)
+        f.close()
+
+    def close(self, timeout=5.0):
+        """Write what is queued and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+class Metrics:
+    """Prometheus counters and histograms, rendered in the text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(float)  # (metric, labels) -> value
+        self._histograms = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def inc(self, metric, labels, value=1):
+        with self._lock:
+            self._counts[metric, labels] += value
+
+    def observe(self, labels, seconds):
+        with self._lock:
+            histogram = self._histograms.get(labels)
+            if histogram is None:
+                histogram = self._histograms[labels] = [0] * (len(BUCKETS) + 1) + [0.0]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[len(BUCKETS)] += 1
+            histogram[-1] += seconds
+
+    @staticmethod
+    def _labels(labels, le=None):
+        if le is not None:
+            labels = (*labels, ("le", le))
+        escaped = (
+            (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in labels
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}" if labels else ""
+
+    def render(self):
+        with self._lock:
+            counts = dict(self._counts)
+            histograms = {labels: list(values) for labels, values in self._histograms.items()}
+        lines = [
+            "# HELP agent_span_seconds Duration of agent, model, tool, handoff and guardrail spans.",
+            "# TYPE agent_span_seconds histogram",
+        ]
+        for labels, values in sorted(histograms.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS, values):
+                cumulative += n
+                lines.append(f"agent_span_seconds_bucket{self._labels(labels, bound)} {cumulative}")
+            cumulative += values[len(BUCKETS)]
+            lines.append(f"agent_span_seconds_bucket{self._labels(labels, '+Inf')} {cumulative}")
+            lines.append(f"agent_span_seconds_sum{self._labels(labels)} {values[-1]:.6f}")
+            lines.append(f"agent_span_seconds_count{self._labels(labels)} {cumulative}")
+        for metric, help_text in (
+            ("agent_tokens_total", "Model tokens by agent, model and direction."),
+            ("agent_span_errors_total", "Spans that ended with an error."),
+            ("agent_guardrail_tripwires_total", "Guardrails that triggered."),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [
+                f"{metric}{self._labels(labels)} {value:g}"
+                for (name, labels), value in sorted(counts.items())
+                if name == metric
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class TelemetryProcessor(TracingProcessor):
+    def __init__(self, writer=None, metrics=None):
+        self.writer = writer
+        self.metrics = metrics or Metrics()
+        self._started = {}  # span or trace id -> perf_counter at start
+        self._agents = {}  # open agent span id -> agent name
+
+    def on_trace_start(self, trace):
+        self._started[trace.trace_id] = time.perf_counter()
+
+    def on_trace_end(self, trace):
+        start = self._started.pop(trace.trace_id, None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        self.metrics.observe((("type", "run"), ("agent", ""), ("name", trace.name)), seconds)
+        if self.writer is not None:
+            self.writer.write(
+                {"ts": time.time(), "type": "run", "name": trace.name, "trace_id": trace.trace_id, "ms": round(seconds * 1e3, 3)}
+            )
+
+    def on_span_start(self, span):
+        self._started[span.span_id] = time.perf_counter()
+        data = span.span_data
+        if data.type == "agent":
+            self._agents[span.span_id] = data.name
+
+    def on_span_end(self, span):
+        start = self._started.pop(span.span_id, None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        data = span.span_data
+        kind = data.type
+        record = {"ts": time.time(), "type": kind, "trace_id": span.trace_id, "span_id": span.span_id}
+        if kind == "agent":
+            agent = self._agents.pop(span.span_id, data.name)
+            name = data.name
+        else:
+            agent = self._agents.get(span.parent_id, "")
+            if kind == "generation":
+                name = data.model or ""
+                usage = data.usage or {}
+                for direction in ("input", "output"):
+                    tokens = usage.get(f"{direction}_tokens")
+                    if tokens:
+                        record[f"{direction}_tokens"] = tokens
+                        self.metrics.inc(
+                            "agent_tokens_total", (("agent", agent), ("model", name), ("direction", direction)), tokens
+                        )
+            elif kind == "handoff":
+                name = f"{data.from_agent} -> {data.to_agent}"
+            elif kind == "guardrail":
+                name = data.name
+                record["triggered"] = data.triggered
+                if data.triggered:
+                    self.metrics.inc("agent_guardrail_tripwires_total", (("agent", agent), ("name", name)))
+            else:
+                name = getattr(data, "name", "") or ""
+        labels = (("type", kind), ("agent", agent), ("name", name))
+        self.metrics.observe(labels, seconds)
+        record.update(agent=agent, name=name, ms=round(seconds * 1e3, 3))
+        if span.error:
+            record["error"] = span.error.get("message")
+            self.metrics.inc("agent_span_errors_total", labels)
+        if self.writer is not None:
+            self.writer.write(record)
+
+    def shutdown(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def force_flush(self):
+        pass
+
+
+_processor = None
+_servers = {}  # (host, port) -> the metrics server listening there
+_servers_lock = threading.Lock()
+
+
+def install(path="telemetry/spans.jsonl", max_bytes=10_000_000, backups=5):
+    """Route the SDK's trace spans to a TelemetryProcessor writing path (None: metrics only).
+
+    Installing again returns the same processor, adding the JSONL writer if it
+    had none (e.g. serve_metrics() ran before the agents were built).
+    """
+    global _processor
+    from agents import set_trace_processors, set_tracing_disabled
+
+    if _processor is None:
+        writer = RotatingJsonlWriter(path, max_bytes, backups) if path else None
+        _processor = TelemetryProcessor(writer)
+        set_trace_processors([_processor])
+        set_tracing_disabled(False)
+    elif path and _processor.writer is None:
+        _processor.writer = RotatingJsonlWriter(path, max_bytes, backups)
+    return _processor
+
+
+def installed():
+    return _processor is not None
+
+
+def serve_metrics(port=9464, host="127.0.0.1"):
+    """Serve the Prometheus text format on http://host:port/metrics from a daemon thread.
+
+    Serving the same address again returns the running server, so a script
+    run repeatedly in one process (agent_common.daemon) can call this each time.
+    """
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            server = _servers[(host, port)] = _start_metrics_server(host, port)
+        return server
+
+
+def _start_metrics_server(host, port):
+    processor = install(path=None) if _processor is None else _processor
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = processor.metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="telemetry-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,133 @@
+"""Framework overhead of the agent graphs, with the model replayed from a cassette.
+
+Runs scripted conversations through the support_agent triage graph (handoffs
+and the order tool), the q3-assignment/assign6 support agents (context-gated
+tools and session memory) and country_info_toolkit (concurrent finders plus
+orchestrator, and the structured engine). Record them once, from Gemini or
+from agent_common.mock_server, then replay them with zero model latency: what
+is left per turn is the Agents SDK, tools, memory, telemetry and the
+projects' own code.
+
+    python bench_cassette.py --mode record            # GEMINI_API_KEY; or --mock
+    python bench_cassette.py --repeat 50 --profile    # replay only, plus the top cProfile entries
+"""
+
+import argparse
+import asyncio
+import cProfile
+import pstats
+import time
+
+from agents import RunContextWrapper, Runner
+
+from agent_common import runtime
+from agent_common.memory import SessionMemory
+from agent_common.mock_server import MockServer
+from loadtest import load
+
+SUPPORT_CONVERSATION = [
+    "What are your store hours?",
+    "Where is my order 12345?",
+    "My order arrived cold, this is unacceptable.",
+]
+ASSIGN6_CONVERSATION = [
+    "I was charged twice on my bill",
+    "Can I get a refund for the second charge?",
+    "Thanks, when will I see the money?",
+]
+COUNTRIES = ["Pakistan", "Japan"]
+
+
+# Each graph imports its project and returns (conversation, turns): an async
+# function running one scripted conversation, and how many model-backed turns it has.
+
+
+def support():
+    main = load("support_agent", "main")
+
+    async def conversation():
+        # No local classifier or FAQ cache: every turn goes through the agent graph
+        router = main.StickyRouter(main.triage_agent, run_config=main.config)
+        for query in SUPPORT_CONVERSATION:
+            await router.ask(query)
+
+    return conversation, len(SUPPORT_CONVERSATION)
+
+
+def assign6():
+    context = load("q3-assignment/assign6", "context")
+
+    async def conversation():
+        # As in context.main(): the first message picks the agent, which answers every message
+        ctx = context.userinfo(name="Ayesha", is_premium_user=True)
+        memory = SessionMemory(run_config=context.config)
+        active_agent = context.route_message(RunContextWrapper(ctx), ASSIGN6_CONVERSATION[0])
+        for message in ASSIGN6_CONVERSATION:
+            result = await Runner.run(active_agent, memory.input(message), context=ctx, run_config=context.config)
+            memory.record(result)
+
+    return conversation, len(ASSIGN6_CONVERSATION)
+
+
+def country():
+    toolkit = load("multi-agent-assignments", "country_info_toolkit")
+
+    async def conversation():
+        for name in COUNTRIES:
+            for mode in ("concurrent", "structured"):
+                await toolkit.lookup(name, mode)
+
+    return conversation, 2 * len(COUNTRIES)
+
+
+GRAPHS = {"support": support, "assign6": assign6, "country": country}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile agent graphs against recorded model responses")
+    parser.add_argument("--cassette", default="graphs.cassette.sqlite3")
+    parser.add_argument("--mode", choices=["record", "replay", "auto"], default="replay")
+    parser.add_argument("--mock", action="store_true", help="record from agent_common.mock_server instead of Gemini")
+    parser.add_argument("--graphs", nargs="+", choices=list(GRAPHS), default=list(GRAPHS))
+    parser.add_argument("--repeat", type=int, default=20, help="conversations per graph when replaying")
+    parser.add_argument("--profile", action="store_true", help="print the functions with the most own time")
+    args = parser.parse_args()
+
+    if args.mock:
+        runtime.configure(base_url=MockServer(latency=0.3).start_in_thread(), api_key="test")
+    runtime.configure(cassette=args.cassette, cassette_mode=args.mode)
+    graphs = {name: GRAPHS[name]() for name in args.graphs}
+    repeat = 1 if args.mode == "record" else args.repeat  # recording twice would just overwrite
+    cassette = runtime.get_cassette()
+    profiler = cProfile.Profile() if args.profile else None
+
+    async def measure():
+        timings = {}
+        for name, (conversation, turns) in graphs.items():
+            if args.mode != "record":
+                await conversation()  # first run: lazy imports, schema building
+            replayed = cassette.stats.replayed_seconds
+            if profiler:
+                profiler.enable()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await conversation()
+            elapsed = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+            n = repeat * turns
+            timings[name] = (elapsed / n, (cassette.stats.replayed_seconds - replayed) / n, n)
+        return timings
+
+    timings = asyncio.run(measure())
+    print(f"📼 {args.cassette} ({len(cassette)} exchanges, mode {args.mode})")
+    print(f"{'graph':<9}{'turns':>7}{'ms/turn':>10}{'recorded model ms/turn':>25}")
+    for name, (per_turn, model_time, n) in timings.items():
+        print(f"{name:<9}{n:>7}{per_turn * 1e3:>10.2f}{model_time * 1e3:>25.0f}")
+    print(cassette.stats)
+    if profiler:
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
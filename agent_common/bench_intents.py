@@ -0,0 +1,83 @@
+"""Microbenchmark for agent_common.intents at growing vocabulary sizes.
+
+Builds synthetic intents (1-3 word phrases spread over 20 labels), then
+compares the compiled IntentMatcher (substring and whole-word modes) with the
+naive "for each keyword: keyword in message" scan on the same messages, and
+checks the substring mode finds the same intents as the naive scan.
+"""
+
+import argparse
+import random
+import time
+
+from agent_common.intents import IntentMatcher
+
+
+def vocabulary(size, rng):
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(size)]
+    rules = {f"intent_{i}": {} for i in range(20)}
+    for i in range(size):
+        phrase = " ".join(rng.sample(words, rng.choice((1, 1, 2, 3))))
+        rules[f"intent_{i % 20}"][phrase] = rng.choice((0.5, 1.0, 2.0))
+    return rules, words
+
+
+def messages(count, words, phrases, rng):
+    out = []
+    for _ in range(count):
+        tokens = rng.choices(words, k=rng.randint(10, 30))
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(phrases))
+        out.append(" ".join(tokens))
+    return out
+
+
+def naive(rules, text):
+    text = text.lower()
+    return {label for label, phrases in rules.items() if any(phrase in text for phrase in phrases)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled intent matching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000])
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--naive-messages", type=int, default=200, help="the naive scan is slow; time it on fewer")
+    args = parser.parse_args()
+
+    print(f"{'phrases':>8}{'compile ms':>12}{'matcher msg/s':>15}{'whole-word msg/s':>18}{'naive msg/s':>13}{'speedup':>9}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        rules, words = vocabulary(size, rng)
+        phrases = [p for label in rules.values() for p in label]
+        texts = messages(args.messages, words, phrases, rng)
+
+        start = time.perf_counter()
+        matcher = IntentMatcher(rules, whole_words=False)
+        compile_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        results = [matcher.match(text) for text in texts]
+        matcher_rate = len(texts) / (time.perf_counter() - start)
+
+        whole_words = IntentMatcher(rules)
+        start = time.perf_counter()
+        for text in texts:
+            whole_words.match(text)
+        whole_word_rate = len(texts) / (time.perf_counter() - start)
+
+        sample = texts[: args.naive_messages]
+        start = time.perf_counter()
+        expected = [naive(rules, text) for text in sample]
+        naive_rate = len(sample) / (time.perf_counter() - start)
+
+        mismatches = sum(set(r) != e for r, e in zip(results, expected))
+        if mismatches:
+            print(f"   ⚠️ {mismatches} messages disagree with the naive scan")
+        print(
+            f"{size:>8,}{compile_ms:>12.0f}{matcher_rate:>15,.0f}{whole_word_rate:>18,.0f}"
+            f"{naive_rate:>13,.0f}{matcher_rate / naive_rate:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Prompt growth over a long conversation: full history vs SessionMemory.
+
+Drives an agent through many turns with StubModel (no Gemini calls) and
+prints the prompt tokens each turn sends, once when the whole history is
+replayed every turn and once with SessionMemory compacting older turns into
+a summary in the background.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from agents import Agent, RunConfig, Runner
+
+from agent_common.memory import SessionMemory, estimate_tokens
+from agent_common.stub_model import StubModel
+
+WORDS = "refund payment invoice service restart router outage account order plan upgrade charge error".split()
+
+
+def user_message(rng):
+    return "Hi, " + " ".join(rng.choices(WORDS, k=rng.randint(15, 40))) + "?"
+
+
+async def full_history(agent, config, messages):
+    history, tokens = [], []
+    for message in messages:
+        history.append({"role": "user", "content": message})
+        tokens.append(sum(map(estimate_tokens, history)))
+        result = await Runner.run(agent, history, run_config=config)
+        history = result.to_input_list()
+    return tokens
+
+
+async def with_memory(agent, config, messages, budget):
+    memory = SessionMemory(run_config=config, budget_tokens=budget)
+    for message in messages:
+        result = await Runner.run(agent, memory.input(message), run_config=config)
+        memory.record(result)
+        await asyncio.sleep(0)  # the user takes a moment to type; lets compaction start
+    await memory.wait()
+    return memory
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark session memory prompt growth")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--budget", type=int, default=800, help="SessionMemory budget_tokens")
+    parser.add_argument("--latency", type=float, default=0.01, help="stubbed model latency in seconds")
+    parser.add_argument("--every", type=int, default=10, help="print every Nth turn")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    messages = [user_message(rng) for _ in range(args.turns)]
+    reply = " ".join(rng.choices(WORDS, k=60))
+    agent = Agent(name="Support agent", instructions="Help the user.")
+    config = RunConfig(model=StubModel(latency=args.latency, reply=reply, call_tools=False), tracing_disabled=True)
+
+    start = time.perf_counter()
+    full = await full_history(agent, config, messages)
+    full_s = time.perf_counter() - start
+    start = time.perf_counter()
+    memory = await with_memory(agent, config, messages, args.budget)
+    memory_s = time.perf_counter() - start
+
+    print(f"{'turn':>5}{'full history':>14}{'memory':>9}{'recent turns':>14}{'summarized':>12}")
+    for stats in memory.history:
+        if stats.turn % args.every == 0 or stats.turn == 1:
+            print(
+                f"{stats.turn:>5}{full[stats.turn - 1]:>14,}{stats.prompt_tokens:>9,}"
+                f"{stats.window_turns:>14}{stats.compacted_turns:>12}"
+            )
+    print(f"total prompt tokens: full history {sum(full):,}, memory {sum(s.prompt_tokens for s in memory.history):,}")
+    print(f"wall time: full history {full_s:.2f}s, memory {memory_s:.2f}s (memory includes summarizer calls)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""First-request latency: per-script default client vs the shared runtime client.
+
+Starts agent_common.mock_server on its own thread (with a simulated
+connection handshake) and runs two chat turns through the Agents SDK, the
+user typing for --think seconds before the first and idling for --idle
+seconds before the second. Each round uses a fresh event loop, so every
+connection pool starts cold. Modes:
+
+  default   AsyncOpenAI(api_key=..., base_url=...) as the scripts built it
+  runtime   run_config() from agent_common.runtime
+  warm_up   runtime, with warm_up() running while the user types
+
+    python bench_runtime.py --rounds 3 --idle 6
+    python bench_runtime.py --base-url https://generativelanguage.googleapis.com/v1beta/openai/  # live, needs GEMINI_API_KEY
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from agent_common import runtime
+from agent_common.mock_server import MockServer
+
+
+def default_config(base_url, api_key):
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    model = OpenAIChatCompletionsModel(model=runtime.DEFAULT_MODEL, openai_client=client)
+    return RunConfig(model=model, tracing_disabled=True), client
+
+
+async def chat(mode, base_url, api_key, think, idle):
+    """(first turn, turn after idling) latencies in seconds."""
+    client = None
+    if mode == "default":
+        config, client = default_config(base_url, api_key)
+    else:
+        runtime.reset()
+        runtime.configure(base_url=base_url, api_key=api_key)
+        config = runtime.run_config()
+    agent = Agent(name="Assistant", instructions="You are a helpful assistant. Answer in one sentence.")
+
+    typing = asyncio.sleep(think)
+    if mode == "warm_up":
+        await asyncio.gather(typing, runtime.warm_up())
+    else:
+        await typing
+    latencies = []
+    for message in ("What is the capital of France?", "And of Italy?"):
+        start = time.perf_counter()
+        await Runner.run(agent, message, run_config=config)
+        latencies.append(time.perf_counter() - start)
+        if len(latencies) == 1:
+            await asyncio.sleep(idle)
+    if client is not None:
+        await client.close()  # its pool is bound to this loop, which asyncio.run is about to close
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm first-request latency")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--think", type=float, default=1.0, help="seconds the user types before the first turn")
+    parser.add_argument("--idle", type=float, default=6.0, help="seconds between the two turns")
+    parser.add_argument("--latency", type=float, default=0.3, help="mock completion latency in seconds")
+    parser.add_argument("--handshake", type=float, default=0.15, help="mock delay on each new connection")
+    parser.add_argument("--base-url", help="benchmark a real endpoint instead of the mock server")
+    parser.add_argument("--modes", nargs="+", default=["default", "runtime", "warm_up"])
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        base_url, api_key = args.base_url, os.environ["GEMINI_API_KEY"]
+        print(f"🌐 {base_url}")
+    else:
+        server = MockServer(latency=args.latency, jitter=0.0, handshake=args.handshake)
+        base_url, api_key = server.start_in_thread(), "test"
+        print(f"🧪 mock endpoint: {args.latency * 1e3:.0f} ms per completion, {args.handshake * 1e3:.0f} ms handshake")
+    print(f"   {args.rounds} rounds, {args.think:.1f}s typing, {args.idle:.1f}s idle between turns")
+    # Pays the one-off import and platform-detection costs so they do not land on the first mode
+    for mode in args.modes:
+        asyncio.run(chat(mode, base_url, api_key, 0.0, 0.0))
+    if server:
+        server.connections = 0
+    print(f"{'mode':<10}{'first turn ms':>15}{'after idle ms':>15}{'connections':>13}")
+    for mode in args.modes:
+        firsts, seconds = [], []
+        connections_before = server.connections if server else 0
+        for _ in range(args.rounds):
+            first, second = asyncio.run(chat(mode, base_url, api_key, args.think, args.idle))
+            firsts.append(first)
+            seconds.append(second)
+        connections = f"{server.connections - connections_before:>13}" if server else f"{'n/a':>13}"
+        print(f"{mode:<10}{statistics.median(firsts) * 1e3:>15.0f}{statistics.median(seconds) * 1e3:>15.0f}{connections}")
+
+
+if __name__ == "__main__":
+    main()
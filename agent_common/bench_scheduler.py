@@ -0,0 +1,105 @@
+"""Interactive chats next to a batch job under a rate limit, with and without the scheduler.
+
+Starts agent_common.mock_server with a request quota and runs, at the same
+time, a batch job (many workers, BATCH priority) and a few interactive chat
+sessions (a turn every second or so) through the Agents SDK. Modes:
+
+  plain      AsyncOpenAI(...) as the scripts used to build it: every worker
+             fires at will and relies on the openai client's own 429 retries
+  scheduled  the shared runtime client: token buckets, priority queue and
+             shared backoff (agent_common.scheduler)
+
+    python bench_scheduler.py --limit 30 --window 5 --batch 90
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from agent_common import runtime
+from agent_common.mock_server import MockServer
+from agent_common.scheduler import BATCH, INTERACTIVE, PRIORITY_NAMES, request_priority
+from agent_common.stats import percentile
+
+
+def make_config(mode, base_url, args):
+    if mode == "plain":
+        client = AsyncOpenAI(api_key="test", base_url=base_url)
+        return RunConfig(model=OpenAIChatCompletionsModel(model="mock", openai_client=client), tracing_disabled=True)
+    runtime.reset()
+    runtime.configure(base_url=base_url, api_key="test", request_limit=args.limit, limit_window=args.window)
+    return runtime.run_config("mock")
+
+
+async def workload(config, args):
+    """{priority: (latencies, failures)} for a batch job and interactive sessions run side by side."""
+    agent = Agent(name="Assistant", instructions="Answer in one sentence.")
+    results = {INTERACTIVE: ([], [0]), BATCH: ([], [0])}
+    rng = random.Random(1)
+
+    async def ask(priority, message):
+        latencies, failures = results[priority]
+        start = time.perf_counter()
+        try:
+            await Runner.run(agent, message, run_config=config)
+        except Exception:
+            failures[0] += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+
+    async def batch():
+        with request_priority(BATCH):
+            countries = iter(range(args.batch))
+
+            async def worker():
+                for n in countries:
+                    await ask(BATCH, f"Capital of country #{n}?")
+
+            await asyncio.gather(*(worker() for _ in range(args.workers)))
+
+    async def session(n):
+        await asyncio.sleep(0.2 + n * 0.1)
+        for turn in range(args.turns):
+            await ask(INTERACTIVE, f"Session {n}, question {turn}")
+            await asyncio.sleep(rng.uniform(0.5, 1.5))  # the user reads and types
+
+    await asyncio.gather(batch(), *(session(n) for n in range(args.sessions)))
+    return {priority: (latencies, failures[0]) for priority, (latencies, failures) in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rate-limit-aware request scheduler")
+    parser.add_argument("--limit", type=int, default=30, help="mock quota: requests per window")
+    parser.add_argument("--window", type=float, default=5.0, help="mock quota window in seconds")
+    parser.add_argument("--latency", type=float, default=0.3, help="mock completion latency in seconds")
+    parser.add_argument("--batch", type=int, default=90, help="batch job requests")
+    parser.add_argument("--workers", type=int, default=12, help="batch job concurrency")
+    parser.add_argument("--sessions", type=int, default=6, help="interactive chat sessions")
+    parser.add_argument("--turns", type=int, default=4, help="turns per session")
+    parser.add_argument("--modes", nargs="+", default=["plain", "scheduled"])
+    args = parser.parse_args()
+
+    print(
+        f"🧪 quota {args.limit} requests / {args.window:.0f}s, {args.latency * 1e3:.0f} ms per completion · "
+        f"batch {args.batch} × {args.workers} workers, {args.sessions} sessions × {args.turns} turns"
+    )
+    print(f"{'mode':<11}{'priority':<13}{'ok':>5}{'failed':>8}{'p50 ms':>9}{'p95 ms':>9}")
+    for mode in args.modes:
+        server = MockServer(latency=args.latency, request_limit=args.limit, window=args.window)
+        base_url = server.start_in_thread()
+        config = make_config(mode, base_url, args)
+        start = time.perf_counter()
+        results = asyncio.run(workload(config, args))
+        elapsed = time.perf_counter() - start
+        for priority, (latencies, failed) in results.items():
+            p50, p95 = (percentile(latencies, q) * 1e3 if latencies else float("nan") for q in (50, 95))
+            print(f"{mode:<11}{PRIORITY_NAMES[priority]:<13}{len(latencies):>5}{failed:>8}{p50:>9.0f}{p95:>9.0f}")
+        print(f"{'':<11}{server.throttled} requests answered 429 · {server.requests} sent · {elapsed:.1f}s elapsed")
+        if mode == "scheduled":
+            print("\n".join(f"{'':<11}{line}" for line in str(runtime.get_scheduler().stats).splitlines()))
+
+if __name__ == "__main__":
+    main()
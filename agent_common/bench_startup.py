@@ -0,0 +1,144 @@
+"""Startup cost of every project's entry point.
+
+Imports each entry point's module in a fresh interpreter under
+`python -X importtime` and reports the process wall time (interpreter start,
+imports and module-level setup), the module's cumulative import time and
+the top-level packages that took most of it. Then, for the interactive CLIs,
+the time until the first prompt appears: run cold, and through the warm
+daemon (agent_common.daemon).
+
+GEMINI_API_KEY defaults to a dummy and GEMINI_BASE_URL to a closed local
+port, so nothing reaches Gemini.
+
+    python bench_startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (project directory, module) for every entry point that can be imported without a UI framework running it
+ENTRY_POINTS = [
+    ("bank_agent", "main"),
+    ("class_agents", "main"),
+    ("class_agents", "mains"),
+    ("hello_agent", "main"),
+    ("multi-agent", "hello"),
+    ("multi-agent-assignments", "country_info_toolkit"),
+    ("multi-agent-assignments", "mood_handoff"),
+    ("multi-agent-assignments", "product_suggest"),
+    ("multi-agent-assignments", "country_batch"),
+    ("multi-agent-assignments1", "main"),
+    ("q3-assignment/assig1", "user_suggester"),
+    ("q3-assignment/assign6", "context"),
+    ("support_agent", "main"),
+    ("weather_project", "main"),
+]
+
+# Interactive CLIs timed to their first prompt, cold and through the daemon
+CLIS = ["multi-agent-assignments/mood_handoff.py", "multi-agent-assignments/country_info_toolkit.py"]
+
+
+def environment():
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(ROOT, "agent_common"), env.get("PYTHONPATH")]))
+    env.setdefault("GEMINI_API_KEY", "startup-bench")
+    env.setdefault("GEMINI_BASE_URL", "http://127.0.0.1:9/v1beta/openai/")
+    return env
+
+
+def import_time(project, module, env):
+    """(wall seconds, import seconds, {top-level package: self seconds}) for one cold import, or an error string."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.join(ROOT, project),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode:
+        return proc.stderr.strip().splitlines()[-1]
+    total, packages = 0.0, defaultdict(float)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1e6
+        if name.strip() == module:
+            total = int(cumulative_us) / 1e6
+    return wall, total, packages
+
+
+def first_output(command, env, cwd):
+    """Seconds until command writes its first byte to stdout."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.read(1)
+    elapsed = time.perf_counter() - start
+    proc.kill()
+    proc.wait()
+    return elapsed
+
+
+def start_daemon(env, socket_path):
+    env = dict(env, AGENT_DAEMON_SOCKET=socket_path)
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "agent_common.daemon", "serve", *CLIS], cwd=ROOT, env=env, stderr=subprocess.DEVNULL
+    )
+    while not os.path.exists(socket_path):
+        if daemon.poll() is not None:
+            raise RuntimeError("the daemon exited during startup")
+        time.sleep(0.05)
+    return daemon, env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of each project's entry point")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts per entry point (the median is reported)")
+    parser.add_argument("--top", type=int, default=3, help="packages listed per entry point")
+    args = parser.parse_args()
+    env = environment()
+
+    print(f"{'entry point':<50}{'wall ms':>9}{'import ms':>11}   top packages (self ms)")
+    for project, module in ENTRY_POINTS:
+        name = f"{project}/{module}.py"
+        results = [import_time(project, module, env) for _ in range(args.runs)]
+        if isinstance(results[0], str):
+            print(f"{name:<50}{'':>20}   skipped: {results[0]}")
+            continue
+        wall = statistics.median(r[0] for r in results)
+        total = statistics.median(r[1] for r in results)
+        packages = results[-1][2]
+        top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[: args.top]
+        listed = ", ".join(f"{package} {seconds * 1e3:.0f}" for package, seconds in top)
+        print(f"{name:<50}{wall * 1e3:>9.0f}{total * 1e3:>11.0f}   {listed}")
+
+    print(f"\n{'first prompt':<50}{'cold ms':>9}{'daemon ms':>11}")
+    socket_path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    daemon, daemon_env = start_daemon(env, socket_path)
+    try:
+        for script in CLIS:
+            cold = statistics.median(
+                first_output([sys.executable, script], env, ROOT) for _ in range(args.runs)
+            )
+            warm = statistics.median(
+                first_output([sys.executable, "-m", "agent_common.daemon", "run", script], daemon_env, ROOT)
+                for _ in range(args.runs)
+            )
+            print(f"{script:<50}{cold * 1e3:>9.0f}{warm * 1e3:>11.0f}")
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
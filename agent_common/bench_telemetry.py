@@ -0,0 +1,92 @@
+"""Per-turn cost of agent_common.telemetry.
+
+Runs chat turns through the Agents SDK against agent_common.mock_server,
+with an input guardrail and a tool-calling agent (StubModel), first with
+tracing disabled and then with the telemetry processor installed (JSONL
+writer and Prometheus metrics). Blocks of turns alternate between the two
+so drift affects both alike. The overhead is measured with a zero-latency
+mock, then put next to the per-turn latency at --latency.
+
+    python bench_telemetry.py --turns 400 --latency 0.3
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from agents import Agent, GuardrailFunctionOutput, Runner, function_tool, input_guardrail
+
+from agent_common import runtime, telemetry
+from agent_common.mock_server import MockServer
+from agent_common.stub_model import StubModel
+
+
+@input_guardrail
+async def on_topic(ctx, agent, input):
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered="forbidden" in str(input))
+
+
+@function_tool
+def lookup(city: str) -> str:
+    """Look up a city."""
+    return f"{city} is lovely this time of year."
+
+
+def agents_and_configs():
+    chat = Agent(name="Chat", instructions="Answer in one sentence.", input_guardrails=[on_topic])
+    tools = Agent(name="Tools", instructions="Use the lookup tool.", tools=[lookup])
+    stub = StubModel(latency=0.0, tool_arguments={"city": "Lahore"})
+    return chat, tools, stub
+
+
+async def turns(n, tracing, tool_turns=True):
+    """Seconds for n turns (alternating mock-server and tool-calling turns)."""
+    chat, tools, stub = agents_and_configs()
+    server_config = runtime.run_config("mock", tracing_disabled=not tracing)
+    tool_config = runtime.run_config(stub, tracing_disabled=not tracing)
+    start = time.perf_counter()
+    for i in range(n):
+        if i % 2 and tool_turns:
+            await Runner.run(tools, "What about Lahore?", run_config=tool_config)
+        else:
+            await Runner.run(chat, "What is the capital of France?", run_config=server_config)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the overhead of local span telemetry")
+    parser.add_argument("--turns", type=int, default=400, help="turns per mode at zero model latency")
+    parser.add_argument("--blocks", type=int, default=8, help="alternating blocks the turns are split into")
+    parser.add_argument("--latency", type=float, default=0.3, help="model latency for the per-turn comparison")
+    args = parser.parse_args()
+
+    server = MockServer(latency=0.0, jitter=0.0)
+    runtime.configure(base_url=server.start_in_thread(), api_key="test")
+    path = os.path.join(tempfile.mkdtemp(), "spans.jsonl")
+    processor = telemetry.install(path)
+
+    async def measure():
+        await turns(20, tracing=True)  # warm the pool and the SDK's first-call paths
+        off = on = 0.0
+        per_block = args.turns // args.blocks
+        for _ in range(args.blocks):
+            off += await turns(per_block, tracing=False)
+            on += await turns(per_block, tracing=True)
+        n = per_block * args.blocks
+        server.latency = args.latency
+        realistic = await turns(10, tracing=True, tool_turns=False) / 10
+        return off / n, on / n, realistic
+
+    off, on, realistic = asyncio.run(measure())
+    processor.writer.close()
+    overhead = on - off
+    print(f"📈 {args.turns} turns per mode at zero model latency")
+    print(f"   tracing off {off * 1e3:.2f} ms/turn · telemetry on {on * 1e3:.2f} ms/turn · overhead {overhead * 1e6:.0f} µs/turn")
+    print(f"   a turn at {args.latency * 1e3:.0f} ms model latency takes {realistic * 1e3:.0f} ms → overhead {overhead / realistic:.2%}")
+    print(f"   {processor.writer.written} span records written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""End-to-end load test of the agent projects against agent_common.mock_server.
+
+Starts the mock Gemini endpoint in-process, points the shared runtime client
+at it and drives the projects' own code (agents, tools, handoffs, guardrails,
+caches, telemetry) with --concurrency simulated users:
+
+  bank     bank_agent/main.py: local login, then balance questions
+           (a check_balance tool call and a reply per turn)
+  support  support_agent/main.py: one StickyRouter conversation per user
+           (FAQ, order status through the OrderAgent's tool, a complaint)
+  country  multi-agent-assignments/country_info_toolkit.py: concurrent finders
+           plus the orchestrator, with the on-disk answer cache off
+  mood     multi-agent-assignments/mood_handoff.py: speculative mood and
+           activity calls for the texts in mood_samples.jsonl
+
+Each scenario runs --warmup unmeasured turns, then --requests measured ones,
+and reports throughput and turn latency p50/p95/p99, model calls per turn and
+the 429s the mock answered. --json writes the report; --max-p95 and
+--max-error-rate turn the exit status non-zero, so CI catches regressions.
+
+    python loadtest.py --concurrency 20 --requests 200 --latency lognormal:0.3,0.5
+    python loadtest.py --scenarios bank support --429-rate 0.05 --max-p95 2000 --json loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from agent_common import runtime
+from agent_common.daemon import load_script
+from agent_common.mock_server import MockServer, add_server_arguments, parse_latency
+from agent_common.stats import percentile
+from agent_common.streaming import TextStream
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BANK_QUESTIONS = ["What is my account balance?", "How much money is in my account?", "Check my balance please"]
+SUPPORT_CONVERSATION = [
+    "What are your store hours?",
+    "Where is my order 12345?",
+    "It arrived cold and late, I want a refund.",
+]
+COUNTRIES = ["Pakistan", "France", "Japan", "Brazil", "Kenya", "Canada", "Norway", "Vietnam"]
+
+
+def load(project, module):
+    """Import project/module.py (bank_agent and support_agent both have a main.py, so under a name of its own)."""
+    return load_script(os.path.join(ROOT, project, f"{module}.py"))
+
+
+# Each scenario imports its project and returns an async session factory: a
+# session sets up one user and returns turn(k), which runs the user's k-th
+# turn and returns the seconds to its first streamed token (None if not streamed).
+
+
+def bank(stream):
+    main = load("bank_agent", "main")
+    name, pin = next(iter(main.DEMO_CUSTOMERS.items()))
+
+    async def session():
+        account, error = main.make_account(name, str(pin))
+        if error:
+            raise RuntimeError(error)
+        await main.authenticate_account(account)
+        if not account.authenticated:
+            raise RuntimeError(f"demo customer {name!r} failed to authenticate")
+
+        async def turn(k):
+            question = BANK_QUESTIONS[k % len(BANK_QUESTIONS)]
+            if not stream:
+                await main.answer_query(question, account)
+                return None
+            text = TextStream(main.bank_agent, question, context=account, run_config=main.config)
+            async for _ in text:
+                pass
+            return text.stats.first_token
+
+        return turn
+
+    return session
+
+
+def support(stream):
+    main = load("support_agent", "main")
+    classifier = main.load_classifier()
+
+    async def session():
+        conversation = main.StickyRouter(
+            main.triage_agent,
+            run_config=main.config,
+            classifier=classifier,
+            min_confidence=main.MIN_CONFIDENCE,
+            faq_cache=main.faq_cache,
+        )
+
+        async def turn(k):
+            await conversation.ask(SUPPORT_CONVERSATION[k % len(SUPPORT_CONVERSATION)])
+
+        return turn
+
+    return session
+
+
+def country(stream):
+    toolkit = load("multi-agent-assignments", "country_info_toolkit")
+
+    async def session():
+        async def turn(k):
+            summary, found, _ = await toolkit.lookup(COUNTRIES[k % len(COUNTRIES)], "concurrent")
+            if failed := toolkit.failures(found):
+                raise RuntimeError("; ".join(failed))
+
+        return turn
+
+    return session
+
+
+def mood(stream):
+    handoff = load("multi-agent-assignments", "mood_handoff")
+    with open(os.path.join(ROOT, "multi-agent-assignments", "mood_samples.jsonl"), encoding="utf-8") as f:
+        texts = [json.loads(line)["text"] for line in f if line.strip()]
+
+    async def session():
+        stats = handoff.SpeculationStats()
+
+        async def turn(k):
+            await handoff.analyze(texts[k % len(texts)], stats=stats)
+
+        return turn
+
+    return session
+
+
+SCENARIOS = {"bank": bank, "support": support, "country": country, "mood": mood}
+
+
+async def drive(session, turns, concurrency):
+    """Run turns turns spread over concurrency users; returns (latencies, first tokens, errors, seconds)."""
+    latencies, first_tokens, errors = [], [], []
+    remaining = iter(range(turns))
+
+    async def user():
+        turn = await session()
+        for k, _ in enumerate(remaining):
+            start = time.perf_counter()
+            try:
+                first_token = await turn(k)
+            except Exception as e:
+                errors.append(e)
+            else:
+                latencies.append(time.perf_counter() - start)
+                if first_token is not None:
+                    first_tokens.append(first_token)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(min(concurrency, turns))))
+    return latencies, first_tokens, errors, time.perf_counter() - start
+
+
+async def run(name, args, server):
+    session = SCENARIOS[name](args.stream)
+    await drive(session, args.warmup, args.concurrency)
+    completions, throttled = server.completions, server.throttled
+    latencies, first_tokens, errors, elapsed = await drive(session, args.requests, args.concurrency)
+    report = {
+        "turns": len(latencies),
+        "failed": len(errors),
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(latencies) / elapsed, 2),
+        "model_calls_per_turn": round((server.completions - completions) / args.requests, 2),
+        "throttled": server.throttled - throttled,
+    }
+    for pct in (50, 95, 99):
+        report[f"p{pct}_ms"] = round(percentile(latencies, pct) * 1e3, 1) if latencies else None
+    if first_tokens:
+        report["first_token_p50_ms"] = round(percentile(first_tokens, 50) * 1e3, 1)
+    if errors:
+        report["first_error"] = f"{type(errors[0]).__name__}: {errors[0]}"
+    return report
+
+
+def failed_checks(reports, args):
+    """Messages for every scenario over the --max-p95 / --max-error-rate limits."""
+    messages = []
+    for name, report in reports.items():
+        if args.max_p95 is not None and (report["p95_ms"] is None or report["p95_ms"] > args.max_p95):
+            messages.append(f"{name}: p95 {report['p95_ms']} ms over {args.max_p95:g} ms")
+        error_rate = report["failed"] / args.requests
+        if args.max_error_rate is not None and error_rate > args.max_error_rate:
+            messages.append(f"{name}: {error_rate:.1%} of turns failed, over {args.max_error_rate:.1%}")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the agent projects against the mock Gemini endpoint")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20, help="simulated users per scenario")
+    parser.add_argument("--requests", type=int, default=200, help="measured turns per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured turns first, per scenario")
+    parser.add_argument("--stream", action="store_true", help="stream the bank replies and report first-token latency")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--max-p95", type=float, help="fail if any scenario's p95 exceeds this many ms")
+    parser.add_argument("--max-error-rate", type=float, help="fail if any scenario's failed share of turns exceeds this")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer(
+        latency=parse_latency(args.latency),
+        request_limit=args.rpm,
+        token_limit=args.tpm,
+        chunk_delay=args.chunk_delay,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    runtime.configure(base_url=server.start_in_thread(), api_key="test")
+
+    async def run_all():
+        return {name: await run(name, args, server) for name in args.scenarios}
+
+    reports = asyncio.run(run_all())
+
+    print(
+        f"🧪 mock latency {args.latency}, {args.error_rate:.0%} injected 429s · "
+        f"{args.concurrency} users, {args.requests} turns per scenario"
+    )
+    print(f"{'scenario':<10}{'turns':>6}{'failed':>8}{'turns/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'calls':>7}{'429s':>6}")
+    for name, r in reports.items():
+        p50, p95, p99 = (r[f"p{pct}_ms"] if r[f"p{pct}_ms"] is not None else float("nan") for pct in (50, 95, 99))
+        print(
+            f"{name:<10}{r['turns']:>6}{r['failed']:>8}{r['throughput']:>9.1f}{p50:>9.0f}{p95:>9.0f}{p99:>9.0f}"
+            f"{r['model_calls_per_turn']:>7.2f}{r['throttled']:>6}"
+        )
+        if "first_token_p50_ms" in r:
+            print(f"{'':<10}first token p50 {r['first_token_p50_ms']:.0f} ms")
+        if "first_error" in r:
+            print(f"{'':<10}⚠️ {r['first_error']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "scenarios": reports}, f, indent=2)
+    if failures := failed_checks(reports, args):
+        print("\n".join(f"❌ {message}" for message in failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
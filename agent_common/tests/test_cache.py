@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from agent_common.cache import ResponseCache, default_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time() as seen by the cache, advanced by hand."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_ttl(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite3", ttl=60)
+    cache.put("france", {"value": "Paris"})
+
+    clock[0] += 59
+    assert cache.get("france") == {"value": "Paris"}
+    clock[0] += 2
+    assert cache.get("france") is None
+    assert len(cache) == 0
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.expired) == (1, 1, 1)
+
+
+def test_no_ttl_keeps_entries(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite3", ttl=None)
+    cache.put("france", {"value": "Paris"})
+    clock[0] += 10 * 365 * 24 * 3600
+    assert cache.get("france") == {"value": "Paris"}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite3", max_entries=2)
+    cache.put("a", 1)
+    clock[0] += 1
+    cache.put("b", 2)
+    clock[0] += 1
+    assert cache.get("a") == 1  # a is now more recent than b
+    clock[0] += 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats.evictions == 1
+
+
+def test_byte_limit_evicts_oldest(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "responses.sqlite3", max_bytes=25)
+    for key in "abc":
+        clock[0] += 1
+        cache.put(key, "x" * 10)  # 12 bytes encoded
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+
+
+def test_reopened_cache_keeps_entries(tmp_path):
+    path = tmp_path / "nested" / "responses.sqlite3"
+    cache = ResponseCache(path)
+    cache.put("france", {"value": "Paris"})
+    cache.close()
+    assert ResponseCache(path).get("france") == {"value": "Paris"}
+
+
+def test_default_path_follows_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("AGENT_CACHE_PATH", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_path() == str(tmp_path / "agent_common" / "responses.sqlite3")
+    monkeypatch.setenv("AGENT_CACHE_PATH", str(tmp_path / "other.sqlite3"))
+    assert default_path() == str(tmp_path / "other.sqlite3")
@@ -0,0 +1,76 @@
+import json
+import random
+import re
+
+import pytest
+
+from agent_common.intents import IntentMatcher
+
+
+def naive_match(rules, text, whole_words):
+    """{label: summed weight}, counting every (overlapping) occurrence of every phrase."""
+    text = " ".join(text.casefold().split())
+    scores = {}
+    for label, phrases in rules.items():
+        items = phrases.items() if isinstance(phrases, dict) else ((phrase, 1.0) for phrase in phrases)
+        for phrase, weight in items:
+            phrase = " ".join(phrase.casefold().split())
+            pattern = re.escape(phrase)
+            if whole_words:
+                pattern = r"\b" + pattern + r"\b"
+            count = len(re.findall(f"(?=({pattern}))", text))
+            if count:
+                scores[label] = scores.get(label, 0.0) + weight * count
+    return scores
+
+
+def random_rules(rng, size):
+    # A small alphabet, so phrases share prefixes and overlap inside messages
+    words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(size)]
+    rules = {f"intent_{i}": {} for i in range(5)}
+    for i in range(size):
+        phrase = " ".join(rng.sample(words, rng.choice((1, 1, 2))))
+        rules[f"intent_{i % 5}"][phrase] = rng.choice((0.5, 1.0, 2.0))
+    return rules, words
+
+
+@pytest.mark.parametrize("whole_words", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_naive_scan(seed, whole_words):
+    rng = random.Random(seed)
+    rules, words = random_rules(rng, rng.choice((5, 30, 200)))
+    matcher = IntentMatcher(rules, whole_words=whole_words)
+    for _ in range(50):
+        text = " ".join(rng.choices(words, k=rng.randint(0, 12)))
+        if rng.random() < 0.3:
+            text = text.upper().replace(" ", "  ")
+        assert matcher.match(text) == pytest.approx(naive_match(rules, text, whole_words)), text
+
+
+def test_phrases_hidden_in_longer_matches():
+    rules = {"order": ["order", "order status"], "status": ["status"], "order_id": ["order status id"]}
+    matcher = IntentMatcher(rules)
+    assert list(matcher.phrases("What is my ORDER status?")) == ["order", "order status", "status"]
+    assert matcher.match("order status id") == {"order": 2.0, "status": 1.0, "order_id": 1.0}
+
+
+def test_whole_words_skips_inflections():
+    rules = {"faq": ["hour", "open"]}
+    assert IntentMatcher(rules).match("What are your hours? Opens at 9") == {}
+    assert IntentMatcher(rules, whole_words=False).match("What are your hours? Opens at 9") == {"faq": 2.0}
+
+
+def test_weights_best_and_no_rules():
+    matcher = IntentMatcher({"billing": {"refund": 2, "payment": 1}, "technical": ["restart", "service"]})
+    assert matcher.match("I want a refund for the service") == {"billing": 2.0, "technical": 1.0}
+    assert matcher.best("refund the payment, restart the service") == "billing"
+    assert matcher.best("hello", default="general") == "general"
+    assert IntentMatcher({}).match("anything") == {}
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps({"whole_words": False, "intents": {"banking": ["balance"]}}))
+    matcher = IntentMatcher.from_file(path)
+    assert not matcher.whole_words
+    assert matcher.match("balances") == {"banking": 1.0}
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from agent_common.neardup import NearDuplicateCache, normalize
+
+
+def similarity(cache, a, b):
+    """The score get() gives b against a, without the LSH step."""
+    a, b = normalize(a), normalize(b)
+    shingles = cache._jaccard(cache._shingles(a), cache._shingles(b))
+    words = cache._jaccard(cache._words(a), cache._words(b))
+    return (shingles + words) / 2
+
+
+def test_exact_and_paraphrase_hits():
+    cache = NearDuplicateCache(threshold=0.8)
+    cache.put("What time do you open?", "9am", tags=("hours",))
+    assert cache.get("what time do you open") == ("9am", 1.0)
+    answer, score = cache.get("What time do u open??")
+    assert answer == "9am" and score >= 0.8
+    assert (cache.stats.hits, cache.stats.exact_hits) == (2, 1)  # case and punctuation are normalized away
+
+
+def test_different_content_word_misses():
+    cache = NearDuplicateCache(threshold=0.8)
+    cache.put("When do you open on Sunday?", "10am")
+    assert cache.get("When do you close on Sunday?") is None
+    assert cache.get("Do you deliver?") is None
+    assert cache.stats.hits == 0
+
+
+def test_hit_exactly_at_threshold():
+    stored, asked = "what time does the store open on saturday", "what time does the shop open on saturday"
+    score = similarity(NearDuplicateCache(), stored, asked)
+    assert 0 < score < 1
+
+    at = NearDuplicateCache(threshold=score)
+    at.put(stored, "answer")
+    assert at.get(asked) == ("answer", pytest.approx(score))
+
+    above = NearDuplicateCache(threshold=score + 1e-9)
+    above.put(stored, "answer")
+    assert above.get(asked) is None
+
+
+def test_lsh_finds_similar_pairs():
+    # LSH only compares against questions sharing a bucket; pairs this close must always share one
+    rng = random.Random(0)
+    words = ["menu", "vegan", "gluten", "hours", "parking", "delivery", "refund", "table", "booking", "pizza"]
+    cache = NearDuplicateCache(threshold=0.0)
+    questions = [" ".join(rng.sample(words, 5)) for _ in range(200)]
+    for q in questions:
+        cache.put(q, q)
+    checked = 0
+    for q in questions:
+        typo = q[:-1]  # drop the last letter
+        expected = similarity(cache, q, typo)
+        if expected >= 0.75:
+            _, score = cache.get(typo)
+            assert score >= expected
+            checked += 1
+    assert checked > 100
+
+
+def test_invalidate_by_tag():
+    cache = NearDuplicateCache()
+    cache.put("what time do you open", "9am", tags=("hours",))
+    cache.put("where are you located", "Main St", tags=("location",))
+    assert cache.invalidate("hours") == 1
+    assert cache.get("what time do you open") is None
+    assert cache.get("where are you located") == ("Main St", 1.0)
+    assert cache.invalidate() == 1 and len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = NearDuplicateCache(max_entries=2)
+    cache.put("what time do you open", "9am")
+    cache.put("where are you located", "Main St")
+    cache.get("what time do you open")
+    cache.put("do you have parking", "yes")
+    assert len(cache) == 2
+    assert cache.get("where are you located") is None
+    assert cache.get("what time do you open") == ("9am", 1.0)
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        NearDuplicateCache(num_perm=100, bands=32)
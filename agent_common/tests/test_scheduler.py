@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from agent_common.scheduler import BATCH, INTERACTIVE, RequestScheduler, TokenBucket, request_priority, retry_after
+
+
+def test_bucket_bursts_then_refills_at_rate():
+    bucket = TokenBucket(100, window=60.0, burst_fraction=0.1)
+    assert (bucket.burst, bucket.rate) == (10, pytest.approx(90 / 60))
+    now = bucket.updated
+    assert bucket.wait_time(10, now) == 0
+    bucket.take(10, now)
+    assert bucket.wait_time(1, now) == pytest.approx(60 / 90)
+    assert bucket.wait_time(3, now + 1.0) == pytest.approx((3 - 1.5) / 1.5)
+    assert bucket.wait_time(1000, now) == pytest.approx(10 / 1.5)  # capped at a full bucket
+
+
+def test_bucket_stays_under_sliding_window_limit():
+    limit, window = 60, 10.0
+    bucket = TokenBucket(limit, window)
+    now, taken = bucket.updated, []
+    end = now + 5 * window
+    while now < end:
+        now += bucket.wait_time(1, now) + 1e-9  # float rounding could otherwise leave now where it is + 1e-9  # float rounding could otherwise stall the clock
+        bucket.take(1, now)
+        taken.append(now)
+    for i, start in enumerate(taken):
+        in_window = sum(1 for t in taken[i:] if t < start + window)
+        assert in_window <= limit
+
+
+def test_correction_gives_back_and_takes_tokens():
+    bucket = TokenBucket(1000, burst_fraction=0.1)
+    now = bucket.updated
+    bucket.take(100, now)
+    bucket.correct(-40)  # used 40 fewer than estimated
+    assert bucket.level == pytest.approx(40)
+    bucket.correct(60)
+    assert bucket.level == pytest.approx(-20)
+
+
+def test_interactive_requests_overtake_queued_batch_requests():
+    async def main():
+        # One request up front, then one every 10 ms
+        scheduler = RequestScheduler(request_limit=10, window=0.1)
+        await scheduler.acquire()
+        order = []
+
+        async def request(name, priority):
+            with request_priority(priority):
+                await scheduler.acquire()
+            order.append(name)
+
+        batch = [asyncio.create_task(request(f"batch {i}", BATCH)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = [asyncio.create_task(request(f"interactive {i}", INTERACTIVE)) for i in range(3)]
+        await asyncio.gather(*batch, *interactive)
+        return order, scheduler.stats
+
+    order, stats = asyncio.run(main())
+    assert order == ["interactive 0", "interactive 1", "interactive 2", "batch 0", "batch 1", "batch 2"]
+    assert len(stats.waits[BATCH]) == 3
+    assert max(stats.waits[INTERACTIVE]) < min(stats.waits[BATCH])
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def main():
+        scheduler = RequestScheduler(request_limit=10, window=1.0)
+        await scheduler.acquire()
+        waiting = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return scheduler._queue
+
+    assert asyncio.run(main()) == []
+
+
+def test_429_pauses_and_slows_buckets():
+    scheduler = RequestScheduler(request_limit=100)
+    before = time.monotonic()
+    scheduler.record(429, {"retry-after": "2"}, estimated=100)
+    assert scheduler.paused_until == pytest.approx(before + 2, abs=0.1)
+    assert scheduler.requests.scale == 0.5
+    assert scheduler.stats.throttled == 1
+    scheduler.record(200, {}, estimated=100, actual=80)
+    assert scheduler.requests.scale == pytest.approx(0.55)
+    assert (scheduler.stats.estimated_tokens, scheduler.stats.actual_tokens) == (100, 80)
+
+
+def test_retry_after_headers():
+    assert retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert retry_after({"retry-after": "3"}) == 3.0
+    assert retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) < 0
+    assert retry_after({"retry-after": "soon"}) is None
+    assert retry_after({}) is None
@@ -0,0 +1,53 @@
+import pytest
+
+from agent_common.textclf import TextClassifier
+
+EXAMPLES = [
+    ("what time do you open", "faq"),
+    ("are you open on sunday", "faq"),
+    ("where is the store located", "faq"),
+    ("do you have vegetarian options on the menu", "faq"),
+    ("where is my order 12345", "order"),
+    ("has order 555 shipped yet", "order"),
+    ("track my order please", "order"),
+    ("when will my delivery arrive", "order"),
+    ("the food was cold and late", "complaint"),
+    ("your staff was rude to me", "complaint"),
+    ("i want to complain about my meal", "complaint"),
+    ("this is the worst service ever", "complaint"),
+]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    texts, labels = zip(*EXAMPLES)
+    return TextClassifier(n_features=2**12).fit(texts, labels)
+
+
+def test_fits_its_training_examples(classifier):
+    assert classifier.labels == ("complaint", "faq", "order")
+    for text, label in EXAMPLES:
+        assert classifier.predict(text)[0] == label
+
+
+def test_generalizes_to_paraphrases(classifier):
+    assert classifier.predict("what are your opening times on sunday")[0] == "faq"
+    assert classifier.predict("where's my order")[0] == "order"
+    assert classifier.predict("my meal was cold")[0] == "complaint"
+
+
+def test_probabilities_sum_to_one(classifier):
+    probs = classifier.predict_proba("hello")
+    assert set(probs) == set(classifier.labels)
+    assert sum(probs.values()) == pytest.approx(1.0)
+    _, confidence = classifier.predict("")  # no features: the bias decides
+    assert confidence == pytest.approx(max(classifier.predict_proba("").values()))
+
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    path = tmp_path / "model.npz"
+    classifier.save(path)
+    loaded = TextClassifier.load(path)
+    assert loaded.labels == classifier.labels
+    for text, _ in EXAMPLES:
+        assert loaded.predict_proba(text) == pytest.approx(classifier.predict_proba(text))
@@ -0,0 +1,73 @@
+"""Benchmark ledger lookups under concurrent sessions.
+
+Seeds a throwaway ledger with synthetic accounts, then has many sessions
+(threads, each with its own SQLite connection) look up random balances one
+at a time and in batches. Reports lookups per second and per-lookup latency.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent_common.stats import percentile
+from ledger import Ledger, synthetic_accounts
+
+
+def single_lookups(ledger, numbers, count, seed):
+    rng = random.Random(seed)
+    latencies = []
+    for _ in range(count):
+        number = rng.choice(numbers)
+        start = time.perf_counter()
+        ledger.balance(number)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def batched_lookups(ledger, numbers, count, batch_size, seed):
+    rng = random.Random(seed)
+    for _ in range(count // batch_size):
+        ledger.balances(rng.sample(numbers, batch_size))
+    return count // batch_size * batch_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ledger lookups under concurrent sessions")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=32, help="concurrent sessions (threads)")
+    parser.add_argument("--lookups", type=int, default=5_000, help="lookups per session")
+    parser.add_argument("--batch", type=int, default=100, help="accounts per batched lookup")
+    parser.add_argument("--db", help="ledger file to use (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "bench_ledger.sqlite3")
+    ledger = Ledger(path)
+    if len(ledger) < args.accounts:
+        start = time.perf_counter()
+        ledger.bulk_load(synthetic_accounts(args.accounts))
+        elapsed = time.perf_counter() - start
+        print(f"📥 Seeded {args.accounts:,} accounts in {elapsed:.1f}s ({args.accounts / elapsed:,.0f} rows/s)")
+    numbers = [number for number, _, _ in synthetic_accounts(args.accounts)]
+
+    with ThreadPoolExecutor(args.sessions) as pool:
+        start = time.perf_counter()
+        runs = list(pool.map(lambda i: single_lookups(ledger, numbers, args.lookups, i), range(args.sessions)))
+        single_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = sum(pool.map(lambda i: batched_lookups(ledger, numbers, args.lookups, args.batch, i), range(args.sessions)))
+        batched_elapsed = time.perf_counter() - start
+
+    latencies = [t for run in runs for t in run]
+    print(f"🏦 {args.sessions} sessions × {args.lookups:,} lookups over {args.accounts:,} accounts")
+    print(f"   single lookups   {len(latencies) / single_elapsed:12,.0f} lookups/s")
+    for pct in (50, 99):
+        print(f"   p{pct} lookup       {percentile(latencies, pct) * 1e6:12.1f} µs")
+    print(f"   batched ({args.batch:>3})    {batched / batched_elapsed:12,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Local credential checks for the bank agent.
+
+CredentialStore keeps salted PBKDF2 hashes of customer PINs (never the PINs
+themselves) in credentials.json. SessionCache remembers recently verified
+name/PIN pairs for a while, so returning customers skip the hash entirely.
+FailedLogins locks a name out for a while after repeated wrong PINs, since a
+local check is fast enough to try every 4-digit PIN in seconds.
+
+Add or change a customer with:
+
+    python credentials.py add "Sadiq khan"
+"""
+
+import getpass
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "credentials.json")
+ITERATIONS = 20_000
+SESSION_TTL = 15 * 60
+MAX_SESSIONS = 100_000
+MAX_FAILED_LOGINS = 5  # wrong PINs per name within LOCKOUT_SECONDS before the name is locked
+LOCKOUT_SECONDS = 15 * 60
+
+# Used when there is no credentials.json yet, matching the original hard-coded check
+DEMO_CUSTOMERS = {"Sadiq khan": 1234}
+
+
+def hash_pin(pin, salt, iterations=ITERATIONS):
+    return hashlib.pbkdf2_hmac("sha256", str(pin).encode(), salt, iterations).hex()
+
+
+class CredentialStore:
+    def __init__(self, path=DEFAULT_PATH, iterations=ITERATIONS):
+        self.path = path
+        self.iterations = iterations
+        self._records = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._records = json.load(f)
+        else:
+            for name, pin in DEMO_CUSTOMERS.items():
+                self.add(name, pin)
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def add(self, name, pin):
+        salt = secrets.token_bytes(16)
+        self._records[name] = {
+            "salt": salt.hex(),
+            "hash": hash_pin(pin, salt, self.iterations),
+            "iterations": self.iterations,
+        }
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._records, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def verify(self, name, pin):
+        record = self._records.get(name)
+        if record is None:
+            # Hash anyway so unknown names take as long as wrong PINs
+            hash_pin(pin, b"\0" * 16, self.iterations)
+            return False
+        expected = record["hash"]
+        actual = hash_pin(pin, bytes.fromhex(record["salt"]), record["iterations"])
+        return hmac.compare_digest(expected, actual)
+
+
+class SessionCache:
+    """Verified name/PIN pairs, held as keyed hashes, expiring after ttl seconds.
+
+    At most max_entries are kept: expired entries are swept when it fills,
+    then the ones closest to expiring are dropped.
+    """
+
+    def __init__(self, ttl=SESSION_TTL, max_entries=MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._key = secrets.token_bytes(32)
+        self._expires = {}  # token -> expiry time, soonest first
+        self._lock = threading.Lock()
+
+    def _token(self, name, pin):
+        return hmac.new(self._key, f"{name}\0{pin}".encode(), hashlib.sha256).digest()
+
+    def __contains__(self, credentials):
+        name, pin = credentials
+        token = self._token(name, pin)
+        with self._lock:
+            expires = self._expires.get(token)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._expires[token]
+                return False
+            return True
+
+    def __len__(self):
+        return len(self._expires)
+
+    def add(self, name, pin):
+        token = self._token(name, pin)
+        now = time.monotonic()
+        with self._lock:
+            self._expires.pop(token, None)  # re-inserted last, keeping the dict in expiry order
+            if len(self._expires) >= self.max_entries:
+                self._sweep(now)
+            self._expires[token] = now + self.ttl
+
+    def discard(self, name, pin):
+        with self._lock:
+            self._expires.pop(self._token(name, pin), None)
+
+    def _sweep(self, now):
+        while self._expires:
+            token, expires = next(iter(self._expires.items()))
+            if expires >= now and len(self._expires) < self.max_entries:
+                break
+            del self._expires[token]
+
+
+class FailedLogins:
+    """Wrong-PIN counts per name over the last window seconds; a name at the limit is locked out."""
+
+    def __init__(self, limit=MAX_FAILED_LOGINS, window=LOCKOUT_SECONDS, max_names=MAX_SESSIONS):
+        self.limit = limit
+        self.window = window
+        self.max_names = max_names
+        self._failures = {}  # name -> (count, time of the first failure), oldest first
+        self._lock = threading.Lock()
+
+    def _current(self, name, now):
+        entry = self._failures.get(name)
+        if entry is not None and now - entry[1] > self.window:
+            del self._failures[name]
+            return None
+        return entry
+
+    def locked(self, name):
+        with self._lock:
+            entry = self._current(name, time.monotonic())
+            return entry is not None and entry[0] >= self.limit
+
+    def record(self, name):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._current(name, now)
+            if entry is None:
+                while len(self._failures) >= self.max_names:
+                    del self._failures[next(iter(self._failures))]
+                self._failures[name] = (1, now)
+            else:
+                self._failures[name] = (entry[0] + 1, entry[1])
+
+    def clear(self, name):
+        with self._lock:
+            self._failures.pop(name, None)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "add":
+        sys.exit('usage: python credentials.py add "<customer name>"')
+    store = CredentialStore()
+    pin = getpass.getpass("4-digit PIN: ")
+    if not (pin.isdigit() and len(pin) == 4):
+        sys.exit("PIN must be a 4-digit number.")
+    store.add(sys.argv[2], int(pin))
+    store.save()
+    print(f"Saved credentials for {sys.argv[2]} to {store.path}")
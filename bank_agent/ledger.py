@@ -0,0 +1,157 @@
+"""SQLite account ledger behind the check_balance tool.
+
+Accounts live in a WAL-mode SQLite file keyed (and clustered) by account
+number, so a balance lookup is a single index probe however many accounts
+are loaded. Each thread gets its own connection, which lets concurrent
+sessions read in parallel.
+
+Seed a large ledger for testing, or open an account for a customer added
+with credentials.py, with:
+
+    python ledger.py seed 1000000
+    python ledger.py open "Sadiq khan" 50000
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ledger.sqlite3")
+
+# The demo customer's account (see DEMO_CUSTOMERS in credentials.py)
+DEMO_ACCOUNT = ("123456789", "Sadiq khan", 5_000_000)
+
+# Stay well under SQLite's bound-parameter limit in IN (...) lookups
+LOOKUP_CHUNK = 500
+
+
+def format_cents(cents):
+    return f"${cents / 100:,.2f}"
+
+
+class Ledger:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS accounts (
+                account_number TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                balance_cents INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS accounts_owner ON accounts (owner)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+    def balance(self, account_number):
+        """Balance in cents, or None for an unknown account."""
+        row = self._conn().execute(
+            "SELECT balance_cents FROM accounts WHERE account_number = ?", (account_number,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def account_of(self, owner):
+        """The account number owned by owner (the lowest, if several), or None."""
+        row = self._conn().execute(
+            "SELECT account_number FROM accounts WHERE owner = ? ORDER BY account_number LIMIT 1", (owner,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def balances(self, account_numbers):
+        """Batched lookup: {account_number: balance_cents} for the accounts that exist."""
+        numbers = list(dict.fromkeys(account_numbers))
+        found = {}
+        conn = self._conn()
+        for i in range(0, len(numbers), LOOKUP_CHUNK):
+            chunk = numbers[i:i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                conn.execute(
+                    f"SELECT account_number, balance_cents FROM accounts WHERE account_number IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return found
+
+    def upsert(self, account_number, owner, balance_cents):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO accounts (account_number, owner, balance_cents) VALUES (?, ?, ?)",
+            (account_number, owner, balance_cents),
+        )
+
+    def open_account(self, owner, balance_cents=0):
+        """Give owner a new account numbered after the highest existing one; returns the number."""
+        highest = self._conn().execute("SELECT MAX(account_number) FROM accounts").fetchone()[0]
+        number = f"{int(highest or DEMO_ACCOUNT[0]) + 1:09d}"
+        self.upsert(number, owner, balance_cents)
+        return number
+
+    def bulk_load(self, rows, batch_size=50_000):
+        """Insert (account_number, owner, balance_cents) rows in large transactions; returns the count."""
+        conn = self._conn()
+        conn.execute("PRAGMA synchronous=OFF")
+        loaded = 0
+        try:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    loaded += self._insert_batch(conn, batch)
+                    batch = []
+            if batch:
+                loaded += self._insert_batch(conn, batch)
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return loaded
+
+    @staticmethod
+    def _insert_batch(conn, batch):
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO accounts (account_number, owner, balance_cents) VALUES (?, ?, ?)", batch
+        )
+        conn.execute("COMMIT")
+        return len(batch)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+
+def synthetic_accounts(count, start=100_000_000, seed=42):
+    """Generate count fake accounts with 9-digit numbers starting at start."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"{start + i:09d}", f"Customer {i}", rng.randrange(0, 100_000_000)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "open":
+        ledger = Ledger()
+        owner = sys.argv[2]
+        if (number := ledger.account_of(owner)) is not None:
+            sys.exit(f"{owner} already has account {number}")
+        cents = round(float(sys.argv[3]) * 100) if len(sys.argv) == 4 else 0
+        print(f"Opened account {ledger.open_account(owner, cents)} for {owner} ({format_cents(cents)})")
+        sys.exit()
+    if len(sys.argv) != 3 or sys.argv[1] != "seed":
+        sys.exit('usage: python ledger.py seed <number of accounts> | open "<customer name>" [balance]')
+    ledger = Ledger()
+    start = time.perf_counter()
+    loaded = ledger.bulk_load(synthetic_accounts(int(sys.argv[2])))
+    ledger.upsert(*DEMO_ACCOUNT)
+    print(f"Loaded {loaded:,} accounts in {time.perf_counter() - start:.1f}s ({len(ledger):,} total in {ledger.path})")
@@ -0,0 +1,90 @@
+"""Load test for service.py against a stubbed model (no Gemini calls).
+
+Starts the bank service in-process with StubModel in place of Gemini, opens
+many concurrent customer sessions (authenticate, then ask a few questions)
+and reports sessions per second and turn latency percentiles.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from agents import RunConfig
+
+from agent_common.stats import percentile
+from agent_common.stub_model import StubModel
+from service import MAX_INFLIGHT, BankService
+
+
+async def session(host, port, queries, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def turn(message):
+        start = time.perf_counter()
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    try:
+        reply = await turn({"name": "Sadiq khan", "pin": 1234})
+        if not reply.get("authenticated"):
+            raise RuntimeError(f"authentication failed: {reply}")
+        for _ in range(queries):
+            await turn({"query": "What is my account balance?"})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the bank service with a stubbed model")
+    parser.add_argument("--sessions", type=int, default=500, help="customer sessions to run")
+    parser.add_argument("--concurrency", type=int, default=100, help="sessions connected at once")
+    parser.add_argument("--queries", type=int, default=3, help="questions per session after authenticating")
+    parser.add_argument("--latency", type=float, default=0.3, help="mean stubbed model latency in seconds")
+    parser.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT)
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--llm-auth", action="store_true", help="authenticate through the Auth Agent instead of locally")
+    args = parser.parse_args()
+
+    # Each turn is two model calls (tool call, then reply); jitter them around the mean
+    model = StubModel(latency=lambda: random.uniform(0.5, 1.5) * args.latency / 2)
+    service = BankService(
+        RunConfig(model=model, tracing_disabled=True), max_inflight=args.max_inflight, llm_auth=args.llm_auth
+    )
+    server = await service.start("127.0.0.1", args.port)
+    port = server.sockets[0].getsockname()[1]
+
+    latencies, failures = [], 0
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        nonlocal failures
+        async with gate:
+            try:
+                await session("127.0.0.1", port, args.queries, latencies)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+
+    print(f"🏦 {args.sessions} sessions ({failures} failed), {args.concurrency} concurrent, {len(latencies)} turns")
+    print(f"   elapsed          {elapsed:8.2f} s")
+    print(f"   sessions/s       {args.sessions / elapsed:8.1f}")
+    print(f"   turns/s          {len(latencies) / elapsed:8.1f}")
+    print(f"   model calls      {model.calls:8d}")
+    if latencies:
+        for pct in (50, 95, 99):
+            print(f"   p{pct} turn        {percentile(latencies, pct) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
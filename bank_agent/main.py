@@ -1,28 +1,26 @@
-from dotenv import load_dotenv
-load_dotenv()  
-
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, function_tool, RunContextWrapper
+import argparse
+import asyncio
 import os
-from pydantic import BaseModel
+import time
+from types import SimpleNamespace
+from typing import Optional
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+from agent_common.batching import BatchLoader
+from agent_common.intents import IntentMatcher
+from agent_common.lazy import lazy
+from agent_common.streaming import stream_reply
+from credentials import DEMO_CUSTOMERS, CredentialStore, FailedLogins, SessionCache
+from ledger import DEMO_ACCOUNT, Ledger, format_cents
 
-# Gemini Flash 2.0 Setup
-client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+# Agents are built on first use (or in the background from main()), so the
+# name prompt is up before the Agents SDK has finished importing
+AGENT_NAMES = {"config", "Account", "auth_agent", "bank_agent"}
 
-# Context model
-class Account(BaseModel):
-    name: str
-    pin: int
-    account_number: str = "123456789" 
-    authenticated: bool = False  
+# Input guardrail: Validate banking-related query (phrases live in intents.json)
+intents = IntentMatcher.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "intents.json"))
 
-# Input guardrail: Validate banking-related query
 def is_banking_query(query: str) -> bool:
-    banking_keywords = ["balance", "account", "help"]
-    return any(keyword in query.lower() for keyword in banking_keywords)
+    return "banking" in intents.match(query)
 
 # Output guardrail: Format responses
 def format_response(response: str, authenticated: bool) -> str:
@@ -30,58 +28,175 @@ def format_response(response: str, authenticated: bool) -> str:
         return "Sorry, authentication failed. Please check your name and PIN."
     return f"Bank Response: {response}. How can we assist you further?"
 
-# Tool 1: Authentication
-@function_tool(is_enabled=lambda ctx, agent: True)
-def authenticate(ctx: RunContextWrapper[Account]) -> str:
-    if ctx.context.name == "Sadiq khan" and ctx.context.pin == 1234:
-        ctx.context.authenticated = True
-        return "Authentication successful."
-    return "Authentication failed. Incorrect name or PIN."
-
-# Tool 2: Check balance
-@function_tool(is_enabled=lambda ctx, agent: ctx.context.authenticated)
-def check_balance(ctx: RunContextWrapper[Account]) -> str:
-    return f"Your balance for account {ctx.context.account_number} is $50,000."
-
-# Agent 1: Authentication Agent
-auth_agent = Agent(
-    name="Auth Agent",
-    instructions="Verify user credentials and authenticate them using the provided tool.",
-    tools=[authenticate],
-    model=model,
-)
-
-# Agent 2: Bank Service Agent
-bank_agent = Agent(
-    name="Bank Service Agent",
-    instructions="Assist authenticated customers with banking queries like checking balance.",
-    tools=[check_balance],
-    model=model,
-)
+# Local credential check: hashed store plus a cache of recently verified sessions.
+# If the store can't be loaded, authentication falls back to the Auth Agent.
+try:
+    credential_store = CredentialStore()
+except (OSError, ValueError) as e:
+    print(f"DEBUG: Credential store unavailable ({e}), falling back to the Auth Agent.")
+    credential_store = None
+verified_sessions = SessionCache()
+# A name is locked out for a while after repeated wrong PINs
+failed_logins = FailedLogins()
+
+def check_credentials(name: str, pin: int) -> bool:
+    if (name, pin) in verified_sessions:
+        return True
+    if failed_logins.locked(name):
+        return False
+    if credential_store is not None:
+        verified = credential_store.verify(name, pin)
+    else:
+        verified = DEMO_CUSTOMERS.get(name) == pin
+    if verified:
+        verified_sessions.add(name, pin)
+        failed_logins.clear(name)
+    else:
+        failed_logins.record(name)
+    return verified
+
+# Account ledger (SQLite), opened on first use; make sure the demo account exists
+@lazy
+def ledger():
+    store = Ledger()
+    if store.balance(DEMO_ACCOUNT[0]) is None:
+        store.upsert(*DEMO_ACCOUNT)
+    return store
+
+def find_account(name: str):
+    """The authenticated customer's own account number, or None if they have none."""
+    return ledger().account_of(name)
+
+# Balance lookups from concurrent sessions are merged into one ledger query per batch
+async def fetch_balances(account_numbers):
+    return await asyncio.to_thread(lambda: ledger().balances(account_numbers))
+
+balance_loader = BatchLoader(fetch_balances)
+
+@lazy
+def graph():
+    from agents import Agent, RunContextWrapper, function_tool
+    from pydantic import BaseModel
+
+    from agent_common import telemetry
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    # Span timings and token counts per agent, kept locally (telemetry/spans.jsonl, --metrics-port)
+    telemetry.install(os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry", "spans.jsonl"))
+
+    # Context model
+    class Account(BaseModel):
+        name: str
+        pin: int
+        account_number: Optional[str] = None  # set from the ledger once authenticated
+        authenticated: bool = False  
+
+    # Tool 1: Authentication
+    @function_tool(is_enabled=lambda ctx, agent: True)
+    def authenticate(ctx: RunContextWrapper[Account]) -> str:
+        if check_credentials(ctx.context.name, ctx.context.pin):
+            ctx.context.authenticated = True
+            ctx.context.account_number = find_account(ctx.context.name)
+            return "Authentication successful."
+        return "Authentication failed. Incorrect name or PIN."
+
+    # Tool 2: Check balance, only for a customer with an account of their own
+    @function_tool(is_enabled=lambda ctx, agent: ctx.context.authenticated and ctx.context.account_number is not None)
+    async def check_balance(ctx: RunContextWrapper[Account]) -> str:
+        cents = await balance_loader.load(ctx.context.account_number)
+        if cents is None:
+            return f"No account {ctx.context.account_number} was found."
+        return f"Your balance for account {ctx.context.account_number} is {format_cents(cents)}."
+
+    # Agent 1: Authentication Agent
+    auth_agent = Agent(
+        name="Auth Agent",
+        instructions="Verify user credentials and authenticate them using the provided tool.",
+        tools=[authenticate],
+    )
+
+    # Agent 2: Bank Service Agent
+    bank_agent = Agent(
+        name="Bank Service Agent",
+        instructions=(
+            "Assist authenticated customers with banking queries like checking balance. "
+            "If there is no balance tool, the customer has no account with us yet."
+        ),
+        tools=[check_balance],
+    )
+    route(auth_agent, bank_agent)
+    # Gemini setup, on the process-wide pooled client; agent models come from agent_common's models.toml
+    return SimpleNamespace(
+        config=run_config(workflow_name="bank"), Account=Account, auth_agent=auth_agent, bank_agent=bank_agent
+    )
+
+def __getattr__(name):
+    # Account, the agents and config stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Shared steps, used by the console loop below and by service.py
+def make_account(name, pin):
+    """Apply the credential input guardrails; returns (Account, None) or (None, error)."""
+    name = name.strip()
+    if not name:
+        return None, "Name cannot be empty."
+    try:
+        pin = int(pin)
+    except (TypeError, ValueError):
+        return None, "Invalid PIN format."
+    if not (1000 <= pin <= 9999):
+        return None, "PIN must be a 4-digit number."
+    return graph().Account(name=name, pin=pin), None
+
+async def authenticate_account(account, run_config=None, use_llm=False):
+    """Authenticate locally; the Auth Agent is only used when asked to or when the store is unavailable."""
+    if not use_llm and credential_store is not None:
+        if (account.name, account.pin) in verified_sessions:
+            account.authenticated = True
+        else:
+            # The PIN hash takes a few ms, so keep it off the event loop
+            account.authenticated = await asyncio.to_thread(check_credentials, account.name, account.pin)
+        if account.authenticated:
+            account.account_number = await asyncio.to_thread(find_account, account.name)
+            return "Authentication successful."
+        if failed_logins.locked(account.name):
+            return "Authentication failed. Too many wrong PINs; try again later."
+        return "Authentication failed. Incorrect name or PIN."
+    from agents import Runner
+
+    agents = graph()
+    result = await Runner.run(agents.auth_agent, "Authenticate the user.", context=account, run_config=run_config or agents.config)
+    return result.final_output
+
+async def answer_query(query, account, run_config=None):
+    from agents import Runner
+
+    agents = graph()
+    return await Runner.run(agents.bank_agent, query, context=account, run_config=run_config or agents.config)
 
 # Main logic
-def main():
+async def main(stream=False, llm_auth=False):
+    graph.start()  # import the SDK and build the agents while the user types
     # Input guardrails
     name = input("Enter your name: ").strip()
     if not name:
         print("Name cannot be empty.")
         return
 
-    try:
-        pin = int(input("Enter your 4-digit PIN: "))
-        if not (1000 <= pin <= 9999):
-            print("PIN must be a 4-digit number.")
-            return
-    except ValueError:
-        print("Invalid PIN format.")
+    user_context, error = make_account(name, input("Enter your 4-digit PIN: "))
+    if error:
+        print(error)
         return
 
-    user_context = Account(name=name, pin=pin)
-
-    # Handoff 1: Run Auth Agent
-    auth_result = Runner.run_sync(auth_agent, "Authenticate the user.", context=user_context, run_config=config)
-    print(f"DEBUG: Auth result: {auth_result.final_output}, Authenticated: {user_context.authenticated}")
-    print(format_response(auth_result.final_output, user_context.authenticated))
+    # Handoff 1: Authenticate (local check, Auth Agent as fallback)
+    start = time.perf_counter()
+    auth_reply = await authenticate_account(user_context, use_llm=llm_auth)
+    elapsed_ms = (time.perf_counter() - start) * 1e3
+    print(f"DEBUG: Auth result: {auth_reply}, Authenticated: {user_context.authenticated}, took {elapsed_ms:.2f} ms")
+    print(format_response(auth_reply, user_context.authenticated))
 
     # Check if authentication was successful
     if user_context.authenticated:
@@ -95,10 +210,25 @@ def main():
                 continue
 
             # Handoff 2: Run Bank Agent
-            result = Runner.run_sync(bank_agent, query, context=user_context, run_config=config)
-            print(format_response(result.final_output, user_context.authenticated))
+            if stream:
+                print("Bank Response: ", end="", flush=True)
+                agents = graph()
+                result, stats = await stream_reply(agents.bank_agent, query, context=user_context, run_config=agents.config)
+                print(f"How can we assist you further?\n{stats}")
+            else:
+                result = await answer_query(query, user_context)
+                print(format_response(result.final_output, user_context.authenticated))
     else:
         print("Authentication failed. Exiting.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Banking Assistant")
+    parser.add_argument("--stream", action="store_true", help="stream replies token by token")
+    parser.add_argument("--llm-auth", action="store_true", help="authenticate through the Auth Agent instead of locally")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+    if args.metrics_port:
+        from agent_common import telemetry
+
+        telemetry.serve_metrics(args.metrics_port)
+    asyncio.run(main(args.stream, args.llm_auth))
\ No newline at end of file
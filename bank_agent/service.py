@@ -0,0 +1,134 @@
+"""Asyncio banking service: many customer sessions in one process.
+
+Each TCP (or Unix socket) connection is one customer session with its own
+Account context. All sessions share the process-wide client from
+agent_common.runtime, and therefore its keep-alive connection pool.
+
+Protocol: one JSON object per line in both directions.
+
+    -> {"name": "Sadiq khan", "pin": 1234}
+    <- {"reply": "Bank Response: ...", "authenticated": true}
+    -> {"query": "What is my balance?"}
+    <- {"reply": "Bank Response: ..."}
+
+A message that cannot be answered (bad input, or a model error) gets
+{"error": "..."} and the session stays open. A session is closed after
+MAX_LOGIN_FAILURES failed logins, and a name is locked out for a while after
+repeated wrong PINs across sessions (credentials.FailedLogins).
+
+Backpressure: a session buffers at most SESSION_QUEUE unanswered lines before
+it stops reading from its socket, replies wait for the client to drain, and
+at most MAX_INFLIGHT model turns run at once across all sessions.
+"""
+
+import argparse
+import asyncio
+import json
+
+from main import answer_query, authenticate_account, format_response, is_banking_query, make_account
+
+SESSION_QUEUE = 8
+MAX_INFLIGHT = 64
+MAX_LOGIN_FAILURES = 3  # per session, before the connection is closed
+
+
+class BankService:
+    def __init__(self, run_config=None, max_inflight=MAX_INFLIGHT, session_queue=SESSION_QUEUE, llm_auth=False):
+        self.run_config = run_config
+        self.llm_auth = llm_auth
+        self.session_queue = session_queue
+        self.limiter = asyncio.Semaphore(max_inflight)
+        self.active_sessions = 0
+        self.total_sessions = 0
+
+    async def handle(self, reader, writer):
+        self.active_sessions += 1
+        self.total_sessions += 1
+        inbox = asyncio.Queue(maxsize=self.session_queue)
+
+        async def read_lines():
+            try:
+                while line := await reader.readline():
+                    await inbox.put(line)  # blocks when the session is SESSION_QUEUE lines behind
+            except (ConnectionError, ValueError):
+                pass  # reset connection or an over-long line: end the session
+            await inbox.put(None)
+
+        async def send(message):
+            writer.write((json.dumps(message) + "\n").encode())
+            await writer.drain()
+
+        account = None
+        login_failures = 0
+
+        async def respond(message):
+            """The reply to one client message; updates the session's account."""
+            nonlocal account, login_failures
+            if account is None or not account.authenticated:
+                account, error = make_account(str(message.get("name", "")), message.get("pin"))
+                if error:
+                    login_failures += 1
+                    return {"error": error}
+                if self.llm_auth:
+                    async with self.limiter:
+                        reply = await authenticate_account(account, self.run_config, use_llm=True)
+                else:
+                    reply = await authenticate_account(account, self.run_config)
+                login_failures += not account.authenticated
+                return {"reply": format_response(reply, account.authenticated), "authenticated": account.authenticated}
+
+            query = str(message.get("query", "")).strip()
+            if not query or not is_banking_query(query):
+                return {"error": "Please ask a valid banking question (e.g., balance, account)."}
+            async with self.limiter:
+                result = await answer_query(query, account, self.run_config)
+            return {"reply": format_response(result.final_output, account.authenticated)}
+
+        reading = asyncio.create_task(read_lines())
+        try:
+            while (line := await inbox.get()) is not None:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    await send({"error": "Each line must be a JSON object."})
+                    continue
+                try:
+                    reply = await respond(message)
+                except Exception as e:
+                    # A model timeout or API error fails this message, not the session
+                    reply = {"error": str(e) or type(e).__name__}
+                await send(reply)
+                if login_failures >= MAX_LOGIN_FAILURES:
+                    await send({"error": "Too many failed logins; closing the session."})
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            reading.cancel()
+            self.active_sessions -= 1
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(host, port, unix_path, max_inflight, llm_auth):
+    service = BankService(max_inflight=max_inflight, llm_auth=llm_auth)
+    server = await service.start(host, port, unix_path)
+    where = unix_path or f"{host}:{port}"
+    print(f"🏦 Bank service listening on {where} (max {max_inflight} turns in flight)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session banking service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT, help="model turns allowed at once")
+    parser.add_argument("--llm-auth", action="store_true", help="authenticate through the Auth Agent instead of locally")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.unix, args.max_inflight, args.llm_auth))
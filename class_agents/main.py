@@ -1,46 +1,26 @@
 import asyncio
-from openai.types.responses import ResponseTextDeltaEvent
-from agents import Agent, AsyncOpenAI,Runner
-from agents.run import RunConfig
-from dotenv import load_dotenv
-import os
+from agents import Agent
 
-# Load environment variables
-load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
+from agent_common.routing import route
+from agent_common.runtime import run_config
+from agent_common.streaming import stream_reply
 
-# Set up the Gemini-compatible OpenAI client
-external_client = AsyncOpenAI(
-api_key=gemini_api_key,
-base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-# Setup the model
-model = ResponseTextDeltaEvent(
-model="gemini-2.0-flash",
-openai_client=external_client
-)
-
-# Run config for the agent runner
-config = RunConfig(
-model=model,
-model_provider=external_client,
-tracing_disabled=True
-)
+# Run config for the agent runner: Gemini on the shared, pooled client (GEMINI_API_KEY from .env)
+config = run_config()
     
 async def main():
     agent = Agent(
         name="Joker",
         instructions="You are a helpful assistant.",
     )
+    route(agent)  # model and limits from agent_common's models.toml
 
     prompt=input("enter your query ")
 
-    result = Runner.run_streamed(agent,prompt)
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
-            print(event.data.delta, end="", flush=True)
+    # Text deltas are printed as they arrive, in small batches
+    _, stats = await stream_reply(agent, prompt, run_config=config)
+    print(stats)
 
 
-if __name__ == "_main_":
+if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,15 +1,14 @@
-import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+import argparse
+import asyncio
+from agents import Agent, Runner
 
+from agent_common.routing import route
+from agent_common.runtime import run_config
+from agent_common.streaming import stream_reply
 
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
 
-# ⚙️ Set up Gemini Flash model
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+# ⚙️ Gemini on the shared pooled client; the agent's model and limits come from agent_common's models.toml
+config = run_config()
 
 # 🤖 Agent Definition
 agent = Agent(
@@ -19,10 +18,10 @@ agent = Agent(
         "Include a short, clear reason.\n\n"
         "Format:\n🤖 Suggestion: [product]\n📌 Reason: [explanation]"
     ),
-    model=model
 )
+route(agent)
 
-def main():
+async def main(stream=False):
     print("🛒 Welcome to the Smart Store! Describe your issue (or type 'exit' to quit):")
     while True:
         user_input = input("🗣️ You: ").strip()
@@ -30,8 +29,15 @@ def main():
             print("👋 Goodbye! Take care.")
             break
 
-        result = Runner.run_sync(agent, input=user_input, run_config=config)
-        print(result.final_output + "\n")
+        if stream:
+            _, stats = await stream_reply(agent, user_input, run_config=config)
+            print(f"{stats}\n")
+        else:
+            result = await Runner.run(agent, input=user_input, run_config=config)
+            print(result.final_output + "\n")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Smart Store Agent")
+    parser.add_argument("--stream", action="store_true", help="stream replies token by token")
+    args = parser.parse_args()
+    asyncio.run(main(args.stream))
\ No newline at end of file
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+
+from agent_common.stats import percentile
+from country_info_toolkit import FINDER_TIMEOUT, lookup, open_cache
+
+# 🌍 Countries used when none are given on the command line
+COUNTRIES = ["Pakistan", "Japan", "Brazil", "Kenya", "Canada", "Germany", "Egypt", "Mexico", "Turkey", "Indonesia"]
+
+
+def usage(found):
+    """Count model calls and tokens across every RunResult in a lookup."""
+    calls = input_tokens = output_tokens = 0
+    for result in found.values():
+        if isinstance(result, Exception):
+            continue
+        for response in result.raw_responses:
+            calls += 1
+            input_tokens += response.usage.input_tokens
+            output_tokens += response.usage.output_tokens
+    return calls, input_tokens, output_tokens
+
+
+async def bench(mode, countries, repeats, timeout, cache=None):
+    latencies, calls, input_tokens, output_tokens = [], 0, 0, 0
+    for _ in range(repeats):
+        for country in countries:
+            _, found, timings = await lookup(country, mode, timeout, cache)
+            c, i, o = usage(found)
+            calls, input_tokens, output_tokens = calls + c, input_tokens + i, output_tokens + o
+            latencies.append(timings["total"])
+
+    n = len(latencies)
+    return {
+        "requests": n,
+        "calls": calls / n,
+        "input_tokens": input_tokens / n,
+        "output_tokens": output_tokens / n,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare the four-call pipeline with the structured engine")
+    parser.add_argument("countries", nargs="*", default=COUNTRIES)
+    parser.add_argument("--modes", nargs="+", default=["sequential", "concurrent", "structured"])
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=FINDER_TIMEOUT)
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on (off by default so every call hits the model)")
+    args = parser.parse_args()
+
+    cache = open_cache() if args.cache else None
+
+    print(f"{'engine':<12}{'requests':>9}{'calls/req':>11}{'in tok/req':>12}{'out tok/req':>13}{'p50 s':>8}{'p95 s':>8}")
+    for mode in args.modes:
+        r = await bench(mode, args.countries, args.repeats, args.timeout, cache)
+        print(
+            f"{mode:<12}{r['requests']:>9}{r['calls']:>11.2f}{r['input_tokens']:>12.1f}"
+            f"{r['output_tokens']:>13.1f}{r['p50']:>8.2f}{r['p95']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""How many mood_agent calls the local classifier avoids, and how accurate it is when it answers.
+
+mood_samples.jsonl is what the lexicon in agent_common/mood.py was tuned on,
+so it overstates both numbers; the default, mood_heldout.jsonl, was written
+separately and is never used for tuning. Keep it that way: add new phrasings
+to mood_samples.jsonl when changing the lexicon, not to the held-out file.
+"""
+
+import argparse
+import json
+import time
+
+from agent_common.mood import MoodClassifier
+from mood_handoff import MOOD_CONFIDENCE
+
+
+def load_samples(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how many mood_agent calls the local classifier avoids")
+    parser.add_argument(
+        "samples",
+        nargs="?",
+        default="mood_heldout.jsonl",
+        help="JSONL file of {text, label} (default: the held-out set; mood_samples.jsonl is the tuning set)",
+    )
+    parser.add_argument("--threshold", type=float, default=MOOD_CONFIDENCE)
+    parser.add_argument("--llm", action="store_true", help="also send the low-confidence messages to mood_agent")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    texts = [s["text"] for s in samples]
+    classifier = MoodClassifier()
+
+    start = time.perf_counter()
+    guesses = [classifier.classify(text) for text in texts]
+    local_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    start = time.perf_counter()
+    classifier.predict(texts)
+    batch_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    confident = [i for i, (_, confidence) in enumerate(guesses) if confidence >= args.threshold]
+    fallback = [i for i, (_, confidence) in enumerate(guesses) if confidence < args.threshold]
+    local_correct = sum(guesses[i][0] == samples[i]["label"] for i in confident)
+
+    print(f"📊 {len(samples)} labelled messages from {args.samples}, threshold {args.threshold}")
+    print(f"   answered locally   {len(confident):4d}  ({len(confident) / len(samples):.0%} of LLM calls avoided)")
+    print(f"   sent to LLM        {len(fallback):4d}")
+    if confident:
+        print(f"   local accuracy     {local_correct / len(confident):.1%}")
+    print(f"   local latency      {local_us:8.1f} µs/message ({batch_us:.1f} µs/message batched)")
+
+    if args.llm and fallback:
+        # Only --llm needs the SDK, the agents and GEMINI_API_KEY
+        from agents import Runner
+
+        from mood_handoff import config, mood_agent
+
+        llm_correct, llm_seconds = 0, 0.0
+        for i in fallback:
+            start = time.perf_counter()
+            mood = Runner.run_sync(mood_agent, input=texts[i], run_config=config).final_output.strip().lower()
+            llm_seconds += time.perf_counter() - start
+            llm_correct += mood == samples[i]["label"]
+        print(f"   LLM accuracy       {llm_correct / len(fallback):.1%}")
+        print(f"   LLM latency        {llm_seconds / len(fallback) * 1e3:8.1f} ms/message")
+        overall = (local_correct + llm_correct) / len(samples)
+        print(f"   overall accuracy   {overall:.1%}")
+
+
+if __name__ == "__main__":
+    main()
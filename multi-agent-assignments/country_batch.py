@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from agent_common import runtime, telemetry
+from agent_common.cache import normalize
+from agent_common.scheduler import BATCH, request_priority
+from country_info_toolkit import FINDER_TIMEOUT, facts, failures, find_concurrent, find_structured, open_cache
+
+
+def read_countries(lines):
+    """Deduplicate country names (case and spacing insensitive), keeping first-seen order."""
+    seen, countries = set(), []
+    for line in lines:
+        name = line.strip()
+        if not name or name.startswith("#"):
+            continue
+        key = normalize(name)
+        if key not in seen:
+            seen.add(key)
+            countries.append(name.title())
+    return countries
+
+
+def completed(path):
+    """Countries already written with status "ok" to a previous run's output."""
+    done = set()
+    if path == "-" or not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a run killed mid-write can leave a partial last line
+            if record.get("status") == "ok":
+                done.add(normalize(record["country"]))
+    return done
+
+
+async def process(country, engine, timeout, cache=None):
+    start = time.perf_counter()
+    if engine == "structured":
+        found = await find_structured(country, timeout, cache)
+        result = found["facts"]
+        values = {} if isinstance(result, Exception) else result.final_output.model_dump()
+    else:
+        found = await find_concurrent(country, timeout, cache)
+        values = facts(found)
+
+    record = {"country": country, **values}
+    errors = failures(found)
+    if errors or not values or not all(values.values()):
+        record["status"] = "error"
+        record["errors"] = errors or ["missing fields"]
+    else:
+        record["status"] = "ok"
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+async def run_batch(countries, out, failed, concurrency, engine, timeout, cache=None):
+    """Push countries through the finder agents, writing each record as soon as it completes."""
+    queue = asyncio.Queue()
+    for country in countries:
+        queue.put_nowait(country)
+    counts = {"ok": 0, "error": 0}
+
+    async def worker():
+        while True:
+            try:
+                country = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                record = await process(country, engine, timeout, cache)
+            except Exception as e:
+                record = {"country": country, "status": "error", "errors": [str(e)]}
+            counts[record["status"]] += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if record["status"] != "ok":
+                failed.write(country + "\n")
+                failed.flush()
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(countries)) or 1)))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up many countries and stream the results as JSONL")
+    parser.add_argument("input", nargs="?", default="-", help="file with one country per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file ('-' for stdout)")
+    parser.add_argument("--failed", help="where to write countries that failed (default: OUTPUT.failed)")
+    parser.add_argument("--resume", action="store_true", help="skip countries already marked ok in OUTPUT and append to it")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="countries in flight at once")
+    parser.add_argument("--engine", choices=["concurrent", "structured"], default="concurrent")
+    parser.add_argument("--timeout", type=float, default=FINDER_TIMEOUT, help="seconds per finder agent")
+    parser.add_argument("--no-cache", action="store_true", help="always ask the model, skipping the response cache")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port (telemetry/spans.jsonl has every span)")
+    args = parser.parse_args()
+    if args.metrics_port:
+        telemetry.serve_metrics(args.metrics_port)
+
+    if args.resume and args.output == "-":
+        parser.error("--resume needs --output to point at the previous run's file")
+    cache = None if args.no_cache else open_cache()
+
+    if args.input == "-":
+        countries = read_countries(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            countries = read_countries(f)
+
+    skipped = 0
+    if args.resume:
+        done = completed(args.output)
+        remaining = [c for c in countries if normalize(c) not in done]
+        skipped, countries = len(countries) - len(remaining), remaining
+
+    failed_path = args.failed or (os.devnull if args.output == "-" else args.output + ".failed")
+    out = sys.stdout if args.output == "-" else open(args.output, "a" if args.resume else "w", encoding="utf-8")
+    failed = open(failed_path, "w", encoding="utf-8")
+
+    print(f"🌍 {len(countries)} countries to look up ({skipped} already done)", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        # Behind any interactive turns sharing the Gemini quota in this process
+        with request_priority(BATCH):
+            counts = asyncio.run(run_batch(countries, out, failed, args.concurrency, args.engine, args.timeout, cache))
+    finally:
+        failed.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = len(countries) / elapsed if elapsed else 0.0
+    print(
+        f"✅ {counts['ok']} ok, ❌ {counts['error']} failed in {elapsed:.2f}s ({rate:.1f} countries/s)",
+        file=sys.stderr,
+    )
+    print(runtime.get_scheduler().stats, file=sys.stderr)
+    if counts["error"] and failed_path != os.devnull:
+        print(f"↩️ Failed countries written to {failed_path}; rerun with --resume to retry them", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
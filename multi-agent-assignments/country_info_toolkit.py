@@ -1,42 +1,60 @@
+import argparse
+import asyncio
 import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, RunConfig, AsyncOpenAI, OpenAIChatCompletionsModel
-
-# 🔐 Load API Key
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-
-# ⚙️ Gemini Flash Setup
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
-
-# 🧭 Agent 1: Capital Finder
-capital_agent = Agent(
-    name="Capital Finder",
-    model=model,
-    instructions="Return ONLY the capital city of the provided country. No explanation."
-)
-
-# 🗣️ Agent 2: Language Finder
-language_agent = Agent(
-    name="Language Finder",
-    model=model,
-    instructions="Return ONLY the main language spoken in the provided country. No explanation."
-)
-
-# 👥 Agent 3: Population Finder
-population_agent = Agent(
-    name="Population Finder",
-    model=model,
-    instructions="Return ONLY the population of the provided country in short format (e.g., '241 million')."
-)
-
-# 🧠 Final Orchestrator Agent
-orchestrator = Agent(
-    name="Country Info Orchestrator",
-    model=model,
-    instructions="""
+import time
+from types import SimpleNamespace
+
+from agent_common.cache import ResponseCache, cached_run
+from agent_common.lazy import lazy
+
+TELEMETRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry", "spans.jsonl")
+
+# 🤖 Agents are built on first use (or in the background from main()), so the
+# prompt is up before the Agents SDK has finished importing
+AGENT_NAMES = {
+    "config", "capital_agent", "language_agent", "population_agent",
+    "orchestrator", "CountryInfo", "facts_agent", "FINDERS",
+}
+
+
+@lazy
+def graph():
+    from agents import Agent
+    from pydantic import BaseModel
+
+    from agent_common import telemetry
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    # 📈 Span timings and token counts per finder agent, kept locally (telemetry/spans.jsonl, --metrics-port)
+    telemetry.install(TELEMETRY_PATH)
+
+    # ⚙️ Gemini setup (process-wide pooled client, GEMINI_API_KEY from .env); each agent's
+    # model and limits come from agent_common's models.toml
+    config = run_config(workflow_name="country_info")
+
+    # 🧭 Agent 1: Capital Finder
+    capital_agent = Agent(
+        name="Capital Finder",
+        instructions="Return ONLY the capital city of the provided country. No explanation."
+    )
+
+    # 🗣️ Agent 2: Language Finder
+    language_agent = Agent(
+        name="Language Finder",
+        instructions="Return ONLY the main language spoken in the provided country. No explanation."
+    )
+
+    # 👥 Agent 3: Population Finder
+    population_agent = Agent(
+        name="Population Finder",
+        instructions="Return ONLY the population of the provided country in short format (e.g., '241 million')."
+    )
+
+    # 🧠 Final Orchestrator Agent
+    orchestrator = Agent(
+        name="Country Info Orchestrator",
+        instructions="""
 You are a smart assistant that summarizes the results from 3 agents: Capital, Language, and Population.
 
 Respond like this:
@@ -45,22 +63,196 @@ Respond like this:
 If any value is missing, reply:
 'I cannot fulfill that request. Please provide a valid country name.'
 """
-)
+    )
 
-def main():
-    print("🌍 Welcome to the Country Info Toolkit!\n")
-    country = input("🔎 Enter a country name: ").strip().title()
+    # 📦 Structured engine: one call returns every field, the sentence is built locally
+    class CountryInfo(BaseModel):
+        capital: str
+        language: str
+        population: str
 
+    facts_agent = Agent(
+        name="Country Facts Finder",
+        instructions=(
+            "Given a country, return its capital city, the main language spoken there and its population "
+            "in short format (e.g., '241 million'). If the input is not a real country, leave every field empty."
+        ),
+        output_type=CountryInfo,
+    )
+    # Finders and the structured engine on the light tier with short max_tokens
+    route(capital_agent, language_agent, population_agent, orchestrator, facts_agent)
+
+    return SimpleNamespace(
+        config=config,
+        capital_agent=capital_agent,
+        language_agent=language_agent,
+        population_agent=population_agent,
+        orchestrator=orchestrator,
+        CountryInfo=CountryInfo,
+        facts_agent=facts_agent,
+        FINDERS={"capital": capital_agent, "language": language_agent, "population": population_agent},
+    )
+
+
+def __getattr__(name):
+    # The agents, config and FINDERS stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+SUMMARY_TEMPLATE = "The capital of {country} is {capital}, the language is {language}, and the population is {population}."
+FAILURE_MESSAGE = "I cannot fulfill that request. Please provide a valid country name."
+
+# ⏱️ Each finder gets this long before it is dropped from the summary
+FINDER_TIMEOUT = 20.0
+
+# 🗄️ Capitals, languages and populations rarely change, so answers can be cached on disk for this long
+CACHE_TTL = 30 * 24 * 3600
+
+
+def open_cache():
+    """The on-disk ResponseCache to pass as `cache=` to the lookups below (they default to none)."""
+    return ResponseCache(ttl=CACHE_TTL)
+
+
+async def _find(agent, country, timeout, cache=None):
+    """Run one finder agent, returning the exception instead of raising it."""
     try:
-        capital = Runner.run_sync(capital_agent, input=country, run_config=config).final_output.strip()
-        language = Runner.run_sync(language_agent, input=country, run_config=config).final_output.strip()
-        population = Runner.run_sync(population_agent, input=country, run_config=config).final_output.strip()
+        return await asyncio.wait_for(cached_run(cache, agent, country, run_config=graph().config), timeout)
+    except Exception as e:
+        return e
+
+
+async def find_sequential(country, timeout=FINDER_TIMEOUT, cache=None):
+    """Run the finder agents one after another (one round trip at a time)."""
+    return {field: await _find(agent, country, timeout, cache) for field, agent in graph().FINDERS.items()}
 
-        combined_input = f"Country: {country}, Capital: {capital}, Language: {language}, Population: {population}"
-        summary = Runner.run_sync(orchestrator, input=combined_input, run_config=config)
 
-        print("\n📘 Country Summary:\n" + summary.final_output + "\n")
+async def find_concurrent(country, timeout=FINDER_TIMEOUT, cache=None):
+    """Run the finder agents at the same time on the shared client.
 
+    A slow or failing agent only loses its own field; the others still come back.
+    """
+    finders = graph().FINDERS
+    results = await asyncio.gather(*(_find(agent, country, timeout, cache) for agent in finders.values()))
+    return dict(zip(finders, results))
+
+
+def facts(found):
+    """Turn finder results into {field: answer}, with None for failed fields."""
+    return {
+        field: None if isinstance(result, Exception) else result.final_output.strip()
+        for field, result in found.items()
+    }
+
+
+def failures(found):
+    """Describe every finder that failed or timed out."""
+    agents = graph()
+    messages = []
+    for field, result in found.items():
+        name = agents.FINDERS[field].name if field in agents.FINDERS else agents.facts_agent.name
+        if isinstance(result, asyncio.TimeoutError):
+            messages.append(f"{name} timed out")
+        elif isinstance(result, Exception):
+            messages.append(f"{name} failed: {result}")
+    return messages
+
+
+async def summarize(country, found, cache=None):
+    values = {field: value or "missing" for field, value in facts(found).items()}
+    combined_input = (
+        f"Country: {country}, Capital: {values['capital']}, "
+        f"Language: {values['language']}, Population: {values['population']}"
+    )
+    return await cached_run(cache, graph().orchestrator, combined_input, run_config=graph().config)
+
+
+def render_summary(country, info):
+    """Build the summary sentence from a CountryInfo without another model call."""
+    fields = info.model_dump()
+    if not all(value.strip() for value in fields.values()):
+        return FAILURE_MESSAGE
+    return SUMMARY_TEMPLATE.format(country=country, **{k: v.strip() for k, v in fields.items()})
+
+
+async def find_structured(country, timeout=FINDER_TIMEOUT, cache=None):
+    """Fetch every field with a single call to facts_agent."""
+    return {"facts": await _find(graph().facts_agent, country, timeout, cache)}
+
+
+async def lookup(country, mode="sequential", timeout=FINDER_TIMEOUT, cache=None):
+    """Fetch the facts for one country and summarize them.
+
+    mode is "sequential" or "concurrent" for the four-call pipeline, or
+    "structured" for the single facts_agent call plus local template.
+    Returns (summary, found, timings): found maps each lookup to its RunResult
+    (or the exception it raised) and timings holds wall-clock seconds spent
+    fetching facts and in total. Answers go through cache (a ResponseCache) when given.
+    """
+    start = time.perf_counter()
+
+    if mode == "structured":
+        found = await find_structured(country, timeout, cache)
+        finders_done = time.perf_counter()
+        result = found["facts"]
+        summary = FAILURE_MESSAGE if isinstance(result, Exception) else render_summary(country, result.final_output)
+    else:
+        find = find_concurrent if mode == "concurrent" else find_sequential
+        found = await find(country, timeout, cache)
+        finders_done = time.perf_counter()
+        found["summary"] = await summarize(country, found, cache)
+        summary = found["summary"].final_output
+
+    timings = {"finders": finders_done - start, "total": time.perf_counter() - start}
+    return summary, found, timings
+
+
+async def run(country, mode, timeout, cache=None):
+    modes = ["sequential", "concurrent", "structured"] if mode == "compare" else [mode]
+    timings = {}
+
+    for current in modes:
+        summary, found, timings[current] = await lookup(country, current, timeout, cache)
+        for message in failures(found):
+            print(f"⚠️ {message}")
+        print(f"\n📘 Country Summary ({current}):\n" + summary + "\n")
+
+    print("⏱️ Latency (wall clock)")
+    for current, t in timings.items():
+        print(f"   {current:<11} finders {t['finders']:6.2f}s   total {t['total']:6.2f}s")
+    if mode == "compare":
+        saved = timings["sequential"]["finders"] - timings["concurrent"]["finders"]
+        print(f"   concurrent finders saved {saved:.2f}s")
+    if cache is not None:
+        print(f"🗄️ Cache: {cache.stats.hits} hits, {cache.stats.misses} misses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Country Info Toolkit")
+    parser.add_argument(
+        "--mode",
+        choices=["sequential", "concurrent", "structured", "compare"],
+        default="sequential",
+        help="run the finder agents one by one, all at once, as one structured call, or all three for comparison",
+    )
+    parser.add_argument("--timeout", type=float, default=FINDER_TIMEOUT, help="seconds per finder agent")
+    parser.add_argument("--no-cache", action="store_true", help="always ask the model, skipping the response cache")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+    graph.start()  # import the SDK and build the agents while the user types
+    if args.metrics_port:
+        from agent_common import telemetry
+
+        telemetry.serve_metrics(args.metrics_port)
+    cache = None if args.no_cache else open_cache()
+
+    print("🌍 Welcome to the Country Info Toolkit!\n")
+    country = input("🔎 Enter a country name: ").strip().title()
+
+    try:
+        asyncio.run(run(country, args.mode, args.timeout, cache))
     except Exception as e:
         print("❌ An error occurred:", e)
 
@@ -1,38 +1,145 @@
-import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
-
-# 🔐 Load API Key
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-
-# ⚙️ Gemini Flash 2.0 Setup
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
-
-# 🧠 Agent 1: Mood Detector
-mood_agent = Agent(
-    name="Mood Detector",
-    instructions=(
-        "You're a mood analysis bot. Read the user's message and respond with ONLY ONE word: "
-        "happy, sad, angry, excited, stressed, or neutral. No extra text or explanation."
-    ),
-    model=model
-)
-
-# 💡 Agent 2: Uplift Activity Suggester
-activity_agent = Agent(
-    name="Uplift Buddy",
-    instructions=(
-        "If the user's mood is sad, stressed, or angry, suggest a simple and comforting activity.\n\n"
-        "Use this format:\n"
-        "🧘 Suggested Activity: [activity]\n💬 Note: [encouraging message]"
-    ),
-    model=model
-)
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from agent_common.lazy import lazy
+from agent_common.mood import classify
+from agent_common.streaming import stream_reply
+
+# 🤖 Agents are built on first use (or in the background from main()), so the
+# prompt is up before the Agents SDK has finished importing
+AGENT_NAMES = {"config", "mood_agent", "activity_agent"}
+
+
+@lazy
+def graph():
+    from agents import Agent
+
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    # ⚙️ Gemini setup (process-wide pooled client, GEMINI_API_KEY from .env); each agent's
+    # model and limits come from agent_common's models.toml
+
+    # 🧠 Agent 1: Mood Detector
+    mood_agent = Agent(
+        name="Mood Detector",
+        instructions=(
+            "You're a mood analysis bot. Read the user's message and respond with ONLY ONE word: "
+            "happy, sad, angry, excited, stressed, or neutral. No extra text or explanation."
+        ),
+    )
+
+    # 💡 Agent 2: Uplift Activity Suggester
+    activity_agent = Agent(
+        name="Uplift Buddy",
+        instructions=(
+            "If the user's mood is sad, stressed, or angry, suggest a simple and comforting activity.\n\n"
+            "Use this format:\n"
+            "🧘 Suggested Activity: [activity]\n💬 Note: [encouraging message]"
+        ),
+    )
+    route(mood_agent, activity_agent)  # the one-word classifier runs on the light tier
+    return SimpleNamespace(config=run_config(), mood_agent=mood_agent, activity_agent=activity_agent)
+
+
+def __getattr__(name):
+    # mood_agent, activity_agent and config stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# 🎯 Local classifier answers on its own at or above this confidence; below it, mood_agent decides
+MOOD_CONFIDENCE = 0.6
+
+NEEDS_ACTIVITY = ["sad", "stressed", "angry"]
+DOING_WELL = ["happy", "excited", "neutral"]
+
+
+@dataclass
+class SpeculationStats:
+    """What speculative activity calls cost and saved over a session."""
+
+    started: int = 0
+    used: int = 0
+    wasted: int = 0
+    wasted_finished: int = 0  # wasted calls that completed before we could cancel them
+    saved_seconds: float = 0.0
+
+    def summary(self):
+        return (
+            f"🔮 Speculation: {self.started} started, {self.used} used (saved {self.saved_seconds:.2f}s), "
+            f"{self.wasted} wasted ({self.wasted_finished} already finished)"
+        )
+
+
+def _run(agent, user_input):
+    from agents import Runner
+
+    return Runner.run(agent, input=user_input, run_config=graph().config)
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+async def detect_mood(user_input, threshold=MOOD_CONFIDENCE):
+    """Return (mood, source), trying the local lexicon classifier before the LLM."""
+    mood, confidence = classify(user_input)
+    if confidence >= threshold:
+        return mood, f"local, {confidence:.2f}"
+    result = await _run(graph().mood_agent, user_input)
+    return result.final_output.strip().lower(), "llm"
+
+
+async def analyze(user_input, threshold=MOOD_CONFIDENCE, stats=None):
+    """Detect the mood and, for sad/stressed/angry users, fetch an activity suggestion.
+
+    With stats given (speculative mode) and the mood left to the LLM, the activity
+    call starts alongside mood detection and is cancelled if it turns out not to
+    be needed. Returns (mood, source, suggestion or None).
+    """
+    mood, confidence = classify(user_input)
+    if confidence < threshold and stats is not None:
+        start = time.perf_counter()
+        activity = asyncio.create_task(_timed(_run(graph().activity_agent, user_input)))
+        activity.add_done_callback(lambda t: t.cancelled() or t.exception())  # retrieved even when discarded
+        stats.started += 1
+        try:
+            result = await _run(graph().mood_agent, user_input)
+        except BaseException:
+            activity.cancel()
+            raise
+        mood, source = result.final_output.strip().lower(), "llm, speculative"
+        mood_seconds = time.perf_counter() - start
+
+        if mood in NEEDS_ACTIVITY:
+            suggestion, activity_seconds = await activity
+            stats.used += 1
+            # Serial would have been mood + activity; overlapped it is the slower of the two
+            stats.saved_seconds += min(mood_seconds, activity_seconds)
+            return mood, source, suggestion.final_output
+
+        stats.wasted += 1
+        stats.wasted_finished += activity.done()
+        activity.cancel()
+        return mood, source, None
+
+    mood, source = await detect_mood(user_input, threshold)
+    if mood in NEEDS_ACTIVITY:
+        suggestion = await _run(graph().activity_agent, user_input)
+        return mood, source, suggestion.final_output
+    return mood, source, None
+
+
+async def chat(threshold, speculate, stream=False):
+    stats = SpeculationStats() if speculate else None
 
-def main():
     print("🌈 Welcome to the Mood Analyzer! (Type 'exit' to quit)\n")
     while True:
         user_input = input("🗣️ How are you feeling? ").strip()
@@ -43,16 +150,47 @@ def main():
             print("⚠️ Please enter a message to analyze.\n")
             continue
 
-        mood = Runner.run_sync(mood_agent, input=user_input, run_config=config).final_output.strip().lower()
-        print(f"🔍 Detected Mood: {mood}")
+        if stream:
+            mood, source = await detect_mood(user_input, threshold)
+            print(f"🔍 Detected Mood: {mood} ({source})")
+            if mood in NEEDS_ACTIVITY:
+                _, timing = await stream_reply(graph().activity_agent, user_input, run_config=graph().config)
+                print(f"{timing}\n")
+                continue
+            suggestion = None
+        else:
+            mood, source, suggestion = await analyze(user_input, threshold, stats)
+            print(f"🔍 Detected Mood: {mood} ({source})")
 
-        if mood in ["sad", "stressed", "angry"]:
-            suggestion = Runner.run_sync(activity_agent, input=user_input, run_config=config)
-            print(suggestion.final_output + "\n")
-        elif mood in ["happy", "excited", "neutral"]:
+        if suggestion is not None:
+            print(suggestion + "\n")
+        elif mood in DOING_WELL:
             print("✅ You're doing well! Keep up the positive vibes! 🌟\n")
         else:
             print("⚠️ Mood not recognized. Try expressing it differently.\n")
 
+    if stats is not None:
+        print(stats.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mood Analyzer")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=MOOD_CONFIDENCE,
+        help="minimum local classifier confidence to skip the LLM (above 1 always uses the LLM)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--speculate",
+        action="store_true",
+        help="start the activity suggestion alongside LLM mood detection and cancel it if unneeded",
+    )
+    mode.add_argument("--stream", action="store_true", help="stream activity suggestions token by token")
+    args = parser.parse_args()
+    graph.start()  # import the SDK and build the agents while the user types
+    asyncio.run(chat(args.threshold, args.speculate, args.stream))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,28 +1,45 @@
-import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
-
-
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-
-# ⚙️ Set up Gemini Flash model
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
-
-# 🤖 Agent Definition
-agent = Agent(
-    name="Smart Store Agent",
-    instructions=(
-        "Suggest a relevant medicine or product based on the user's problem. "
-        "Include a short, clear reason.\n\n"
-        "Format:\n🤖 Suggestion: [product]\n📌 Reason: [explanation]"
-    ),
-    model=model
-)
-
-def main():
+import argparse
+import asyncio
+from types import SimpleNamespace
+
+from agent_common.lazy import lazy
+from agent_common.streaming import stream_reply
+
+# 🤖 The agent is built on first use (or in the background from main()), so the
+# welcome text is up before the Agents SDK has finished importing
+AGENT_NAMES = {"config", "agent"}
+
+
+@lazy
+def graph():
+    from agents import Agent
+
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    # ⚙️ Gemini on the shared pooled client; the agent's model and limits come from agent_common's models.toml
+
+    # 🤖 Agent Definition
+    agent = Agent(
+        name="Smart Store Agent",
+        instructions=(
+            "Suggest a relevant medicine or product based on the user's problem. "
+            "Include a short, clear reason.\n\n"
+            "Format:\n🤖 Suggestion: [product]\n📌 Reason: [explanation]"
+        ),
+    )
+    route(agent)
+    return SimpleNamespace(config=run_config(), agent=agent)
+
+
+def __getattr__(name):
+    # agent and config stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+async def main(stream=False):
+    graph.start()  # import the SDK and build the agent while the user types
     print("🛒 Welcome to the Smart Store! Describe your issue (or type 'exit' to quit):")
     while True:
         user_input = input("🗣️ You: ").strip()
@@ -30,8 +47,18 @@ def main():
             print("👋 Goodbye! Take care.")
             break
 
-        result = Runner.run_sync(agent, input=user_input, run_config=config)
-        print(result.final_output + "\n")
+        agents = graph()
+        if stream:
+            _, stats = await stream_reply(agents.agent, user_input, run_config=agents.config)
+            print(f"{stats}\n")
+        else:
+            from agents import Runner
+
+            result = await Runner.run(agents.agent, input=user_input, run_config=agents.config)
+            print(result.final_output + "\n")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Smart Store Agent")
+    parser.add_argument("--stream", action="store_true", help="stream replies token by token")
+    args = parser.parse_args()
+    asyncio.run(main(args.stream))
\ No newline at end of file
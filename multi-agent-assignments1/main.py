@@ -1,16 +1,13 @@
-import os
-from dotenv import load_dotenv
 from agents import Agent, Runner, GuardrailFunctionOutput, RunContextWrapper,TResponseInputItem, input_guardrail
 from pydantic import BaseModel
 
+from agent_common.routing import route
+from agent_common.runtime import run_config
 
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
 
-# ⚙️ Set up Gemini Flash model
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+# ⚙️ Gemini on the shared pooled client (GEMINI_API_KEY from .env); the agent's model
+# and limits come from agent_common's models.toml
+config = run_config()
 
 # 🤖 Agent Definition
 agent = Agent(
@@ -18,8 +15,8 @@ agent = Agent(
     instructions=(
         ""
     ),
-    model=model
 )
+route(agent)
 
 def main():
     print("🛒 Welcome to the Smart Store! Describe your issue (or type 'exit' to quit):")
@@ -0,0 +1,79 @@
+"""Time-to-first-token and throughput for many concurrent chat users in one process.
+
+Simulates chainlit's on_message handler for N users arriving together, with
+StubModel standing in for Gemini (first token after --latency, then a chunk
+every --chunk-delay). Modes:
+
+  blocking   the old handler: Runner.run_sync-style, the loop is stuck per reply
+  async      awaits Runner.run and sends the whole reply at the end
+  streaming  hello.stream(): chunks are pushed as they arrive
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from agents import Agent, RunConfig, Runner
+
+from agent_common.stats import percentile
+from agent_common.stub_model import StubModel
+from agent_common.streaming import TextStream
+
+REPLY = " ".join(["The weather in Karachi is sunny and warm with a light breeze from the sea."] * 5)
+
+
+async def handle(mode, agent, config, message, arrived):
+    """Returns (seconds to first visible text, seconds to complete reply) from arrival."""
+    if mode == "blocking":
+        # Like Runner.run_sync: the handler's own loop is stuck until the reply is complete
+        worker = threading.Thread(target=asyncio.run, args=(Runner.run(agent, message, run_config=config),))
+        worker.start()
+        worker.join()
+        done = time.perf_counter() - arrived
+        return done, done
+    if mode == "async":
+        await Runner.run(agent, message, run_config=config)
+        done = time.perf_counter() - arrived
+        return done, done
+    first = None
+    async for _ in TextStream(agent, message, run_config=config):
+        if first is None:
+            first = time.perf_counter() - arrived
+    return first, time.perf_counter() - arrived
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent chat users")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.4, help="stubbed seconds to first token")
+    parser.add_argument("--chunk-delay", type=float, default=0.03, help="stubbed seconds between chunks")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "async", "streaming"])
+    args = parser.parse_args()
+
+    model = StubModel(latency=args.latency, reply=REPLY, call_tools=False, chunk_delay=args.chunk_delay)
+    agent = Agent(name="hello", instructions="You are a helpful assistant.")
+    config = RunConfig(model=model, tracing_disabled=True)
+
+    print(
+        f"💬 {args.users} users at once, first token {args.latency * 1e3:.0f} ms, "
+        f"chunk every {args.chunk_delay * 1e3:.0f} ms"
+    )
+    print(f"{'mode':<11}{'elapsed s':>10}{'replies/s':>11}{'TTFT p50':>10}{'TTFT p95':>10}{'done p95':>10}")
+    for mode in args.modes:
+        users = args.users if mode != "blocking" else min(args.users, 20)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(handle(mode, agent, config, "Weather in Karachi?", start) for _ in range(users))
+        )
+        elapsed = time.perf_counter() - start
+        first, done = zip(*results)
+        note = f"  ({users} users)" if users != args.users else ""
+        print(
+            f"{mode:<11}{elapsed:>10.2f}{users / elapsed:>11.1f}{percentile(first, 50):>9.2f}s"
+            f"{percentile(first, 95):>9.2f}s{percentile(done, 95):>9.2f}s{note}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
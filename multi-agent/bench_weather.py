@@ -0,0 +1,117 @@
+"""Concurrent chat sessions calling the weather tool, old vs new client.
+
+Starts fake_weather_server.py on its own thread and runs many chat sessions
+through the Agents SDK with StubModel (no Gemini calls); every turn makes the
+agent call the weather tool for a city drawn from a skewed popularity list.
+Modes:
+
+  blocking  the old tool: requests.get with a new connection, on the event loop
+  pooled    WeatherClient with caching off (keep-alive pool + singleflight)
+  cached    WeatherClient as hello.py uses it (plus TTL cache)
+
+    python bench_weather.py --sessions 150 --turns 4
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import requests
+from agents import Agent, RunConfig, Runner, function_tool
+
+from agent_common.stats import percentile
+from agent_common.stub_model import StubModel
+from fake_weather_server import FakeWeatherServer
+from weather import WeatherClient
+
+CITIES = [
+    "Karachi", "Lahore", "Islamabad", "London", "New York", "Dubai", "Paris", "Tokyo", "Toronto", "Sydney",
+    "Berlin", "Istanbul", "Riyadh", "Doha", "Singapore", "Madrid", "Rome", "Cairo", "Nairobi", "Mumbai",
+]
+
+
+def blocking_tool(base_url):
+    @function_tool
+    def getWeather(city: str) -> str:
+        """Get the weather for a given city."""
+        result = requests.get(f"{base_url}/current.json?key=test&q={city}")
+        if result.status_code == 200:
+            data = result.json()
+            return f"The weather in {city} is {data['current']['temp_c']}°C with {data['current']['condition']['text']}."
+        return "Sorry, I couldn't fetch the weather data."
+
+    return getWeather
+
+
+def client_tool(client):
+    @function_tool
+    async def getWeather(city: str) -> str:
+        """Get the weather for a given city."""
+        return await client.describe(city)
+
+    return getWeather
+
+
+async def run_sessions(tool, sessions, turns, model_latency, seed=1):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(CITIES))]  # Zipf-like: a few cities dominate
+    model = StubModel(
+        latency=lambda: rng.uniform(0.5, 1.5) * model_latency,
+        tool_arguments=lambda: {"city": rng.choices(CITIES, weights)[0]},
+    )
+    agent = Agent(name="hello", instructions="You are a helpful assistant.", tools=[tool])
+    config = RunConfig(model=model, tracing_disabled=True)
+    latencies = []
+
+    async def session():
+        for _ in range(turns):
+            start = time.perf_counter()
+            await Runner.run(agent, "What's the weather like?", run_config=config)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return time.perf_counter() - start, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the weather tool under concurrent chat sessions")
+    parser.add_argument("--sessions", type=int, default=150)
+    parser.add_argument("--turns", type=int, default=4, help="weather questions per session")
+    parser.add_argument("--api-latency", type=float, default=0.15, help="fake weather API latency in seconds")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="stubbed model latency per call")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "pooled", "cached"])
+    args = parser.parse_args()
+
+    # On its own loop, so the blocking mode stalls only the chat sessions, as it would in chainlit
+    server = FakeWeatherServer(latency=args.api_latency)
+    base_url = server.start_in_thread()
+    total = args.sessions * args.turns
+    print(
+        f"🌤️ {args.sessions} sessions × {args.turns} turns, "
+        f"API {args.api_latency * 1e3:.0f} ms, model {args.model_latency * 1e3:.0f} ms"
+    )
+    print(f"{'mode':<10}{'elapsed s':>10}{'turns/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'API calls':>11}{'connections':>13}")
+    for mode in args.modes:
+        client = None
+        if mode == "blocking":
+            tool = blocking_tool(base_url)
+        else:
+            ttl = 600.0 if mode == "cached" else 0.0
+            client = WeatherClient(base_url=base_url, api_key="test", ttl=ttl, stale_ttl=ttl * 6)
+            tool = client_tool(client)
+        requests_before, connections_before = server.requests, server.connections
+        elapsed, latencies = await run_sessions(tool, args.sessions, args.turns, args.model_latency)
+        print(
+            f"{mode:<10}{elapsed:>10.2f}{total / elapsed:>9.1f}{percentile(latencies, 50) * 1e3:>9.0f}"
+            f"{percentile(latencies, 95) * 1e3:>9.0f}{server.requests - requests_before:>11}"
+            f"{server.connections - connections_before:>13}"
+        )
+        if client is not None:
+            print(f"          {client.stats}")
+            await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
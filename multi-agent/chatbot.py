@@ -1,7 +1,8 @@
 import chainlit as cl
-from hello import run
+from hello import graph, stream
 @cl.on_chat_start
 async def main():
+    graph.start()  # build the agent while the greeting is read
     await cl.Message(
         content="Hello! I am a Weather chatbot. How can I assist you today?"
     ).send()
@@ -11,13 +12,14 @@ async def main():
 @cl.on_message
 
 async def main(message: cl.Message):
-    # Simulate a response from the chatbot
+    # Push the reply into the message as it streams, without blocking other users' sessions
+        reply = cl.Message(content="")
         if message:
             #   convert message to text
             print("Message",message.content)
-            result = run(message.content)
+            chunks = stream(message.content)
+            async for chunk in chunks:
+                await reply.stream_token(chunk)
+            print(chunks.stats)
         
-        await cl.Message(
-            content=f"{result}"
-        ).send()
-   
\ No newline at end of file
+        await reply.send()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Local stand-in for weatherapi.com's /v1/current.json, for tests and benchmarks.
+
+A minimal asyncio HTTP/1.1 server with keep-alive that answers in the same
+JSON shape as the real API after a configurable delay, and counts requests
+and connections so a benchmark can see how many round trips reached it.
+
+    python fake_weather_server.py --port 8099 --latency 0.15
+    WEATHER_API_URL=http://127.0.0.1:8099/v1 WEATHER_API_KEY=test chainlit run chatbot.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import zlib
+from urllib.parse import parse_qs, urlsplit
+
+CONDITIONS = ("Sunny", "Partly cloudy", "Cloudy", "Light rain", "Overcast", "Mist", "Clear")
+
+
+def reading(city):
+    """A stable made-up reading per city."""
+    seed = zlib.crc32(city.casefold().encode())
+    return {
+        "location": {"name": city.title()},
+        "current": {"temp_c": round(-5 + seed % 400 / 10, 1), "condition": {"text": CONDITIONS[seed % len(CONDITIONS)]}},
+    }
+
+
+class FakeWeatherServer:
+    def __init__(self, latency=0.15, jitter=0.5):
+        """latency is the mean response delay in seconds, varied by +/- jitter of itself."""
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                _, target, _ = request_line.decode("latin-1").split(" ", 2)
+                url = urlsplit(target)
+                city = parse_qs(url.query).get("q", [""])[0]
+                if url.path.rstrip("/").endswith("/current.json") and city:
+                    status, body = "200 OK", reading(city)
+                else:
+                    status, body = "400 Bad Request", {"error": {"message": "Parameter q is missing."}}
+                if self.latency:
+                    await asyncio.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening; returns the base URL to use as WEATHER_API_URL."""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        """Serve from a daemon thread with its own event loop; returns the base URL.
+
+        Lets blocking clients be measured without them stalling the server too.
+        """
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.start(host, port), loop).result()
+
+
+async def serve(port, latency):
+    server = FakeWeatherServer(latency=latency)
+    url = await server.start(port=port)
+    print(f"🌤️ Fake weather API on {url} ({latency * 1e3:.0f} ms mean latency)")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the weatherapi.com current weather API")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.15, help="mean response delay in seconds")
+    args = parser.parse_args()
+    asyncio.run(serve(args.port, args.latency))
@@ -1,38 +1,75 @@
-from agents import Agent,Runner, function_tool
-from agents.extensions.models.litellm_model import LitellmModel
-import requests
-
-from dotenv import find_dotenv,get_key
-
-GEMINI_API_KEY= get_key(find_dotenv(), "GOOGLE_API_KEY")
-
-
-@function_tool
-def getWeather(city: str) -> str:
-    """
-    Get the weather for a given city.
-    """
-    # Replace with your actual weather API URL and key
-    result = requests.get(f"http://api.weatherapi.com/v1/current.json?key=8e3aca2b91dc4342a1162608252604&q={city}")
-    
-    if result.status_code == 200:
-        data = result.json()
-        return f"The weather in {city} is {data['current']['temp_c']}°C with {data['current']['condition']['text']}."
-    else:
-        return "Sorry, I couldn't fetch the weather data."
-agent:Agent=Agent(
-    name="hello",
-    instructions="You are a helpful assistant.",
-    model=LitellmModel(model="gemini/gemini-2.0-flash",api_key=GEMINI_API_KEY),
-    tools=[getWeather],
-)
+import os
+from types import SimpleNamespace
+
+import weather
+from agent_common import runtime
+from agent_common.lazy import lazy
+from agent_common.streaming import TextStream
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# This project's .env names the Gemini key GOOGLE_API_KEY
+runtime.configure(api_key=os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"))
+
+# The agent is built on first use, so chainlit starts without waiting for the Agents SDK
+AGENT_NAMES = {"config", "agent"}
+
+
+@lazy
+def graph():
+    from agents import Agent, function_tool
+
+    from agent_common.routing import route
+
+    @function_tool
+    async def getWeather(city: str) -> str:
+        """
+        Get the weather for a given city.
+        """
+        # Pooled, cached and coalesced across sessions (see weather.py); set WEATHER_API_KEY in .env
+        return await weather.client.describe(city)
+    agent=Agent(
+        name="hello",
+        instructions="You are a helpful assistant.",
+        tools=[getWeather],
+    )
+    route(agent)  # model and limits from agent_common's models.toml
+    # run_config() turns off the SDK's OpenAI trace export (or sends it to agent_common.telemetry)
+    return SimpleNamespace(config=runtime.run_config(workflow_name="weather"), agent=agent)
+
+
+def __getattr__(name):
+    # agent and config stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run(message:str)->str:
-    print("Run message",message)
+    from agents import Runner
+
+    agents = graph()
     result=Runner.run_sync(
-        agent,
-        f"{message}?",  
+        agents.agent,
+        f"{message}?",
+        run_config=agents.config,
     )
     return result.final_output
 
+async def arun(message:str)->str:
+    """run() for async callers such as chainlit handlers, without blocking their event loop."""
+    from agents import Runner
+
+    agents = graph()
+    result=await Runner.run(
+        agents.agent,
+        f"{message}?",
+        run_config=agents.config,
+    )
+    return result.final_output
 
+def stream(message:str, **kwargs)->TextStream:
+    """Reply as it is generated: `async for chunk in stream(message)`, then .result and .stats."""
+    agents = graph()
+    kwargs.setdefault("run_config", agents.config)
+    return TextStream(agents.agent, f"{message}?", **kwargs)
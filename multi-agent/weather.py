@@ -0,0 +1,147 @@
+"""Async weatherapi.com client shared by every chat session.
+
+- One pooled keep-alive httpx.AsyncClient per event loop, so lookups never
+  block the loop and reuse connections instead of opening one per call.
+- Per-city TTL cache with stale-while-revalidate: within `ttl` the cached
+  reading is returned as is; for `stale_ttl` after that it is still returned
+  immediately while a background refresh runs. It keeps the `maxsize` most
+  recently used cities.
+- Singleflight: concurrent lookups for the same city share one request.
+
+The key comes from WEATHER_API_KEY (environment or .env); lookups raise
+RuntimeError when it is not set. WEATHER_API_URL points the client somewhere
+else, e.g. at fake_weather_server.py for tests and benchmarks.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "http://api.weatherapi.com/v1")
+WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
+
+
+@dataclass
+class WeatherStats:
+    lookups: int = 0
+    fresh: int = 0  # served from cache within ttl
+    stale: int = 0  # served from cache while a refresh ran
+    coalesced: int = 0  # waited on another caller's in-flight request
+    fetches: int = 0  # requests sent upstream
+    errors: int = 0
+    evictions: int = 0  # cities dropped from the cache to stay within maxsize
+
+    def __str__(self):
+        return (
+            f"{self.lookups} lookups: {self.fresh} fresh, {self.stale} stale, {self.coalesced} coalesced · "
+            f"{self.fetches} upstream requests, {self.errors} errors, {self.evictions} evictions"
+        )
+
+
+class WeatherClient:
+    def __init__(
+        self,
+        base_url=WEATHER_API_URL,
+        api_key=WEATHER_API_KEY,
+        ttl=600.0,
+        stale_ttl=3600.0,
+        timeout=5.0,
+        max_connections=20,
+        maxsize=1024,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.maxsize = maxsize
+        self.stats = WeatherStats()
+        self._cache = OrderedDict()  # city -> (reading, fetched_at), least recently used first
+        # httpx pools belong to the loop that opened them, and Runner.run_sync and chainlit may use
+        # different loops: one client and in-flight table per loop, dropped with the loop
+        self._loops = weakref.WeakKeyDictionary()  # loop -> (httpx.AsyncClient, {city: task})
+
+    def _http(self):
+        """(client, in-flight tasks) of the running loop."""
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self.limits)
+            state = self._loops[loop] = (client, {})
+        return state
+
+    async def current(self, city):
+        """{"temp_c": float, "condition": str} for city; raises httpx.HTTPError on failure."""
+        if not self.api_key:
+            raise RuntimeError("WEATHER_API_KEY is not set (environment or .env)")
+        key = " ".join(city.casefold().split())
+        self.stats.lookups += 1
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            reading, fetched_at = cached
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.stats.fresh += 1
+                return reading
+            if age < self.ttl + self.stale_ttl:
+                self.stats.stale += 1
+                self._fetch(key)  # refresh in the background, errors are counted there
+                return reading
+        if key in self._http()[1]:
+            self.stats.coalesced += 1
+        return await asyncio.shield(self._fetch(key))
+
+    def _fetch(self, key):
+        """The in-flight task for key, starting one if there is none."""
+        client, inflight = self._http()
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = asyncio.get_running_loop().create_task(self._request(client, inflight, key))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())  # retrieved even when nobody awaits
+        return task
+
+    async def _request(self, client, inflight, key):
+        self.stats.fetches += 1
+        try:
+            response = await client.get("/current.json", params={"key": self.api_key, "q": key})
+            response.raise_for_status()
+            current = response.json()["current"]
+            reading = {"temp_c": current["temp_c"], "condition": current["condition"]["text"]}
+        except (httpx.HTTPError, KeyError, ValueError):
+            self.stats.errors += 1
+            raise
+        finally:
+            if inflight.get(key) is asyncio.current_task():
+                del inflight[key]
+        self._cache[key] = (reading, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.stats.evictions += 1
+        return reading
+
+    async def describe(self, city):
+        """The sentence the getWeather tool returns."""
+        try:
+            reading = await self.current(city)
+        except (httpx.HTTPError, KeyError, ValueError):
+            return "Sorry, I couldn't fetch the weather data."
+        return f"The weather in {city} is {reading['temp_c']}°C with {reading['condition']}."
+
+    async def aclose(self):
+        """Close the running loop's client; clients of other loops go when their loop does."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
+
+
+client = WeatherClient()
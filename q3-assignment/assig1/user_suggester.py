@@ -1,7 +1,5 @@
 import asyncio
 import streamlit as st
-from dotenv import load_dotenv
-import os
 
 try:
     asyncio.get_running_loop() 
@@ -9,40 +7,29 @@ except RuntimeError:
     asyncio.set_event_loop(asyncio.new_event_loop())
 
 
-load_dotenv()
-google_api_key = os.getenv("GEMINI_API_KEY")
+from agent_common.runtime import run_config
 
+# Streamlit re-runs this script on every interaction; the agent is built once per
+# process, on the first suggestion, so the page is up before the Agents SDK has imported
+@st.cache_resource
+def graph():
+    from agents import Agent
 
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+    from agent_common.routing import route
 
-client = AsyncOpenAI(
-    api_key=google_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",  # or "gemini-1.5-pro" etc
-    openai_client=client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=client,
-    tracing_disabled=True
-)
-
-agent = Agent(
-    name="Smart Product Agent",
-    model=model,
-    instructions=(
-        "You are a helpful assistant that suggests medicine based on user needs.\n\n"
-        "Example:\n"
-        "- If the user says 'I have a headache', you should suggest a medicine or product and explain why it's suitable.\n"
-        "- If the user says 'My skin is dry', you should recommend a skincare product with a reason.\n\n"
-        "Keep your answers clear, friendly, and informative."
+    agent = Agent(
+        name="Smart Product Agent",
+        instructions=(
+            "You are a helpful assistant that suggests medicine based on user needs.\n\n"
+            "Example:\n"
+            "- If the user says 'I have a headache', you should suggest a medicine or product and explain why it's suitable.\n"
+            "- If the user says 'My skin is dry', you should recommend a skincare product with a reason.\n\n"
+            "Keep your answers clear, friendly, and informative."
+        )
     )
-)
+    route(agent)  # model and limits from agent_common's models.toml
+    # Shared pooled client; it keeps one connection pool per event loop, so the loop set above is fine
+    return agent, run_config()
 
 st.set_page_config(page_title="Smart Product Agent", layout="centered")
 st.title("💊 Smart Product Recommender")
@@ -52,6 +39,9 @@ user_input = st.text_input("🤖 Ask your question:", placeholder="e.g., I have
 def main():
     if st.button("Get Suggestion") and user_input.strip() != "":
         with st.spinner("Thinking..."):
+            from agents import Runner
+
+            agent, config = graph()
             result = Runner.run_sync(agent, user_input, run_config=config)
         st.markdown(f"### 💡 Suggestion:\n{result.final_output}")
 
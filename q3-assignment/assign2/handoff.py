@@ -1,7 +1,6 @@
 import streamlit as st
-from dotenv import load_dotenv
-import os
 import asyncio
+from types import SimpleNamespace
 
 
 try:
@@ -10,53 +9,45 @@ except RuntimeError:
     asyncio.set_event_loop(asyncio.new_event_loop())
 
 
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
-
-
-load_dotenv()
-google_api_key = os.getenv("GEMINI_API_KEY")
-
-# ✅ Setup Gemini Client (Google Gemini using OpenAI-compatible wrapper)
-client = AsyncOpenAI(
-    api_key=google_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",  # Gemini OpenAI-compatible endpoint
-)
-
-# ✅ Define the Gemini model
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash-exp",  # or gemini-1.5-pro, or gemini-2.0-pro if enabled
-    openai_client=client,
-)
-
-# ✅ Runner Configuration
-config = RunConfig(
-    model=model,
-    model_provider=client,
-    tracing_disabled=True,
-)
-
-# ✅ Agent 1: Mood Detector
-mood_detector = Agent(
-    name="Mood Detector",
-    model=model,
-    instructions=(
-        "You are a mood detection expert. Based on the user's message, "
-        "return ONLY the mood in one lowercase word: happy, sad, stressed, excited, angry, etc. "
-        "Do NOT explain. Just return the one word."
-    ),
-)
-
-# ✅ Agent 2: Activity Suggester
-activity_suggester = Agent(
-    name="Activity Suggester",
-    model=model,
-    instructions=(
-        "You are a comforting assistant. If the user is sad or stressed, suggest an activity like walking, "
-        "meditating, listening to music, or talking to a friend. Keep it short and supportive. "
-        "If mood is not sad or stressed, say something positive like 'You're doing great!'"
-    ),
-)
+from agent_common.mood import classify
+from agent_common.runtime import run_config
+
+
+# ✅ Agents, built once per process on the first "Analyze Mood" click (Streamlit re-runs this script
+# on every interaction), so the page itself doesn't wait for the Agents SDK
+@st.cache_resource
+def graph():
+    from agents import Agent
+
+    from agent_common.routing import route
+
+    # ✅ Agent 1: Mood Detector
+    mood_detector = Agent(
+        name="Mood Detector",
+        instructions=(
+            "You are a mood detection expert. Based on the user's message, "
+            "return ONLY the mood in one lowercase word: happy, sad, stressed, excited, angry, etc. "
+            "Do NOT explain. Just return the one word."
+        ),
+    )
+
+    # ✅ Agent 2: Activity Suggester
+    activity_suggester = Agent(
+        name="Activity Suggester",
+        instructions=(
+            "You are a comforting assistant. If the user is sad or stressed, suggest an activity like walking, "
+            "meditating, listening to music, or talking to a friend. Keep it short and supportive. "
+            "If mood is not sad or stressed, say something positive like 'You're doing great!'"
+        ),
+    )
+
+    # ✅ Models: gemini-2.0-flash-exp, falling back to gemini-2.0-flash ("assign2/..." in agent_common's models.toml)
+    route(mood_detector, activity_suggester, scope="assign2")
+    # ✅ Runner Configuration, on the shared pooled client (GEMINI_API_KEY from .env)
+    return SimpleNamespace(config=run_config(), mood_detector=mood_detector, activity_suggester=activity_suggester)
+
+# ✅ Local classifier answers on its own at or above this confidence; below it, the Mood Detector decides
+MOOD_CONFIDENCE = 0.6
 
 # ✅ Streamlit UI
 st.set_page_config(page_title="Mood Analyzer with Gemini", layout="centered")
@@ -70,15 +61,21 @@ if st.button("Analyze Mood"):
     else:
         with st.spinner("Detecting your mood..."):
             try:
-                # ▶️ Agent 1: Detect mood
-                mood_result = Runner.run_sync(mood_detector, user_input, run_config=config)
-                mood = mood_result.final_output.strip().lower()
+                from agents import Runner
+
+                agents = graph()
+
+                # ▶️ Agent 1: Detect mood (local lexicon first, Gemini only when unsure)
+                mood, confidence = classify(user_input)
+                if confidence < MOOD_CONFIDENCE:
+                    mood_result = Runner.run_sync(agents.mood_detector, user_input, run_config=agents.config)
+                    mood = mood_result.final_output.strip().lower()
 
                 st.success(f"🧠 Detected Mood: **{mood}**")
 
                 # ▶️ Agent 2: If sad or stressed, suggest activity
                 if mood in ["sad", "stressed"]:
-                    activity_result = Runner.run_sync(activity_suggester, mood, run_config=config)
+                    activity_result = Runner.run_sync(agents.activity_suggester, mood, run_config=agents.config)
                     st.info(f"💡 Suggested Activity: {activity_result.final_output}")
                 else:
                     st.balloons()
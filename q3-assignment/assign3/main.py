@@ -85,13 +85,10 @@
 
 
 import asyncio
-import os
 import streamlit as st
-from dotenv import load_dotenv
-from agents import Agent, Runner, function_tool, tool
-from agents.run import RunConfig
-from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-from agents import AsyncOpenAI
+
+from agent_common import runtime
+from agent_common.cache import ResponseCache, cached_run_sync
 
 
 try:
@@ -99,27 +96,6 @@ try:
 except RuntimeError:
     asyncio.set_event_loop(asyncio.new_event_loop())
 
-
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-
-client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",  
-    openai_client=client
-)
-
-run_config = RunConfig(
-    model=model,
-    model_provider=client,
-    tracing_disabled=True
-)
-
 # ---------- ✅ Define Tools as Functions ----------
 
 
@@ -133,53 +109,60 @@ run_config = RunConfig(
 
 
 
-@function_tool
-# (name_override='capital', description_override= "hello")
-def get_capital( country: str) -> str:
-    """Given a country, return its capital city."""
-    capitals = {
-        "pakistan": "Islamabad",
-        "india": "New Delhi",
-        "france": "Paris",
-        "germany": "Berlin",
-        "japan": "Tokyo",
-        "usa": "Washington D.C."
-    }
-    return capitals.get(country.lower(), "Sorry, I don't know the capital of that country.")
-
-@function_tool
-def get_language(country: str) -> str:
-    """Given a country, return its official language."""
-    languages = {
-        "pakistan": "Urdu",
-        "india": "Hindi",
-        "france": "French",
-        "germany": "German",
-        "japan": "Japanese",
-        "usa": "English"
-    }
-    return languages.get(country.lower(), "Sorry, I don't know the language of that country.")
-
-@function_tool
-def get_population(country: str) -> str:
-    """Given a country, return its approximate population."""
-    populations = {
-        "pakistan": "240 million",
-        "india": "1.4 billion",
-        "france": "67 million",
-        "germany": "83 million",
-        "japan": "125 million",
-        "usa": "331 million"
-    }
-    return populations.get(country.lower(), "Sorry, I don't know the population of that country.")
-
-# ---------- ✅ Orchestrator Agent ----------
-
-orchestrator = Agent(
-    name="Country Info Bot",
-    model=model,
-    tools=[get_capital, get_language, get_population],
-    instructions="""
+# Streamlit re-runs this script on every interaction: the tools and the orchestrator are
+# built once per process, on the first lookup, so the page is up before the Agents SDK has imported
+@st.cache_resource
+def graph():
+    from agents import Agent, function_tool
+
+    from agent_common.routing import route
+
+    @function_tool
+    # (name_override='capital', description_override= "hello")
+    def get_capital( country: str) -> str:
+        """Given a country, return its capital city."""
+        capitals = {
+            "pakistan": "Islamabad",
+            "india": "New Delhi",
+            "france": "Paris",
+            "germany": "Berlin",
+            "japan": "Tokyo",
+            "usa": "Washington D.C."
+        }
+        return capitals.get(country.lower(), "Sorry, I don't know the capital of that country.")
+
+    @function_tool
+    def get_language(country: str) -> str:
+        """Given a country, return its official language."""
+        languages = {
+            "pakistan": "Urdu",
+            "india": "Hindi",
+            "france": "French",
+            "germany": "German",
+            "japan": "Japanese",
+            "usa": "English"
+        }
+        return languages.get(country.lower(), "Sorry, I don't know the language of that country.")
+
+    @function_tool
+    def get_population(country: str) -> str:
+        """Given a country, return its approximate population."""
+        populations = {
+            "pakistan": "240 million",
+            "india": "1.4 billion",
+            "france": "67 million",
+            "germany": "83 million",
+            "japan": "125 million",
+            "usa": "331 million"
+        }
+        return populations.get(country.lower(), "Sorry, I don't know the population of that country.")
+
+    # ---------- ✅ Orchestrator Agent ----------
+
+    orchestrator = Agent(
+        name="Country Info Bot",
+        tools=[get_capital, get_language, get_population],
+        instructions="""
 You are a world knowledge expert. 
 Given a country name, return:
 1. The capital city
@@ -189,7 +172,17 @@ Given a country name, return:
 Use your tools to get the answers.
 Return a clean, readable response.
 """
-)
+    )
+    route(orchestrator)  # model and limits from agent_common's models.toml
+    # Gemini on the shared pooled client (GEMINI_API_KEY from .env)
+    return orchestrator, runtime.run_config()
+
+# ---------- ✅ Response Cache ----------
+
+# Country facts rarely change, so repeat lookups are served from disk instead of Gemini
+@st.cache_resource
+def response_cache():
+    return ResponseCache(ttl=30 * 24 * 3600)
 
 # ---------- ✅ Streamlit UI ----------
 
@@ -201,7 +194,8 @@ country_input = st.text_input("Enter a country name:")
 if st.button("Get Info") and country_input.strip() != "":
     with st.spinner("Getting country information..."):
         try:
-            result = Runner.run_sync(orchestrator, country_input, run_config=run_config)
+            orchestrator, run_config = graph()
+            result = cached_run_sync(response_cache(), orchestrator, country_input, run_config=run_config)
             st.markdown("### 📌 Country Information")
             st.markdown(result.final_output)
         except Exception as e:
@@ -1,136 +1,151 @@
+import argparse
+import asyncio
 import os
-from dotenv import load_dotenv
-from agents import Agent, RunContextWrapper, function_tool, Runner, OutputGuardrail
-from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-from agents.run import RunConfig
-from agents import AsyncOpenAI
-from pydantic import BaseModel
-from typing import Optional
-
-# -------------------- Load API Key --------------------
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError("⚠ GEMINI_API_KEY is missing in .env")
-
-# Gemini client
-client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Model wrapper for Agents SDK
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=client,
-    tracing_disabled=True
-)
-
-class userinfo(BaseModel):
-    name: str
-    issue_type: str = "general"
-    is_premium_user: bool = False
-
-@function_tool
-def refund(wrapper: RunContextWrapper[userinfo])-> str:
-    """Process a refund for premium users only."""
-    return (
-        f"Refund processed for {wrapper.context.name}."
-        if wrapper.context.is_premium_user else f"Refund denied. {wrapper.context.name} is not premium."
+from types import SimpleNamespace
+
+from agent_common.intents import IntentMatcher
+from agent_common.lazy import lazy
+from agent_common.memory import SessionMemory
+from agent_common.runtime import warm_up
+
+# Agents are built on first use (or in the background from main()), so the
+# name prompt is up before the Agents SDK has finished importing
+AGENT_NAMES = {"config", "userinfo", "billing", "tech", "general", "agent"}
+
+@lazy
+def graph():
+    from agents import Agent, RunContextWrapper, function_tool
+    from pydantic import BaseModel
+
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    class userinfo(BaseModel):
+        name: str
+        issue_type: str = "general"
+        is_premium_user: bool = False
+
+    @function_tool
+    def refund(wrapper: RunContextWrapper[userinfo])-> str:
+        """Process a refund for premium users only."""
+        return (
+            f"Refund processed for {wrapper.context.name}."
+            if wrapper.context.is_premium_user else f"Refund denied. {wrapper.context.name} is not premium."
+        )
+
+    refund.is_enabled = lambda ctx, agent=None: ctx.context.is_premium_user
+
+    @function_tool
+    def restart_service(wrapper: RunContextWrapper[userinfo]) -> str:
+        """Restart the service for technical issues."""
+        return (
+            f"Service restarted for {wrapper.context.name}."
+            if wrapper.context.issue_type == "technical"
+            else "Restart service only for technical issues."
+        )
+    restart_service.is_enabled = lambda ctx, agent=None: ctx.context.issue_type == "technical"
+
+    @function_tool
+    def answer_general(wrapper: RunContextWrapper[userinfo]) -> str:
+        """Answer a general query."""
+        return f"Here's the answer to your general question, {wrapper.context.name}."
+
+    billing = Agent(
+        name="Billing agent",
+        instructions="You are a helpful billing agent and you handle billing issues.",
+        tools=[refund]
     )
 
-refund.is_enabled = lambda ctx, agent=None: ctx.context.is_premium_user
+    tech = Agent(
+        name="Tech Agent",
+        instructions="You are a helpful technical agent and you handle technical/service issues.",
+        tools=[restart_service]
+    )
+
+    general = Agent(
+        name="General Agent",
+        instructions="You are a helpful general agent and you handle general queries.",
+        tools=[answer_general]
+    )
 
-@function_tool
-def restart_service(wrapper: RunContextWrapper[userinfo]) -> str:
-    """Restart the service for technical issues."""
-    return (
-        f"Service restarted for {wrapper.context.name}."
-        if wrapper.context.issue_type == "technical"
-        else "Restart service only for technical issues."
+    agent = Agent(
+        name="supportagent",
+        instructions="Classify the query and switch to the correct agent.",
+        tools=[refund, restart_service, answer_general]
     )
-restart_service.is_enabled = lambda ctx, agent=None: ctx.context.issue_type == "technical"
+    route(billing, tech, general, agent)  # models and limits from agent_common's models.toml
+    # -------------------- Gemini model --------------------
+    # Shared pooled client; raises if GEMINI_API_KEY is missing from the environment/.env
+    return SimpleNamespace(
+        config=run_config(), userinfo=userinfo, billing=billing, tech=tech, general=general, agent=agent
+    )
+
+def __getattr__(name):
+    # userinfo, the agents and config stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@function_tool
-def answer_general(wrapper: RunContextWrapper[userinfo]) -> str:
-    """Answer a general query."""
-    return f"Here's the answer to your general question, {wrapper.context.name}."
+# Issue keywords live in intents.json; billing wins over technical when both match
+issue_intents = IntentMatcher.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "intents.json"))
 
-def classify_issue(wrapper: RunContextWrapper[userinfo], message: str) -> str:
-    msg = message.lower()
-    if "refund" in msg or "payment" in msg:
+def classify_issue(wrapper, message: str) -> str:
+    """Set wrapper.context.issue_type (a RunContextWrapper[userinfo]) from the message's keywords."""
+    scores = issue_intents.match(message)
+    if "billing" in scores:
         wrapper.context.issue_type = "billing"
         return "Billing issue detected."
-    elif "service" in msg or "restart" in msg or "technical" in msg:
+    elif "technical" in scores:
         wrapper.context.issue_type = "technical"
         return "Technical issue detected."
     else:
         wrapper.context.issue_type = "general"
         return "General issue detected."
 
-billing = Agent(
-    name="Billing agent",
-    instructions="You are a helpful billing agent and you handle billing issues.",
-    tools=[refund]
-)
-
-tech = Agent(
-    name="Tech Agent",
-    instructions="You are a helpful technical agent and you handle technical/service issues.",
-    tools=[restart_service]
-)
-
-general = Agent(
-    name="General Agent",
-    instructions="You are a helpful general agent and you handle general queries.",
-    tools=[answer_general]
-)
-
-agent = Agent(
-    name="supportagent",
-    instructions="Classify the query and switch to the correct agent.",
-    tools=[refund, restart_service, answer_general]
-)
-
-def route_message(wrapper: RunContextWrapper[userinfo], message: str):
+def route_message(wrapper, message: str):
     classify_issue(wrapper, message)
+    agents = graph()
     if wrapper.context.issue_type == "billing":
-        return billing
+        return agents.billing
     elif wrapper.context.issue_type == "technical":
-        return tech
+        return agents.tech
     else:
-        return general
+        return agents.general
 
-def main():
+async def main(budget_tokens=1500):
     print("🎓 Console-Based Support Agent System (Gemini)")
-    name = input("Enter your name: ")
-    premium = input("Are you a premium user? (yes/no): ").strip().lower() == "yes"
+    graph.start()  # import the SDK and build the agents while the user fills in their details
+    asyncio.create_task(warm_up())  # connect to Gemini while the user fills in their details
+    name = await asyncio.to_thread(input, "Enter your name: ")
+    premium = (await asyncio.to_thread(input, "Are you a premium user? (yes/no): ")).strip().lower() == "yes"
 
-    ctx = userinfo(name=name, is_premium_user=premium)
-    active_agent = agent
+    from agents import RunContextWrapper, Runner
+
+    agents = await asyncio.to_thread(graph)
+    ctx = agents.userinfo(name=name, is_premium_user=premium)
+    active_agent = agents.agent
+    # Recent turns verbatim, older ones summarized in the background while the user types
+    memory = SessionMemory(run_config=agents.config, budget_tokens=budget_tokens)
 
     while True:
-        user_input = input("\nYou: ")
+        user_input = await asyncio.to_thread(input, "\nYou: ")
         if user_input.lower() in ["exit", "quit"]:
             print("👋 Goodbye!")
             break
 
-        if active_agent == agent:
+        if active_agent == agents.agent:
             new_agent = route_message(RunContextWrapper(ctx), user_input)
             print(f"🔄 Switching to {new_agent.name}")
             active_agent = new_agent
-            continue
 
-        result = Runner.run_sync(active_agent, context=ctx, input=user_input, run_config=config)
+        # The message that picked the agent is answered by it too, so every turn is user + reply
+        result = await Runner.run(active_agent, memory.input(user_input), context=ctx, run_config=agents.config)
+        memory.record(result)
         print(f"{active_agent.name}: {(result.final_output)}")
+        print(memory.last)
 
 if __name__ == "__main__":
-    main()
-
-
-
+    parser = argparse.ArgumentParser(description="Console support agent")
+    parser.add_argument("--budget", type=int, default=1500, help="tokens of recent conversation kept verbatim")
+    args = parser.parse_args()
+    asyncio.run(main(args.budget))
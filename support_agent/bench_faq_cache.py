@@ -0,0 +1,72 @@
+"""FAQ near-duplicate cache: hit rate, wrong answers and lookup cost per threshold.
+
+faq_paraphrases.jsonl pairs a cached FAQ question with a later query and
+says whether the cached answer is right for it ("same"). For each threshold
+the report shows how many true paraphrases hit and how many different
+questions would have been wrongly served the cached answer, then times
+lookups against a cache filled with many stored questions.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+from agent_common.neardup import NearDuplicateCache
+from agent_common.stats import percentile
+
+PAIRS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "faq_paraphrases.jsonl")
+
+
+def load_pairs(path=PAIRS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FAQ near-duplicate cache")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8, 0.9])
+    parser.add_argument("--entries", type=int, default=10_000, help="stored questions when timing lookups")
+    args = parser.parse_args()
+
+    pairs = load_pairs()
+    same = sum(p["same"] for p in pairs)
+    print(f"{len(pairs)} pairs: {same} paraphrases, {len(pairs) - same} different questions\n")
+    print(f"{'threshold':>10}{'paraphrase hits':>17}{'wrong answers':>15}")
+    for threshold in args.thresholds:
+        hits = wrong = 0
+        for pair in pairs:
+            cache = NearDuplicateCache(threshold=threshold)
+            cache.put(pair["question"], "answer")
+            if cache.get(pair["query"]) is not None:
+                hits += pair["same"]
+                wrong += not pair["same"]
+        print(f"{threshold:>10.2f}{hits / same:>17.0%}{wrong:>15}")
+
+    # Filler questions: FAQ-style openings around made-up content words
+    rng = random.Random(0)
+    openings = ["do you have", "is there", "what is your", "can i get", "where is the", "when do you"]
+    vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(5_000)]
+    cache = NearDuplicateCache()
+    start = time.perf_counter()
+    for _ in range(args.entries):
+        cache.put(f"{rng.choice(openings)} {' '.join(rng.choices(vocabulary, k=rng.randint(1, 4)))}?", "answer")
+    for pair in pairs:
+        cache.put(pair["question"], "answer")
+    fill_s = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(20):
+        for pair in pairs:
+            start = time.perf_counter()
+            cache.get(pair["query"])
+            latencies.append(time.perf_counter() - start)
+    print(
+        f"\n{len(cache):,} cached questions (filled in {fill_s:.2f}s): lookup p50 "
+        f"{percentile(latencies, 50) * 1e6:.0f}µs, p95 {percentile(latencies, 95) * 1e6:.0f}µs"
+    )
+
+
+if __name__ == "__main__":
+    main()
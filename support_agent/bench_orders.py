@@ -0,0 +1,79 @@
+"""Order lookups under many concurrent sessions: batched loader vs one query per call.
+
+Seeds a temporary orders table, then runs the same lookups from many
+concurrent sessions twice: once with a query (and thread hop) per call, as
+the old tool did, and once through the BatchLoader that check_order_status
+uses. --db-latency adds a fixed delay per round trip to stand in for a
+database on another machine.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from agent_common.batching import BatchLoader
+from agent_common.stats import percentile
+from orders import OrderStore, synthetic_orders
+
+
+async def run(lookup, sessions, lookups, ids, seed=1):
+    rng = random.Random(seed)
+    plans = [[rng.choice(ids) for _ in range(lookups)] for _ in range(sessions)]
+    latencies = []
+
+    async def session(plan):
+        for order_id in plan:
+            await asyncio.sleep(rng.uniform(0, 0.005))  # the model deciding to call the tool
+            start = time.perf_counter()
+            await lookup(order_id)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(plan) for plan in plans))
+    return time.perf_counter() - start, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched order lookups")
+    parser.add_argument("--orders", type=int, default=100_000, help="orders in the temporary table")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=4, help="lookups per session")
+    parser.add_argument("--hot", type=int, default=2_000, help="distinct order IDs being asked about")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="seconds added per DB round trip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OrderStore(os.path.join(tmp, "orders.sqlite3"))
+        store.bulk_load(synthetic_orders(args.orders))
+        ids = [str(100_000 + i) for i in random.Random(0).sample(range(args.orders), args.hot)]
+
+        def query(order_ids):
+            if args.db_latency:
+                time.sleep(args.db_latency)
+            return store.statuses(order_ids)
+
+        async def per_call(order_id):
+            return (await asyncio.to_thread(query, [order_id])).get(order_id)
+
+        async def fetch(order_ids):
+            return await asyncio.to_thread(query, order_ids)
+
+        loader = BatchLoader(fetch)
+        total = args.sessions * args.lookups
+        print(f"📦 {args.sessions} sessions × {args.lookups} lookups over {args.hot:,} hot IDs ({args.orders:,} orders)")
+        print(f"{'':<12}{'elapsed s':>10}{'lookups/s':>11}{'round trips':>13}{'p50 ms':>9}{'p95 ms':>9}")
+        for name, lookup in (("per call", per_call), ("batched", loader.load)):
+            before = store.round_trips
+            elapsed, latencies = await run(lookup, args.sessions, args.lookups, ids)
+            print(
+                f"{name:<12}{elapsed:>10.2f}{total / elapsed:>11,.0f}{store.round_trips - before:>13,}"
+                f"{percentile(latencies, 50) * 1e3:>9.2f}{percentile(latencies, 95) * 1e3:>9.2f}"
+            )
+        print(f"batched: {loader.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Routing accuracy and latency: local triage classifier vs the TriageAgent round trip.
+
+The local numbers are cross-validated (each example predicted by a model that
+did not train on it). With --llm N, the first N examples are also routed by
+the triage agent through Gemini: it is asked for the agent name instead of
+handing off, so only the routing call is timed.
+
+    python bench_triage.py --llm 30
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Literal
+
+from pydantic import BaseModel
+
+from agent_common.stats import percentile
+from eval_triage import cross_validate
+from triage import MIN_CONFIDENCE, load_examples, train
+
+
+class TriageChoice(BaseModel):
+    agent: Literal["FAQAgent", "OrderAgent", "ComplaintAgent"]
+
+
+def report(name, latencies, correct, total):
+    print(
+        f"{name:<22}{correct / total:>9.1%}{percentile(latencies, 50) * 1e3:>11.3f}"
+        f"{percentile(latencies, 95) * 1e3:>11.3f}"
+    )
+
+
+async def llm_routes(texts):
+    from agents import Runner
+
+    from main import config, triage_agent
+
+    router = triage_agent.clone(
+        handoffs=[],
+        output_type=TriageChoice,
+        instructions=f"{triage_agent.instructions} Reply with the name of the agent only.",
+    )
+    routes, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        result = await Runner.run(router, text, run_config=config)
+        latencies.append(time.perf_counter() - start)
+        routes.append(result.final_output.agent)
+    return routes, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark local vs LLM triage")
+    parser.add_argument("--llm", type=int, default=0, metavar="N", help="also route N examples through Gemini")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the data when timing the classifier")
+    args = parser.parse_args()
+
+    texts, labels = load_examples()
+    predictions = cross_validate(texts, labels, folds=5)
+
+    clf = train()
+    latencies = []
+    for _ in range(args.repeat):
+        for text in texts:
+            start = time.perf_counter()
+            clf.predict(text)
+            latencies.append(time.perf_counter() - start)
+
+    print(f"{'router':<22}{'accuracy':>9}{'p50 ms':>11}{'p95 ms':>11}")
+    report("local classifier", latencies, sum(p == l for (p, _), l in zip(predictions, labels)), len(texts))
+    confident = [(p, l) for (p, conf), l in zip(predictions, labels) if conf >= MIN_CONFIDENCE]
+    print(
+        f"  at MIN_CONFIDENCE {MIN_CONFIDENCE}: {len(confident) / len(texts):.0%} routed locally, "
+        f"{sum(p == l for p, l in confident) / max(len(confident), 1):.1%} of them correct"
+    )
+
+    if args.llm:
+        sample, expected = texts[: args.llm], labels[: args.llm]
+        routes, llm_latencies = await llm_routes(sample)
+        report("TriageAgent (Gemini)", llm_latencies, sum(r == l for r, l in zip(routes, expected)), len(sample))
+        print(f"  local p50 is {percentile(llm_latencies, 50) / percentile(latencies, 50):,.0f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
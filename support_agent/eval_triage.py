@@ -0,0 +1,70 @@
+"""Cross-validated evaluation of the local triage classifier.
+
+Every example is predicted by a model that never saw it (k-fold), then
+accuracy, the confusion matrix and, per confidence threshold, how many
+queries the classifier would answer locally and how accurately. The router's
+topic-shift keywords (intents.json) are checked against the same labels:
+a query whose keywords point at another agent would be re-routed by mistake.
+"""
+
+import argparse
+import os
+import random
+from collections import Counter
+
+from agent_common.intents import IntentMatcher
+from agent_common.textclf import TextClassifier
+from triage import DATA_PATH, MIN_CONFIDENCE, load_examples
+
+
+def cross_validate(texts, labels, folds, seed=0):
+    order = list(range(len(texts)))
+    random.Random(seed).shuffle(order)
+    predictions = [None] * len(texts)
+    for k in range(folds):
+        held_out = set(order[k::folds])
+        train = [i for i in order if i not in held_out]
+        clf = TextClassifier().fit([texts[i] for i in train], [labels[i] for i in train])
+        for i in held_out:
+            predictions[i] = clf.predict(texts[i])
+    return predictions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the local triage classifier")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+
+    texts, labels = load_examples(args.data)
+    predictions = cross_validate(texts, labels, args.folds)
+    names = sorted(set(labels))
+
+    correct = sum(p == label for (p, _), label in zip(predictions, labels))
+    print(f"{args.folds}-fold accuracy: {correct / len(texts):.1%} on {len(texts)} examples\n")
+
+    confusion = Counter((label, p) for (p, _), label in zip(predictions, labels))
+    print(f"{'actual / predicted':<20}" + "".join(f"{name:>16}" for name in names))
+    for actual in names:
+        print(f"{actual:<20}" + "".join(f"{confusion[actual, predicted]:>16}" for predicted in names))
+
+    print(f"\n{'threshold':>10}{'local':>8}{'accuracy':>10}")
+    for threshold in (0.4, 0.5, MIN_CONFIDENCE, 0.7, 0.8):
+        confident = [(p, label) for (p, conf), label in zip(predictions, labels) if conf >= threshold]
+        accuracy = sum(p == label for p, label in confident) / len(confident) if confident else 0.0
+        marker = "  <- MIN_CONFIDENCE" if threshold == MIN_CONFIDENCE else ""
+        print(f"{threshold:>10.2f}{len(confident) / len(texts):>8.0%}{accuracy:>10.1%}{marker}")
+
+    # Keyword topic-shift check: the best-scoring intent should be the labelled agent
+    intents = IntentMatcher.from_file(os.path.join(os.path.dirname(DATA_PATH), "intents.json"))
+    matched = wrong = 0
+    for text, label in zip(texts, labels):
+        scores = intents.match(text)
+        if not scores:
+            continue
+        matched += 1
+        best = max(scores, key=scores.get)
+        if best != label and scores[best] > scores.get(label, 0.0):
+            wrong += 1
+            print(f"  keywords pick {best} for {label}: {text!r}")
+    print(f"\nkeywords: {matched / len(texts):.0%} of queries matched, {wrong} pointing at the wrong agent")
@@ -1,101 +1,154 @@
-import os
+import argparse
 import asyncio
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, set_tracing_disabled
-# Load environment variables
-load_dotenv()
-# Initialize OpenAI client with Gemini API endpoint
-# Get API key from environment variables
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY environment variable is not set")
-
-
-# ⚙️ Gemini Flash 2.0 Setup
-client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
-config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
-
-# Disable tracing to reduce overhead
-set_tracing_disabled(disabled=True)
-# Define specialized agents
-faq_agent = Agent(
-    name="FAQAgent",
-    instructions=("Answer common customer questions about store hours, menu, or location. Be concise and friendly."),
-    model=model
-)
-order_agent = Agent(
-    name="OrderAgent", 
-    model="gemini-2.0-flash",  # Updated to correct model name
-    instructions="Provide order status updates based on the order ID provided. Use the check_order_status tool.",
-    tools=[{
-        "type": "function",
-        "function": {
-            "name": "check_order_status",
-            "description": "Check the status of an order by ID",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "order_id": {
-                        "type": "string",
-                        "description": "The order ID, e.g., 12345"
-                    }
-                },
-                "required": ["order_id"]
-            }
-        }
-    }]
-)
-complaint_agent = Agent(
-    name="ComplaintAgent",
-    model="gemini-2.0-flash",  # Updated to correct model name
-    instructions="Handle customer complaints empathetically and offer solutions or escalate if needed.",
-)
-# Define triage agent to route queries
-triage_agent = Agent(
-    name="TriageAgent",
-    model="gemini-2.0-flash",  # Updated to correct model name
-    instructions="Analyze the user's query and route it to the appropriate agent: FAQAgent for general questions, OrderAgent for order status, or ComplaintAgent for complaints.",
-    handoffs=[faq_agent, order_agent, complaint_agent]
-)
-
-async def check_order_status(order_id: str) -> str:
-    # Simulated order status database
-    order_statuses = {
-        "12345": "In transit",
-        "67890": "Delivered",
-        "11111": "Processing"
-    }
-    
-    # Simulate a small delay to mimic real database query
-    await asyncio.sleep(0.1)
-    
-    # Return order status or not found message
-    return order_statuses.get(order_id, "Order ID not found.")
+import os
+from types import SimpleNamespace
+
+from agent_common.batching import BatchLoader
+from agent_common.lazy import lazy
+from agent_common.neardup import NearDuplicateCache
+from agent_common.runtime import warm_up
+from orders import OrderStore
+from router import StickyRouter
+from triage import MIN_CONFIDENCE, load_classifier
+
+# Agents are built on first use (or in the background from run_support_agent()),
+# so the welcome text is up before the Agents SDK has finished importing
+AGENT_NAMES = {"config", "faq_agent", "order_agent", "complaint_agent", "triage_agent"}
+
+# Order lookups from concurrent sessions are merged into one bulk query per batch
+orders = OrderStore()
+
+async def fetch_statuses(order_ids):
+    return await asyncio.to_thread(orders.statuses, order_ids)
+
+order_loader = BatchLoader(fetch_statuses)
+
+@lazy
+def graph():
+    from agents import Agent, function_tool
+
+    from agent_common import telemetry
+    from agent_common.routing import route
+    from agent_common.runtime import run_config
+
+    # Span timings and token counts per agent, kept locally (telemetry/spans.jsonl, --metrics-port)
+    telemetry.install(os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry", "spans.jsonl"))
+
+    @function_tool
+    async def check_order_status(order_id: str) -> str:
+        """Check the status of an order by ID.
+
+        Args:
+            order_id: The order ID, e.g., 12345
+        """
+        status = await order_loader.load(order_id.strip())
+        return status or "Order ID not found."
+
+    # Define specialized agents
+    faq_agent = Agent(
+        name="FAQAgent",
+        instructions=("Answer common customer questions about store hours, menu, or location. Be concise and friendly."),
+    )
+    order_agent = Agent(
+        name="OrderAgent",
+        instructions="Provide order status updates based on the order ID provided. Use the check_order_status tool.",
+        tools=[check_order_status]
+    )
+    complaint_agent = Agent(
+        name="ComplaintAgent",
+        instructions="Handle customer complaints empathetically and offer solutions or escalate if needed.",
+    )
+    # Define triage agent to route queries
+    triage_agent = Agent(
+        name="TriageAgent",
+        instructions="Analyze the user's query and route it to the appropriate agent: FAQAgent for general questions, OrderAgent for order status, or ComplaintAgent for complaints.",
+        handoffs=[faq_agent, order_agent, complaint_agent]
+    )
+    # Triage on the light tier, the specialists on the standard one
+    route(triage_agent)
+    # Gemini setup, on the process-wide pooled client (raises if GEMINI_API_KEY is not set);
+    # each agent's model and limits come from agent_common's models.toml
+    return SimpleNamespace(
+        config=run_config(workflow_name="support"),
+        faq_agent=faq_agent,
+        order_agent=order_agent,
+        complaint_agent=complaint_agent,
+        triage_agent=triage_agent,
+    )
+
+def __getattr__(name):
+    # triage_agent, config and the specialists stay importable from this module
+    if name in AGENT_NAMES:
+        return getattr(graph(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# FAQ answers are shared by every conversation in this process
+faq_cache = NearDuplicateCache(threshold=0.8)
 
 # Main function to run the support agent system
-async def run_support_agent():
+async def run_support_agent(sticky=True, local_triage=True, faq_cache=faq_cache):
+    """Chat on the console; faq_cache=None always asks FAQAgent."""
     print("Welcome to the Customer Support Agent System!")
-    print("Type 'exit' to quit.\n")
+    print("Type 'exit' to quit, '/invalidate [topic]' after FAQ facts change.\n")
+    graph.start()  # import the SDK and build the agents while the first query is typed
+    asyncio.create_task(warm_up())  # connect to Gemini meanwhile too
+    classifier = load_classifier() if local_triage else None
+    router = None
     while True:
-        user_input = input("Enter your query: ")
+        user_input = await asyncio.to_thread(input, "Enter your query: ")
         if user_input.lower() == "exit":
+            if router is not None:
+                print(router.stats)
+            if faq_cache is not None:
+                print(f"🗂️ FAQ cache: {faq_cache.stats}")
             print("Goodbye!")
             break
+        if user_input.startswith("/invalidate"):
+            topic = user_input.removeprefix("/invalidate").strip() or None
+            dropped = faq_cache.invalidate(topic) if faq_cache is not None else 0
+            print(f"🗑️ Dropped {dropped} cached FAQ answers\n")
+            continue
         
         try:
-            # Run the triage agent with user input
-            result = await Runner.run_sync(
-                input=user_input,
-                agent=triage_agent, complaint_agent=complaint_agent,
-                tools={"check_order_status": check_order_status}
-            )
+            if router is None:
+                agents = await asyncio.to_thread(graph)
+                router = StickyRouter(
+                    agents.triage_agent,
+                    run_config=agents.config,
+                    sticky=sticky,
+                    classifier=classifier,
+                    min_confidence=MIN_CONFIDENCE,
+                    faq_cache=faq_cache,
+                )
+            # Triage on a new topic, straight to the current specialist on follow-ups
+            turn = await router.ask(user_input)
             # Print the final response
-            print(f"Response: {result.final_output}\n")
+            print(f"Response: {turn.reply}")
+            print(f"↪️ {turn.agent.name} ({turn.how}) · {turn.llm_calls} LLM calls in {turn.seconds:.2f}s · {router.stats.llm_calls_saved} saved so far\n")
         except Exception as e:
             print(f"Error processing query: {str(e)}\n")
 
+def main():
+    parser = argparse.ArgumentParser(description="Customer support agent")
+    parser.add_argument("--no-sticky", action="store_true", help="re-route every query instead of staying with the current specialist")
+    parser.add_argument("--no-local-triage", action="store_true", help="always ask TriageAgent instead of the local classifier")
+    parser.add_argument("--no-faq-cache", action="store_true", help="always ask FAQAgent, even for repeated questions")
+    parser.add_argument("--faq-threshold", type=float, help=f"similarity (0-1) for a FAQ cache hit (default {faq_cache.threshold})")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+    if args.metrics_port:
+        from agent_common import telemetry
+
+        telemetry.serve_metrics(args.metrics_port)
+    # Another threshold gets a cache of its own for this run; the shared one is left as it is
+    if args.no_faq_cache:
+        cache = None
+    elif args.faq_threshold is None:
+        cache = faq_cache
+    else:
+        cache = NearDuplicateCache(threshold=args.faq_threshold)
+    asyncio.run(run_support_agent(sticky=not args.no_sticky, local_triage=not args.no_local_triage, faq_cache=cache))
+
 # Run the async main function
 if __name__ == "__main__":
-    asyncio.run(run_support_agent())
+    main()
@@ -0,0 +1,106 @@
+"""SQLite orders table behind the check_order_status tool.
+
+Orders are keyed (and clustered) by order ID, so looking up a whole batch of
+IDs is one indexed IN (...) query. Lookups from concurrent sessions reach it
+through a BatchLoader (see main.py), which merges the IDs requested within a
+couple of milliseconds into a single round trip.
+
+Seed a large table for testing with:
+
+    python orders.py seed 1000000
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders.sqlite3")
+
+DEMO_ORDERS = [("12345", "In transit"), ("67890", "Delivered"), ("11111", "Processing")]
+STATUSES = ("Processing", "In transit", "Out for delivery", "Delivered", "Cancelled")
+
+# Stay well under SQLite's bound-parameter limit in IN (...) lookups
+LOOKUP_CHUNK = 500
+
+
+class OrderStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.round_trips = 0
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                order_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        if conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0:
+            self.bulk_load((order_id, status) for order_id, status in DEMO_ORDERS)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def statuses(self, order_ids):
+        """Bulk lookup: {order_id: status} for the orders that exist."""
+        ids = list(dict.fromkeys(order_ids))
+        found = {}
+        conn = self._conn()
+        for i in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[i:i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            self.round_trips += 1
+            found.update(conn.execute(f"SELECT order_id, status FROM orders WHERE order_id IN ({placeholders})", chunk))
+        return found
+
+    def bulk_load(self, rows, batch_size=50_000):
+        """Insert (order_id, status) rows in large transactions; returns the count."""
+        conn = self._conn()
+        loaded = 0
+        batch = []
+        for order_id, status in rows:
+            batch.append((order_id, status, time.time()))
+            if len(batch) >= batch_size:
+                loaded += self._insert_batch(conn, batch)
+                batch = []
+        if batch:
+            loaded += self._insert_batch(conn, batch)
+        return loaded
+
+    @staticmethod
+    def _insert_batch(conn, batch):
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR REPLACE INTO orders (order_id, status, updated_at) VALUES (?, ?, ?)", batch)
+        conn.execute("COMMIT")
+        return len(batch)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+
+def synthetic_orders(count, start=100_000, seed=42):
+    """Generate count fake orders with numeric IDs starting at start."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield str(start + i), rng.choice(STATUSES)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "seed":
+        sys.exit("usage: python orders.py seed <number of orders>")
+    store = OrderStore()
+    start = time.perf_counter()
+    loaded = store.bulk_load(synthetic_orders(int(sys.argv[2])))
+    print(f"Loaded {loaded:,} orders in {time.perf_counter() - start:.1f}s ({len(store):,} total in {store.path})")
@@ -0,0 +1,149 @@
+"""Sticky routing between the triage agent and its specialists.
+
+The first query of a topic goes to the specialist picked by the local triage
+classifier (triage.py) when it is confident, and otherwise through the triage
+agent, which hands off to a specialist. Follow-ups then go straight to that
+specialist, skipping the triage model call, until the local topic-shift check
+sees the user move on: the query matches another specialist's keywords
+(intents.json) more strongly than the current one's. Queries with no keywords
+at all ("ok, and when will it arrive?") count as follow-ups.
+
+FAQ questions that name a topic from faq_topics.json ("hours", "menu", ...)
+are answered from a near-duplicate cache when a paraphrase was answered
+before. Follow-ups without a topic always go to the model, since their answer
+depends on the conversation.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+
+from agent_common.intents import IntentMatcher
+from agent_common.memory import SessionMemory
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+INTENTS_PATH = os.path.join(HERE, "intents.json")
+FAQ_TOPICS_PATH = os.path.join(HERE, "faq_topics.json")
+FAQ_AGENT = "FAQAgent"
+
+
+@dataclass
+class Turn:
+    reply: str
+    agent: object  # the agent that answered (or would have, for cached FAQ answers)
+    how: str  # "sticky", "classifier", "triage" or "faq cache"
+    llm_calls: int
+    seconds: float
+
+
+@dataclass
+class RoutingStats:
+    turns: int = 0
+    triaged: int = 0  # turns that went through the triage agent
+    classified: int = 0  # turns routed by the local classifier instead
+    sticky: int = 0  # turns sent straight to the previous specialist
+    cached: int = 0  # FAQ turns answered from the near-duplicate cache
+    topic_shifts: int = 0  # times the shift check sent a follow-up back to routing
+    llm_calls: int = 0  # model requests made, all agents included
+    by_agent: dict = field(default_factory=dict)
+
+    @property
+    def llm_calls_saved(self):
+        # Against triaging every turn: sticky/classified turns skip the triage call, cached ones both calls
+        return self.sticky + self.classified + 2 * self.cached
+
+    def __str__(self):
+        agents = ", ".join(f"{name} {count}" for name, count in self.by_agent.items())
+        return (
+            f"📊 {self.turns} turns ({agents}) · {self.triaged} triaged, {self.classified} classified, "
+            f"{self.sticky} sticky, {self.cached} from FAQ cache, {self.topic_shifts} topic shifts · "
+            f"{self.llm_calls} LLM calls, {self.llm_calls_saved} saved"
+        )
+
+
+def topic_shift(intents, query, current):
+    """True when query is about another specialist's topic rather than current's."""
+    scores = intents.match(query)
+    if not scores:
+        return False
+    best = max(scores, key=scores.get)
+    return best != current.name and scores[best] > scores.get(current.name, 0.0)
+
+
+class StickyRouter:
+    def __init__(
+        self,
+        triage_agent,
+        run_config=None,
+        sticky=True,
+        intents=None,
+        memory=None,
+        classifier=None,
+        min_confidence=0.6,
+        faq_cache=None,
+        faq_topics=None,
+    ):
+        self.triage_agent = triage_agent
+        self.specialists = {agent.name: agent for agent in triage_agent.handoffs}
+        self.run_config = run_config
+        self.sticky = sticky
+        self.intents = intents or IntentMatcher.from_file(INTENTS_PATH)
+        self.memory = memory or SessionMemory(run_config=run_config)
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        self.faq_cache = faq_cache
+        if faq_cache is not None and faq_topics is None:
+            faq_topics = IntentMatcher.from_file(FAQ_TOPICS_PATH)
+        self.faq_topics = faq_topics
+        self.current = None  # specialist that handled the last turn
+        self.stats = RoutingStats()
+
+    def pick(self, query):
+        """(agent, how) for query; how is "sticky", "classifier" or "triage"."""
+        if self.sticky and self.current is not None:
+            if not topic_shift(self.intents, query, self.current):
+                return self.current, "sticky"
+            self.stats.topic_shifts += 1
+        if self.classifier is not None:
+            label, confidence = self.classifier.predict(query)
+            if confidence >= self.min_confidence and label in self.specialists:
+                return self.specialists[label], "classifier"
+        return self.triage_agent, "triage"
+
+    async def ask(self, query, context=None):
+        start = time.perf_counter()
+        agent, how = self.pick(query)
+        topics = tuple(self.faq_topics.match(query)) if self.faq_cache is not None else ()
+
+        if topics and agent.name == FAQ_AGENT and (hit := self.faq_cache.get(query)) is not None:
+            reply, _ = hit
+            self.memory.remember(query, reply)
+            self.current = agent
+            self._count(agent, "faq cache", 0)
+            return Turn(reply, agent, "faq cache", 0, time.perf_counter() - start)
+
+        from agents import Runner  # imported on the first model call, not with this module
+
+        result = await Runner.run(agent, self.memory.input(query), context=context, run_config=self.run_config)
+        self.memory.record(result)
+        handled_by = result.last_agent
+        self.current = handled_by if handled_by.name in self.specialists else None
+        if topics and handled_by.name == FAQ_AGENT:
+            self.faq_cache.put(query, result.final_output, tags=topics)
+
+        llm_calls = result.context_wrapper.usage.requests
+        self._count(handled_by, how, llm_calls)
+        return Turn(result.final_output, handled_by, how, llm_calls, time.perf_counter() - start)
+
+    def _count(self, agent, how, llm_calls):
+        self.stats.turns += 1
+        self.stats.llm_calls += llm_calls
+        if how == "sticky":
+            self.stats.sticky += 1
+        elif how == "classifier":
+            self.stats.classified += 1
+        elif how == "faq cache":
+            self.stats.cached += 1
+        else:
+            self.stats.triaged += 1
+        self.stats.by_agent[agent.name] = self.stats.by_agent.get(agent.name, 0) + 1
@@ -0,0 +1,26 @@
+"""Train the local triage classifier from triage_data.jsonl and save triage_model.npz.
+
+    python train_triage.py [--data triage_data.jsonl] [--out triage_model.npz]
+"""
+
+import argparse
+import time
+
+from agent_common.textclf import TextClassifier
+from triage import DATA_PATH, MODEL_PATH, load_examples
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the local triage classifier")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--out", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    texts, labels = load_examples(args.data)
+    start = time.perf_counter()
+    clf = TextClassifier().fit(texts, labels)
+    elapsed = time.perf_counter() - start
+    clf.save(args.out)
+
+    train_accuracy = sum(clf.predict(text)[0] == label for text, label in zip(texts, labels)) / len(texts)
+    print(f"Trained on {len(texts)} examples ({', '.join(clf.labels)}) in {elapsed:.2f}s")
+    print(f"Training accuracy {train_accuracy:.1%}; saved to {args.out}")
@@ -1,19 +1,6 @@
-from agents import Agent, Runner, AsyncOenAI, set
-from openai.types.responses import ResponseTextDeltaEvent
-from dotenv import load_dotenv
-import os
+from agents import Agent, Runner
 
-# load enviroment variable
-load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
+from agent_common.runtime import run_config
 
-# SET UP THE GIMINI COMPATIBLE OPENAI CLIENT
-external_client = AsyncOenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai"
-)
-model = ResponseTextDeltaEvent (
-    model="gemini-2.0-flash",
-    openai_client = external_client
-
-)
\ No newline at end of file
+# GEMINI RUN CONFIG ON THE SHARED, POOLED OPENAI-COMPATIBLE CLIENT (GEMINI_API_KEY FROM .env)
+config = run_config()  # AGENTS ROUTED WITH agent_common.routing KEEP THEIR OWN MODEL